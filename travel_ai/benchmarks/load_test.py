@@ -0,0 +1,482 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+DEFAULT_PLACES = ["Shaniwar Wada", "Sinhagad Fort", "Dagadusheth Halwai Ganapati temple", "Aga Khan Palace"]
+PIPELINE_STAGES = ("discovery", "culinary", "clustering", "priority", "final_route")
+
+
+# ----------------------------------------------------------
+# Statistics
+# ----------------------------------------------------------
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "count": len(values),
+        "p50_ms": _round(percentile(values, 50)),
+        "p95_ms": _round(percentile(values, 95)),
+        "p99_ms": _round(percentile(values, 99)),
+        "max_ms": _round(max(values) if values else None),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def stage_durations(timings: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Stage span durations (ms) from a debug=timings span tree.
+    """
+    found: Dict[str, float] = {}
+
+    def walk(node: Dict[str, Any]) -> None:
+        name = node.get("name", "")
+        if name.startswith("stage."):
+            found[name[len("stage."):]] = found.get(name[len("stage."):], 0.0) + node.get("duration_ms", 0.0)
+        for child in node.get("children", []):
+            walk(child)
+
+    if timings:
+        walk(timings)
+    return found
+
+
+# ----------------------------------------------------------
+# Process sampling (Linux /proc)
+# ----------------------------------------------------------
+def _children(pid: int) -> List[int]:
+    kids = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            kids.append(int(entry.name))
+    return kids
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    """
+    The server process and all of its descendants (uvicorn workers).
+    """
+    pids, queue = [], [master_pid]
+    while queue:
+        pid = queue.pop()
+        pids.append(pid)
+        queue.extend(_children(pid))
+    return pids
+
+
+def _cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class ProcessSampler:
+    """
+    Tracks CPU time and peak RSS of the server's processes while a load level
+    runs.
+    """
+
+    def __init__(self, master_pid: Optional[int], interval: float = 0.5):
+        self.master_pid = master_pid
+        self.interval = interval
+        self._cpu_start: Dict[int, float] = {}
+        self._peak_rss: Dict[int, float] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._started = 0.0
+
+    def _pids(self) -> List[int]:
+        if self.master_pid is None or not Path("/proc").exists():
+            return []
+        return worker_pids(self.master_pid)
+
+    def _sample_rss(self) -> None:
+        for pid in self._pids():
+            rss = _rss_mb(pid)
+            if rss is not None:
+                self._peak_rss[pid] = max(self._peak_rss.get(pid, 0.0), rss)
+
+    async def _run(self) -> None:
+        while True:
+            self._sample_rss()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._cpu_start = {pid: cpu for pid in self._pids() if (cpu := _cpu_seconds(pid)) is not None}
+        self._peak_rss = {}
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> List[Dict[str, Any]]:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._sample_rss()
+        wall = time.perf_counter() - self._started
+        workers = []
+        for pid in self._pids():
+            cpu = _cpu_seconds(pid)
+            if cpu is None:
+                continue
+            used = cpu - self._cpu_start.get(pid, cpu)
+            workers.append(
+                {
+                    "pid": pid,
+                    "cpu_seconds": round(used, 2),
+                    "cpu_percent": round(100 * used / wall, 1) if wall else None,
+                    "peak_rss_mb": round(self._peak_rss.get(pid, 0.0), 1),
+                }
+            )
+        return workers
+
+
+# ----------------------------------------------------------
+# Load generation
+# ----------------------------------------------------------
+def itinerary_request(args: argparse.Namespace, index: int, run_id: str) -> Dict[str, Any]:
+    interests = list(args.interests)
+    if args.cache == "cold":
+        # A unique interest misses the stage caches as well as the itinerary cache.
+        interests.append(f"bench-{run_id}-{index}")
+    return {
+        "home_city": args.home_city,
+        "destination_city": args.city,
+        "num_days": args.days,
+        # A unique budget always misses the itinerary cache, whose hits are
+        # deliberately delayed by the endpoint.
+        "budget": 20000 + index + (int(run_id, 16) % 100000) / 100000,
+        "interests": interests,
+    }
+
+
+def place_detail_request(args: argparse.Namespace, index: int, run_id: str) -> Dict[str, Any]:
+    place = args.places[index % len(args.places)]
+    if args.cache != "warm":
+        # Place details are cached per city and place name.
+        place = f"{place} {run_id}-{index}"
+    return {"place": place, "destination_city": args.city, "time": "09:00-10:00", "reason_for_time_choice": "Benchmark"}
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    args: argparse.Namespace,
+    endpoint: str,
+    concurrency: int,
+    sampler: ProcessSampler,
+) -> Dict[str, Any]:
+    run_id = uuid.uuid4().hex[:8]
+    total = args.requests or concurrency * args.requests_per_worker
+    next_index = iter(range(total))
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    # Answered, but from the fallback itinerary or with stages skipped.
+    fallbacks = degraded = 0
+
+    async def worker() -> None:
+        nonlocal fallbacks, degraded
+        for index in next_index:
+            if endpoint == "full-itinerary":
+                url, body = "/planner/full-itinerary?debug=timings", itinerary_request(args, index, run_id)
+            else:
+                url, body = "/planner/place-detail-tts", place_detail_request(args, index, run_id)
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, json=body)
+                elapsed = (time.perf_counter() - start) * 1000
+                data = response.json() if response.status_code == 200 else {}
+                if response.status_code != 200 or data.get("error"):
+                    key = str(response.status_code) if response.status_code != 200 else "pipeline_error"
+                    errors[key] = errors.get(key, 0) + 1
+                    continue
+            except httpx.HTTPError as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                continue
+            latencies.append(elapsed)
+            metadata = data.get("metadata", {})
+            fallbacks += bool(metadata.get("fallback"))
+            degraded += bool(metadata.get("degraded_stages"))
+            if endpoint == "full-itinerary":
+                for stage, duration in stage_durations(data.get("metadata", {}).get("timings")).items():
+                    stages.setdefault(stage, []).append(duration)
+
+    sampler.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    workers = await sampler.stop()
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "fallbacks": fallbacks,
+        "degraded": degraded,
+        "wall_seconds": round(wall, 2),
+        "requests_per_second": round(len(latencies) / wall, 2) if wall else None,
+        "latency": summarize(latencies),
+        "stages": {stage: summarize(stages[stage]) for stage in PIPELINE_STAGES if stage in stages},
+        "workers": workers,
+    }
+
+
+# ----------------------------------------------------------
+# Processes under test
+# ----------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with {process.returncode}")
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
+
+@contextmanager
+def _process(command: List[str], port: int, env: Dict[str, str], log_path: Path) -> Iterator[subprocess.Popen]:
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(command, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            _wait_for_port(port, process)
+            yield process
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+@contextmanager
+def services_under_test(args: argparse.Namespace) -> Iterator[Optional[int]]:
+    """
+    Starts the mock provider, an isolated in-memory cache and the app with
+    --workers uvicorn workers. Yields the server's PID.
+    """
+    python = sys.executable
+    env = {**os.environ, "PYTHONPATH": str(BASE_PATH.parent)}
+    mock_port, redis_port = _free_port(), _free_port()
+    mock_command = [
+        python, "-m", "travel_ai.benchmarks.mock_openrouter",
+        "--port", str(mock_port),
+        "--latency-scale", str(args.latency_scale),
+        "--error-rate", str(args.error_rate),
+    ]
+    if args.seed is not None:
+        mock_command += ["--seed", str(args.seed)]
+    redis_command = [python, "-m", "travel_ai.scripts.fake_redis_server", "--port", str(redis_port)]
+    server_env = {
+        **env,
+        "OPENROUTER_API_KEY": "benchmark",
+        "OPENROUTER_URL": f"http://127.0.0.1:{mock_port}/api/v1/chat/completions",
+        "CACHE_BACKEND": "redis",
+        "REDIS_URL": f"redis://127.0.0.1:{redis_port}/0",
+        "ITINERARY_DEADLINE": str(args.deadline),
+        "TTS_ENGINE": args.tts_engine,
+        "TTS_STUB_CHARS_PER_SECOND": str(args.tts_chars_per_second),
+    }
+    server_command = [
+        python, "-m", "uvicorn", "travel_ai.main:app",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    logs = args.log_dir
+    with _process(mock_command, mock_port, env, logs / "mock_openrouter.log"), \
+            _process(redis_command, redis_port, env, logs / "fake_redis.log"), \
+            _process(server_command, args.port, server_env, logs / "server.log") as server:
+        yield server.pid
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_PATH, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args: argparse.Namespace, base_url: str, server_pid: Optional[int]) -> Dict[str, Any]:
+    sampler = ProcessSampler(server_pid)
+    levels = []
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        for endpoint in args.endpoints:
+            for concurrency in args.concurrency:
+                level = await run_level(client, args, endpoint, concurrency, sampler)
+                levels.append(level)
+                _print_level(level)
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "settings": {
+            "workers": args.workers if server_pid else None,
+            "city": args.city,
+            "days": args.days,
+            "cache": args.cache,
+            "latency_scale": args.latency_scale,
+            "error_rate": args.error_rate,
+        },
+        "levels": levels,
+    }
+
+
+# ----------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------
+def _print_level(level: Dict[str, Any]) -> None:
+    latency = level["latency"]
+    print(
+        f"{level['endpoint']:<15} c={level['concurrency']:<4} {level['requests_per_second'] or 0:>7.2f} req/s  "
+        f"p50 {latency['p50_ms'] or 0:>8.0f}ms  p95 {latency['p95_ms'] or 0:>8.0f}ms  "
+        f"p99 {latency['p99_ms'] or 0:>8.0f}ms  errors {sum(level['errors'].values())}  "
+        f"fallbacks {level['fallbacks']}  degraded {level['degraded']}",
+        flush=True,
+    )
+    for stage, stats in level["stages"].items():
+        print(f"    {stage:<12} p50 {stats['p50_ms']:>8.0f}ms  p95 {stats['p95_ms']:>8.0f}ms  p99 {stats['p99_ms']:>8.0f}ms")
+    for worker in level["workers"]:
+        print(f"    pid {worker['pid']:<8} cpu {worker['cpu_percent']:>5}%  peak rss {worker['peak_rss_mb']}MB")
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp', '')}):")
+    previous = {(lvl["endpoint"], lvl["concurrency"]): lvl for lvl in baseline.get("levels", [])}
+    for level in report["levels"]:
+        old = previous.get((level["endpoint"], level["concurrency"]))
+        if not old:
+            continue
+
+        def change(new: Optional[float], before: Optional[float]) -> str:
+            if not new or not before:
+                return "    n/a"
+            return f"{100 * (new - before) / before:+6.1f}%"
+
+        print(
+            f"{level['endpoint']:<15} c={level['concurrency']:<4} "
+            f"req/s {change(level['requests_per_second'], old['requests_per_second'])}  "
+            f"p95 {change(level['latency']['p95_ms'], old['latency']['p95_ms'])}  "
+            f"p99 {change(level['latency']['p99_ms'], old['latency']['p99_ms'])}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test the planner API against a local mock OpenRouter at increasing concurrency."
+    )
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=["full-itinerary", "place-detail"],
+        default=["full-itinerary"],
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests-per-worker", type=int, default=5, help="Requests per concurrent client per level.")
+    parser.add_argument("--requests", type=int, help="Fixed number of requests per level instead.")
+    parser.add_argument(
+        "--cache",
+        choices=["cold", "stages", "warm"],
+        default="cold",
+        help="cold: every request misses all caches; stages: pipeline stage caches are shared between "
+        "requests; warm: place-detail requests repeat the same places (itinerary requests always miss).",
+    )
+    parser.add_argument("--city", default="pune", help="The recorded mock responses are for Pune.")
+    parser.add_argument("--home-city", default="mumbai")
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--interests", nargs="+", default=["history", "architecture"])
+    parser.add_argument("--places", nargs="+", default=DEFAULT_PLACES, help="Places for place-detail requests.")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes.")
+    parser.add_argument("--port", type=int, default=8788)
+    parser.add_argument("--latency-scale", type=float, default=0.05, help="Scales the mock's per-agent latencies.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock calls that fail.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--deadline", type=float, default=0, help="ITINERARY_DEADLINE for the server (0 disables).")
+    parser.add_argument(
+        "--tts-engine",
+        choices=["stub", "espeak", "gtts"],
+        default="stub",
+        help="TTS_ENGINE for the server; gtts calls Google for every place-detail request.",
+    )
+    parser.add_argument(
+        "--tts-chars-per-second",
+        type=float,
+        default=0,
+        help="Synthesis speed of the stub engine (0: instant).",
+    )
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument(
+        "--base-url", help="Benchmark an already running server instead (no CPU or memory figures)."
+    )
+    parser.add_argument("--log-dir", type=Path, default=BASE_PATH / "logs" / "benchmarks")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON report to compare against.")
+    args = parser.parse_args()
+
+    if args.base_url:
+        report = asyncio.run(run_benchmark(args, args.base_url, None))
+    else:
+        with services_under_test(args) as server_pid:
+            report = asyncio.run(run_benchmark(args, f"http://127.0.0.1:{args.port}", server_pid))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import argparse
+import copy
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Nothing here calls the provider, but importing the services reads the config,
+# which insists on a key.
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+from travel_ai.benchmarks.synthetic import synthetic_culinary, synthetic_llm_itinerary, synthetic_places  # noqa: E402
+from travel_ai.services.agents import rank_places_for_visit  # noqa: E402
+from travel_ai.services.evaluator import evaluate_plan  # noqa: E402
+from travel_ai.services.final_route_architect import (  # noqa: E402
+    _build_food_index,
+    _build_place_index,
+    _enforce_four_meals,
+    _insert_mandatory_places,
+    _sanitize_itinerary,
+)
+from travel_ai.services.tools import cluster_places_by_proximity  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "micro.json"
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+INTERESTS = ["history", "temple", "fort"]
+
+
+def _days_for(size: int) -> int:
+    # Itineraries are planned over a slice of the city, about 25 places a day.
+    return min(max(size // 25, 1), 400)
+
+
+@dataclass
+class Case:
+    """
+    One function under test. prepare builds the inputs for a size once, and
+    args turns them into a call's arguments; it runs outside the timed region
+    and copies anything the function mutates.
+    """
+
+    name: str
+    prepare: Callable[[int], Any]
+    args: Callable[[Any], Tuple[Any, ...]]
+    func: Callable[..., Any]
+
+
+def _itinerary_inputs(size: int) -> Dict[str, Any]:
+    places = synthetic_places(size)
+    culinary = synthetic_culinary(max(size // 10, 8))
+    return {
+        "parsed": synthetic_llm_itinerary(places, culinary["food_outlets"], _days_for(size)),
+        "place_index": _build_place_index(places),
+        "food_index": _build_food_index(culinary),
+        "mandatory": [p["name"] for p in places[:4]],
+    }
+
+
+def _mandatory_inputs(size: int) -> Dict[str, Any]:
+    places = synthetic_places(size)
+    place_index = _build_place_index(places)
+    # Full days, so the four mandatory places have to be forced in.
+    names = [p["name"] for p in places]
+    days = [
+        {"schedule_blocks": [{"time": "", "place": names[(d * 4 + i) % len(names)]} for i in range(4)]}
+        for d in range(max(size // 4, 1))
+    ]
+    return {"days": days, "mandatory": names[-4:], "place_index": place_index}
+
+
+def _meal_inputs(size: int) -> Dict[str, Any]:
+    culinary = synthetic_culinary(size)
+    # Evening snack outlets only at the end, so the fallback scan walks the index.
+    for outlet in culinary["food_outlets"][:-1]:
+        outlet["meal_slots"] = [slot for slot in outlet["meal_slots"] if slot != "Snacks"] or ["Lunch"]
+    food_index = _build_food_index(culinary)
+    halts = [{"meal_type": "breakfast", "outlet": "Outlet 0"}, {"meal_type": "lunch", "outlet": "Missing Outlet"}]
+    return {"halts": halts, "food_index": food_index}
+
+
+def _plan_inputs(size: int) -> Dict[str, Any]:
+    days = [{"activities": [{"name": f"Place {i}"} for i in range(4)]} for _ in range(max(size // 4, 1))]
+    return {"plan": {"days": days}, "budget": {"within_budget": True}}
+
+
+CASES: List[Case] = [
+    Case("cluster_places_by_proximity", synthetic_places, lambda places: (places,), cluster_places_by_proximity),
+    Case(
+        "rank_places_for_visit",
+        synthetic_places,
+        lambda places: (places, INTERESTS),
+        rank_places_for_visit,
+    ),
+    Case("_build_place_index", synthetic_places, lambda places: (places,), _build_place_index),
+    Case(
+        "_sanitize_itinerary",
+        _itinerary_inputs,
+        lambda s: (
+            s["parsed"], s["place_index"], s["food_index"], "Pune",
+            len(s["parsed"]["itinerary"]["days"]), 10**9, s["mandatory"],
+        ),
+        _sanitize_itinerary,
+    ),
+    Case("_enforce_four_meals", _meal_inputs, lambda s: (s["halts"], s["food_index"]), _enforce_four_meals),
+    Case(
+        "_insert_mandatory_places",
+        _mandatory_inputs,
+        lambda s: (copy.deepcopy(s["days"]), s["mandatory"], s["place_index"]),
+        _insert_mandatory_places,
+    ),
+    Case("evaluate_plan", _plan_inputs, lambda s: (s["plan"], s["budget"]), evaluate_plan),
+]
+
+
+# ----------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------
+def measure(case: Case, size: int, min_time: float, repeats: int) -> Dict[str, Any]:
+    """
+    Median and best seconds per call over repeats rounds, each long enough to
+    take min_time, plus the peak memory allocated by one call.
+    """
+    state = case.prepare(size)
+
+    start = time.perf_counter()
+    case.func(*case.args(state))
+    single = time.perf_counter() - start
+    number = max(1, min(int(min_time / max(single, 1e-7)), 100_000))
+
+    rounds = []
+    for _ in range(repeats):
+        calls = [case.args(state) for _ in range(number)]
+        start = time.perf_counter()
+        for args in calls:
+            case.func(*args)
+        rounds.append((time.perf_counter() - start) / number)
+
+    args = case.args(state)
+    tracemalloc.start()
+    try:
+        case.func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(rounds),
+        "best_s": min(rounds),
+        "calls": number * repeats,
+        "peak_bytes": peak,
+    }
+
+
+def _projected_seconds(results: Dict[int, Dict[str, Any]], size: int) -> Optional[float]:
+    """
+    Time for one call at size, extrapolated from the growth between the two
+    largest sizes measured so far (at least linear, at most cubic).
+    """
+    measured = sorted(results)
+    if not measured:
+        return None
+    last = measured[-1]
+    exponent = 2.0
+    if len(measured) >= 2:
+        prev = measured[-2]
+        ratio = results[last]["median_s"] / max(results[prev]["median_s"], 1e-9)
+        exponent = math.log(max(ratio, 1e-9)) / math.log(last / prev)
+    exponent = min(max(exponent, 1.0), 3.0)
+    return results[last]["median_s"] * (size / last) ** exponent
+
+
+def run_cases(
+    cases: List[Case], sizes: List[int], min_time: float, repeats: int, max_seconds: float
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for case in cases:
+        measured: Dict[int, Dict[str, Any]] = {}
+        for size in sizes:
+            projected = _projected_seconds(measured, size)
+            if projected is not None and projected > max_seconds:
+                print(f"{case.name:<28} {size:>7}  skipped, projected {projected:.0f}s per call", flush=True)
+                continue
+            measured[size] = measure(case, size, min_time, repeats)
+            _print_result(case.name, size, measured[size])
+        results[case.name] = {str(size): result for size, result in measured.items()}
+    return results
+
+
+# ----------------------------------------------------------
+# Baselines
+# ----------------------------------------------------------
+def _environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, Dict[str, Any]]],
+    baseline: Dict[str, Dict[str, Dict[str, Any]]],
+    threshold: float,
+) -> List[str]:
+    """
+    Cases whose best time or peak memory grew by more than threshold
+    (0.2 = 20%) over the baseline. The best round is compared because it is
+    the least affected by other load on the machine.
+    """
+    regressions = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            old = baseline.get(name, {}).get(size)
+            if not old:
+                continue
+            for field, label in (("best_s", "time"), ("peak_bytes", "memory")):
+                if old[field] and result[field] > old[field] * (1 + threshold):
+                    change = 100 * (result[field] - old[field]) / old[field]
+                    regressions.append(f"{name} at {size}: {label} +{change:.0f}%")
+    return regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def _print_result(name: str, size: int, result: Dict[str, Any]) -> None:
+    print(
+        f"{name:<28} {size:>7}  median {_format_seconds(result['median_s']):>9}  "
+        f"best {_format_seconds(result['best_s']):>9}  peak {result['peak_bytes'] / 1024:>10.1f}KiB",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time and memory-profile the deterministic planning functions on synthetic cities."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Places per synthetic city.")
+    parser.add_argument("--cases", nargs="+", choices=[c.name for c in CASES], help="Only these functions.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Seconds each timing round should last.")
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=10.0,
+        help="Skip sizes where one call is projected to take longer than this.",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging, 0.2 = 20%%.")
+    args = parser.parse_args()
+
+    cases = [c for c in CASES if not args.cases or c.name in args.cases]
+    results = run_cases(cases, sorted(args.sizes), args.min_time, max(args.repeats, 1), args.max_seconds)
+
+    if args.save_baseline:
+        existing: Dict[str, Any] = {}
+        if args.baseline.exists():
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                existing = json.load(f).get("results", {})
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            payload = {"environment": _environment(), "results": {**existing, **results}}
+            json.dump(payload, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != _environment():
+        print("Warning: the baseline was recorded on a different Python or machine.")
+    regressions = find_regressions(results, baseline.get("results", {}), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
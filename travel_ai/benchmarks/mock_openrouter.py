@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "openrouter_responses.json"
+
+# Median provider latency in seconds per agent, roughly what OpenRouter shows
+# for a 70B model with these prompt and output sizes.
+DEFAULT_MEDIAN_LATENCY = {
+    "discovery": 4.0,
+    "culinary": 6.0,
+    "cluster_priority": 3.0,
+    "final_route": 9.0,
+    "place_detail": 7.0,
+    "place_detail_local_script": 3.0,
+    "optimization": 2.5,
+    "unknown": 2.0,
+}
+
+# Agents are recognised by a key of the JSON schema their system prompt asks
+# for; the first match wins.
+AGENT_MARKERS: List[Tuple[str, str]] = [
+    ('"additional_places"', "discovery"),
+    ('"food_outlets"', "culinary"),
+    ('"suggested_time"', "cluster_priority"),
+    ('"schedule_blocks"', "final_route"),
+    ('"english_text"', "place_detail"),
+    ('"local_text"', "place_detail_local_script"),
+    ('"optimized_places"', "optimization"),
+]
+
+
+# Share of a call's latency spent before the first token (prompt processing),
+# and how much of that a prompt cache hit saves for the cached part.
+FIRST_TOKEN_SHARE = 0.3
+CACHED_PREFILL_SAVING = 0.8
+STREAM_CHUNKS = 20
+
+
+def _text(content: Any) -> str:
+    """
+    Message content as text, whether a string or a list of content parts.
+    """
+    if isinstance(content, list):
+        return "".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    return str(content or "")
+
+
+def _cacheable_prefix(messages: List[Dict[str, Any]]) -> str:
+    """
+    The prompt text a provider could serve from its prefix cache: the system
+    prompt, plus any user content parts up to the last cache_control
+    breakpoint.
+    """
+    prefix = ""
+    for message in messages:
+        content = message.get("content")
+        if message.get("role") == "system":
+            prefix += _text(content)
+        elif isinstance(content, list):
+            marked = [i for i, part in enumerate(content) if isinstance(part, dict) and part.get("cache_control")]
+            if marked:
+                prefix += _text(content[: marked[-1] + 1])
+            break
+        else:
+            break
+    return prefix
+
+
+def detect_agent(system_prompt: str) -> str:
+    for marker, agent in AGENT_MARKERS:
+        if marker in system_prompt:
+            return agent
+    return "unknown"
+
+
+class MockOpenRouter:
+    """
+    Answers chat completion requests with recorded responses for the agent
+    that sent them, after a log-normally distributed delay. A share of calls
+    can fail with an HTTP error or hang past the client's timeout. Prompt
+    prefixes seen before count as provider cache hits: they are reported as
+    cached tokens and shorten the time to the first token.
+    """
+
+    def __init__(
+        self,
+        fixtures: Dict[str, List[Any]],
+        latency_scale: float = 1.0,
+        latency_sigma: float = 0.5,
+        median_latency: Optional[Dict[str, float]] = None,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 65.0,
+        seed: Optional[int] = None,
+    ):
+        self.responses: Dict[str, Iterator[Any]] = {
+            agent: itertools.cycle(items) for agent, items in fixtures.items() if isinstance(items, list) and items
+        }
+        self.latency_scale = latency_scale
+        self.latency_sigma = latency_sigma
+        self.median_latency = {**DEFAULT_MEDIAN_LATENCY, **(median_latency or {})}
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.random = random.Random(seed)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.seen_prefixes: Set[int] = set()
+
+    def _count(self, agent: str, field: str) -> None:
+        counts = self.stats.setdefault(agent, {"calls": 0, "errors": 0, "hangs": 0, "cache_hits": 0})
+        counts[field] += 1
+
+    def delay(self, agent: str) -> float:
+        median = self.median_latency.get(agent, self.median_latency["unknown"])
+        return median * self.latency_scale * self.random.lognormvariate(0, self.latency_sigma)
+
+    async def complete(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any], float]:
+        """
+        Waits until the first token would arrive and returns the status, the
+        response body and the seconds the rest of the answer would take.
+        """
+        messages = payload.get("messages") or []
+        system_prompt = next((_text(m.get("content")) for m in messages if m.get("role") == "system"), "")
+        prompt_chars = sum(len(_text(m.get("content"))) for m in messages)
+        agent = detect_agent(system_prompt)
+        self._count(agent, "calls")
+
+        prefix = _cacheable_prefix(messages)
+        cached_chars = 0
+        if prefix:
+            if hash(prefix) in self.seen_prefixes:
+                cached_chars = len(prefix)
+                self._count(agent, "cache_hits")
+            self.seen_prefixes.add(hash(prefix))
+
+        roll = self.random.random()
+        if roll < self.hang_rate:
+            self._count(agent, "hangs")
+            await asyncio.sleep(self.hang_seconds)
+        delay = self.delay(agent)
+        first_token = delay * FIRST_TOKEN_SHARE
+        first_token *= 1 - CACHED_PREFILL_SAVING * cached_chars / max(prompt_chars, 1)
+        await asyncio.sleep(first_token)
+        if self.hang_rate <= roll < self.hang_rate + self.error_rate:
+            self._count(agent, "errors")
+            return self.error_status, {"error": {"code": self.error_status, "message": "Injected provider error"}}, 0.0
+
+        recorded = next(self.responses[agent]) if agent in self.responses else {}
+        content = recorded if isinstance(recorded, str) else json.dumps(recorded, ensure_ascii=False)
+        return 200, {
+            "id": f"gen-mock-{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "model": payload.get("model", ""),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            # Roughly four characters per token.
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "prompt_tokens_details": {"cached_tokens": cached_chars // 4},
+            },
+        }, delay * (1 - FIRST_TOKEN_SHARE)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return method, path, headers, body
+
+
+async def _write_stream(writer: asyncio.StreamWriter, completion: Dict[str, Any], duration: float) -> None:
+    """
+    Sends a completion as OpenRouter-style server-sent events, spreading the
+    content over duration seconds, then closes the connection.
+    """
+    writer.write(
+        b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n"
+    )
+    writer.write(b": OPENROUTER PROCESSING\n\n")
+    content = completion["choices"][0]["message"]["content"]
+    size = max(len(content) // STREAM_CHUNKS, 1)
+    pieces = [content[i : i + size] for i in range(0, len(content), size)] or [""]
+    for index, piece in enumerate(pieces):
+        if index:
+            await asyncio.sleep(duration / len(pieces))
+        chunk = {
+            "id": completion["id"],
+            "object": "chat.completion.chunk",
+            "model": completion["model"],
+            "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": None}],
+        }
+        writer.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+        await writer.drain()
+    final = {
+        "id": completion["id"],
+        "object": "chat.completion.chunk",
+        "model": completion["model"],
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        "usage": completion["usage"],
+    }
+    writer.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+    await writer.drain()
+
+
+def _encode_response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def serve(mock: MockOpenRouter, host: str, port: int) -> None:
+    async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                method, path, headers, body = await _read_request(reader)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if method == "POST" and path.rstrip("/").endswith("/chat/completions"):
+                    try:
+                        request = json.loads(body or b"{}")
+                    except ValueError:
+                        request = None
+                    if request is None:
+                        status, payload = 400, {"error": {"code": 400, "message": "Invalid JSON body"}}
+                    else:
+                        status, payload, rest = await mock.complete(request)
+                        if status == 200 and request.get("stream"):
+                            await _write_stream(writer, payload, rest)
+                            break
+                        await asyncio.sleep(rest)
+                elif method == "GET" and path == "/stats":
+                    status, payload = 200, mock.stats
+                else:
+                    status, payload = 404, {"error": {"code": 404, "message": f"No route for {method} {path}"}}
+                writer.write(_encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle_client, host, port)
+    print(f"Mock OpenRouter listening on http://{host}:{port}/api/v1/chat/completions", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def _parse_latency_overrides(values: List[str]) -> Dict[str, float]:
+    overrides = {}
+    for value in values:
+        agent, _, seconds = value.partition("=")
+        overrides[agent.strip()] = float(seconds)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve recorded OpenRouter responses with configurable latency and error injection."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="Recorded responses per agent.")
+    parser.add_argument(
+        "--latency-scale", type=float, default=1.0, help="Multiplier for all agent latencies (0 answers at once)."
+    )
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Spread of the log-normal latency.")
+    parser.add_argument(
+        "--agent-latency",
+        action="append",
+        default=[],
+        metavar="AGENT=SECONDS",
+        help="Median latency for one agent, e.g. final_route=12. Repeat for several.",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls answered with --error-status.")
+    parser.add_argument("--error-status", type=int, default=500, choices=[429, 500, 502, 503])
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Share of calls held for --hang-seconds first.")
+    parser.add_argument("--hang-seconds", type=float, default=65.0)
+    parser.add_argument("--seed", type=int, help="Seed for reproducible latencies and errors.")
+    args = parser.parse_args()
+
+    with open(args.fixtures, "r", encoding="utf-8") as f:
+        fixtures = json.load(f)
+    mock = MockOpenRouter(
+        fixtures,
+        latency_scale=args.latency_scale,
+        latency_sigma=args.latency_sigma,
+        median_latency=_parse_latency_overrides(args.agent_latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed,
+    )
+    asyncio.run(serve(mock, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import json
+import math
+import random
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from travel_ai.services.data_loader import CITIES_PATH
+
+# Centre of the synthetic city (Pune) and the radius, in km, that most of its
+# neighbourhoods fall within.
+DEFAULT_CENTER = (18.5204, 73.8567)
+CITY_RADIUS_KM = 12.0
+OUTSKIRTS_RADIUS_KM = 40.0
+KM_PER_DEGREE_LAT = 111.0
+
+MEAL_TYPES = ["Breakfast", "Lunch", "Snacks", "Dinner"]
+DISHES = ["Misal Pav", "Thali", "Vada Pav", "Poha", "Biryani", "Dosa", "Mastani", "Kebab", "Pav Bhaji", "Jalebi"]
+
+
+@lru_cache(maxsize=1)
+def real_places() -> Tuple[Tuple[str, str, float, float], ...]:
+    """
+    (name, category, rating, ticket_price) for every place in data/cities, so
+    synthetic names, categories and prices follow the real mix.
+    """
+    rows = []
+    for path in sorted(CITIES_PATH.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            for place in json.load(f).get("places", []):
+                if place.get("name"):
+                    rows.append(
+                        (
+                            str(place["name"]),
+                            str(place.get("category", "")).strip(),
+                            float(place.get("rating") or 4.2),
+                            float(place.get("ticket_price") or 0.0),
+                        )
+                    )
+    return tuple(rows)
+
+
+def _offset(lat: float, lng: float, north_km: float, east_km: float) -> Tuple[float, float]:
+    return (
+        lat + north_km / KM_PER_DEGREE_LAT,
+        lng + east_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(lat))),
+    )
+
+
+def synthetic_places(
+    count: int, seed: int = 0, center: Tuple[float, float] = DEFAULT_CENTER
+) -> List[Dict[str, Any]]:
+    """
+    count discovery-shaped places. Most sit in dense neighbourhoods spread
+    around the centre, like an old city core and its suburbs, and a few are
+    scattered across the outskirts (forts, dams, hill temples).
+    """
+    rng = random.Random(seed)
+    templates = real_places()
+    neighbourhoods = [
+        _offset(*center, rng.gauss(0, CITY_RADIUS_KM / 2), rng.gauss(0, CITY_RADIUS_KM / 2))
+        for _ in range(max(3, int(math.sqrt(count) / 2)))
+    ]
+    # A few neighbourhoods hold most places.
+    weights = [1 / (rank + 1) for rank in range(len(neighbourhoods))]
+
+    places = []
+    for index in range(count):
+        name, category, rating, ticket_price = rng.choice(templates)
+        if rng.random() < 0.05:
+            distance = rng.uniform(CITY_RADIUS_KM, OUTSKIRTS_RADIUS_KM)
+            bearing = rng.uniform(0, 2 * math.pi)
+            lat, lng = _offset(*center, distance * math.cos(bearing), distance * math.sin(bearing))
+        else:
+            base = rng.choices(neighbourhoods, weights)[0]
+            lat, lng = _offset(*base, rng.gauss(0, 1.2), rng.gauss(0, 1.2))
+        places.append(
+            {
+                "name": f"{name} {index}",
+                "lat": round(lat, 6),
+                "lng": round(lng, 6),
+                "category": category,
+                "rating": round(min(max(rating + rng.gauss(0, 0.2), 3.0), 5.0), 1),
+                "ticket_price": ticket_price,
+                "image_url": "",
+            }
+        )
+    return places
+
+
+def synthetic_culinary(count: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Culinary intelligence with count food outlets, each open for one or two
+    meal slots.
+    """
+    rng = random.Random(seed)
+    outlets = []
+    for index in range(count):
+        slots = rng.sample(MEAL_TYPES, rng.choice([1, 1, 2]))
+        outlets.append(
+            {
+                "name": f"Outlet {index}",
+                "area_or_neighborhood": f"Peth {index % 40}",
+                "signature_dishes": rng.sample(DISHES, 2),
+                "meal_slots": slots,
+                "legacy_score": round(rng.uniform(5, 10), 1),
+                "cuisine": "Maharashtrian",
+            }
+        )
+    return {
+        "breakfast_signatures": ["Misal Pav", "Poha"],
+        "snack_signatures": ["Vada Pav"],
+        "food_outlets": outlets,
+    }
+
+
+def synthetic_llm_itinerary(
+    places: List[Dict[str, Any]], outlets: List[Dict[str, Any]], num_days: int, seed: int = 0
+) -> Dict[str, Any]:
+    """
+    A parsed final-route response shaped like real model output. Names vary
+    in case and spacing, one block in ten names a place that does not exist,
+    and one meal a day is missing, so the sanitiser does its full work.
+    """
+    rng = random.Random(seed)
+    days = []
+    for day in range(1, num_days + 1):
+        blocks = []
+        for hour in (9, 11, 14, 17):
+            place = rng.choice(places)
+            name = place["name"] if rng.random() > 0.1 else f"Unknown Place {rng.randrange(10**6)}"
+            if rng.random() < 0.3:
+                name = f"  {name.upper()} "
+            blocks.append(
+                {"time": f"{hour:02d}:00-{hour + 1:02d}:00", "place": name, "reason_for_time_choice": "Route order"}
+            )
+        halts = []
+        for meal_type in rng.sample(MEAL_TYPES, 3):
+            outlet = rng.choice(outlets) if outlets else {"name": "Nowhere"}
+            halts.append({"meal_type": meal_type.lower(), "outlet": outlet["name"], "signature_dish": ""})
+        days.append(
+            {
+                "day": day,
+                "schedule_blocks": blocks,
+                "food_halts": halts,
+                "total_walking_km_estimate": round(rng.uniform(2, 6), 1),
+            }
+        )
+    return {"itinerary": {"title": "Synthetic", "days": days}}
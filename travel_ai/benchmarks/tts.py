@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+# Nothing here calls the provider, but importing the services reads the config,
+# which insists on a key.
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+from travel_ai.benchmarks.load_test import summarize  # noqa: E402
+from travel_ai.services.tts_engines import ENGINES, TTSItem, get_engine  # noqa: E402
+
+# About the length of one place-detail narration.
+SAMPLE_SENTENCE = (
+    "Shaniwar Wada was the seat of the Peshwas of the Maratha Empire, built in 1732 and largely burnt in 1828. "
+)
+
+
+def _items(count: int, chars: int, language: str) -> List[TTSItem]:
+    text = (SAMPLE_SENTENCE * (chars // len(SAMPLE_SENTENCE) + 1))[:chars]
+    # A distinct text per item, so engines that cache cannot skip work.
+    return [TTSItem(text=f"{index}. {text}", language=language) for index in range(count)]
+
+
+async def run(engine_name: str, items: List[TTSItem], batch_size: int) -> Dict[str, Any]:
+    engine = get_engine(engine_name)
+    batch_ms: List[float] = []
+    audio_bytes = 0
+    start = time.perf_counter()
+    for offset in range(0, len(items), batch_size):
+        batch_start = time.perf_counter()
+        audio = await engine.synthesize_batch(items[offset : offset + batch_size])
+        batch_ms.append((time.perf_counter() - batch_start) * 1000)
+        audio_bytes += sum(len(a) for a in audio)
+    elapsed = time.perf_counter() - start
+    chars = sum(len(item.text) for item in items)
+    return {
+        "engine": engine_name,
+        "format": engine.audio_format,
+        "files": len(items),
+        "files_per_second": round(len(items) / elapsed, 2),
+        "chars_per_second": round(chars / elapsed),
+        "audio_kb_per_file": round(audio_bytes / len(items) / 1024, 1),
+        "batch": summarize(batch_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure text-to-speech engine throughput on narration-sized texts.")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=["stub"])
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--chars", type=int, default=900, help="Characters per text.")
+    parser.add_argument("--batch-size", type=int, default=4, help="Texts per synthesize_batch call.")
+    args = parser.parse_args()
+
+    items = _items(max(args.files, 1), args.chars, args.language)
+    for name in args.engines:
+        result = asyncio.run(run(name, items, max(args.batch_size, 1)))
+        batch = result["batch"]
+        print(
+            f"{name:<8}{result['format']:>5}  {result['files_per_second']:>8} files/s"
+            f"{result['chars_per_second']:>10} chars/s{result['audio_kb_per_file']:>9} KB/file"
+            f"   batch p50 {batch['p50_ms']} ms  p95 {batch['p95_ms']} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
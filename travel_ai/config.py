@@ -14,8 +14,9 @@ load_dotenv()
 # variable for security.
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
-# The base URL for the OpenRouter API.
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+# The base URL for the OpenRouter API. Benchmarks point this at the local mock
+# server (travel_ai.benchmarks.mock_openrouter).
+OPENROUTER_URL = os.getenv("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
 
 # The specific language model to be used for generating content.
 # Example: "meta-llama/llama-3-70b-instruct", "google/gemini-pro"
@@ -39,6 +40,283 @@ REQUEST_TIMEOUT = 60
 LOGGING_LEVEL = "INFO"
 
 
+# ==========================================================
+# Itinerary Cache Settings
+# ==========================================================
+
+# Age in seconds after which a cached itinerary is considered stale. Stale
+# entries are still served immediately while a fresh copy is regenerated in
+# the background (stale-while-revalidate).
+ITINERARY_CACHE_SOFT_TTL = int(os.getenv("ITINERARY_CACHE_SOFT_TTL", 7 * 24 * 3600))
+
+# Age in seconds after which a cached itinerary is no longer served at all and
+# the request falls through to the full planning pipeline.
+ITINERARY_CACHE_HARD_TTL = int(os.getenv("ITINERARY_CACHE_HARD_TTL", 30 * 24 * 3600))
+
+# Maximum number of stale itineraries regenerated in the background at once.
+ITINERARY_REVALIDATE_CONCURRENCY = int(os.getenv("ITINERARY_REVALIDATE_CONCURRENCY", 2))
+
+# Age in seconds after which cached per-city stage results (discovery and
+# culinary intelligence) are regenerated.
+STAGE_CACHE_TTL = int(os.getenv("STAGE_CACHE_TTL", 7 * 24 * 3600))
+
+
+# ==========================================================
+# Storage and Event Loop Settings
+# ==========================================================
+
+# Threads dedicated to cache and dataset file I/O so reads and writes never
+# run on the event loop.
+STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", 8))
+
+# Compression for cache entries: "zstd" (needs the optional zstandard
+# package), "gzip", "none", or "auto" to use zstd when it is installed.
+CACHE_ENTRY_CODEC = os.getenv("CACHE_ENTRY_CODEC", "auto")
+
+# How often, in seconds, the event loop lag monitor samples the loop.
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", 0.5))
+
+# Lag in milliseconds above which a sample is logged as an event loop stall.
+EVENT_LOOP_LAG_WARN_MS = float(os.getenv("EVENT_LOOP_LAG_WARN_MS", 100))
+
+
+# ==========================================================
+# Shared Cache Backend
+# ==========================================================
+
+# Where cache entries live: "file" keeps them under travel_ai/cache on local
+# disk, "redis" stores them in a Redis-protocol server shared by all workers
+# and hosts.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+
+# Connection URL for the "redis" backend, e.g. redis://:password@host:6379/0.
+REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
+
+# Lifetime in seconds of the lease a worker holds while building a cache
+# entry. It must outlast a full pipeline run; an expired lease lets another
+# worker take over after a crash.
+CACHE_LEASE_TTL = int(os.getenv("CACHE_LEASE_TTL", 180))
+
+# How long in seconds a worker waits for another worker's build of the same
+# entry before building it itself.
+CACHE_LEASE_WAIT = float(os.getenv("CACHE_LEASE_WAIT", 120))
+
+
+# ==========================================================
+# Request Deadline Settings
+# ==========================================================
+
+# End-to-end time budget in seconds for an interactive /planner/full-itinerary
+# request. Stages that run out of budget fall back to deterministic output.
+# Set to 0 to disable.
+ITINERARY_DEADLINE = float(os.getenv("ITINERARY_DEADLINE", 28))
+
+# Share of ITINERARY_DEADLINE each stage may use, measured from the moment it
+# starts. Discovery, priority and final route run one after another;
+# culinary intelligence runs alongside discovery and priority.
+ITINERARY_STAGE_BUDGETS = {
+    "discovery": 0.3,
+    "culinary": 0.55,
+    "priority": 0.25,
+    "final_route": 0.45,
+}
+
+# How often in seconds a blocking planner request checks whether its client
+# has disconnected, so abandoned pipelines can be cancelled.
+CLIENT_DISCONNECT_POLL_INTERVAL = float(os.getenv("CLIENT_DISCONNECT_POLL_INTERVAL", 0.5))
+
+
+# ==========================================================
+# LLM Circuit Breaker
+# ==========================================================
+
+# Calls considered when deciding whether to open the breaker: those made in
+# the last LLM_BREAKER_WINDOW seconds, once there are at least
+# LLM_BREAKER_MIN_CALLS of them.
+LLM_BREAKER_WINDOW = float(os.getenv("LLM_BREAKER_WINDOW", 60))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", 5))
+
+# The breaker opens when this share of recent calls failed...
+LLM_BREAKER_FAILURE_RATE = float(os.getenv("LLM_BREAKER_FAILURE_RATE", 0.5))
+
+# ...or when this share took longer than LLM_BREAKER_SLOW_CALL seconds.
+LLM_BREAKER_SLOW_CALL = float(os.getenv("LLM_BREAKER_SLOW_CALL", 20))
+LLM_BREAKER_SLOW_CALL_RATE = float(os.getenv("LLM_BREAKER_SLOW_CALL_RATE", 0.5))
+
+# Seconds the breaker stays open, failing calls immediately, before a single
+# trial call is let through to probe the provider.
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", 30))
+
+# Prebuilt fallback itineraries served while the breaker is open cover trips
+# of 1 to FALLBACK_ITINERARY_MAX_DAYS days.
+FALLBACK_ITINERARY_MAX_DAYS = int(os.getenv("FALLBACK_ITINERARY_MAX_DAYS", 7))
+
+
+# ==========================================================
+# Prompt Caching
+# ==========================================================
+
+# Static prompt text (the system prompt, then context shared by every
+# request for a city) is always sent first, so providers that cache matching
+# prompt prefixes on their own can reuse it. "on" also ends each static part
+# with a cache_control breakpoint, which Anthropic and Gemini models need
+# before they cache anything; "auto" adds breakpoints only for those models
+# and "off" never does.
+LLM_PROMPT_CACHE_MARKERS = os.getenv("LLM_PROMPT_CACHE_MARKERS", "auto")
+
+# Stream completions from the provider (LLM_STREAM=1) so time to first token
+# can be measured. Content is still returned to the agents in one piece.
+LLM_STREAM = os.getenv("LLM_STREAM", "0") == "1"
+
+
+# ==========================================================
+# LLM Record/Replay
+# ==========================================================
+
+# "off" calls the provider as usual. "record" also stores every prompt and
+# response pair in LLM_CASSETTE_DIR, "replay" answers only from stored pairs
+# (no network; unknown prompts fail) and "auto" replays what it has and
+# records the rest.
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off")
+
+# Cassette directory; defaults to travel_ai/cassettes.
+LLM_CASSETTE_DIR = os.getenv("LLM_CASSETTE_DIR", "")
+
+
+# ==========================================================
+# Token Accounting
+# ==========================================================
+
+# Every LLM call is appended, with its agent, request trace ID and token
+# counts, to a ledger file per UTC day in TOKEN_LEDGER_DIR (defaults to
+# travel_ai/logs/token_ledger). Set TOKEN_LEDGER=0 to turn the ledger off.
+TOKEN_LEDGER = os.getenv("TOKEN_LEDGER", "1") == "1"
+TOKEN_LEDGER_DIR = os.getenv("TOKEN_LEDGER_DIR", "")
+
+# USD per million prompt and completion tokens, used to price calls when the
+# provider reports no cost. Costs are left out while both are 0.
+LLM_PRICE_PER_MTOK_IN = float(os.getenv("LLM_PRICE_PER_MTOK_IN", 0))
+LLM_PRICE_PER_MTOK_OUT = float(os.getenv("LLM_PRICE_PER_MTOK_OUT", 0))
+
+
+# ==========================================================
+# Tracing
+# ==========================================================
+
+# Where finished request traces go: "none", "file" (JSON lines, one span per
+# line, at TRACE_FILE) or "otlp" (OTLP/HTTP JSON to TRACE_OTLP_ENDPOINT).
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+
+# Span file for the "file" exporter; defaults to travel_ai/logs/traces.jsonl.
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+
+# OpenTelemetry collector endpoint for the "otlp" exporter.
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces")
+
+# service.name reported with exported spans.
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "travel-ai")
+
+
+# ==========================================================
+# Request Profiling
+# ==========================================================
+
+# Token for the /admin endpoints and for profiling a request on demand
+# (X-Profile: 1 plus X-Admin-Token). Admin access is disabled while empty.
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+
+# Fraction of requests profiled without the header (0 disables sampling).
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+# Where profiles are kept; defaults to travel_ai/logs/profiles. Only the newest
+# PROFILE_MAX_FILES are kept.
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+
+# ==========================================================
+# Itinerary Job Settings
+# ==========================================================
+
+# Itinerary pipelines run at once by the background job workers.
+ITINERARY_JOB_WORKERS = int(os.getenv("ITINERARY_JOB_WORKERS", 2))
+
+# Jobs waiting for a worker; further submissions are rejected until the
+# queue drains.
+ITINERARY_JOB_QUEUE_SIZE = int(os.getenv("ITINERARY_JOB_QUEUE_SIZE", 100))
+
+# How long in seconds a finished job and its result stay available for
+# polling.
+ITINERARY_JOB_RETENTION = int(os.getenv("ITINERARY_JOB_RETENTION", 3600))
+
+
+# ==========================================================
+# Narration Prefetch
+# ==========================================================
+
+# Once an itinerary is served, place details (narration and audio) for each
+# of its scheduled places are generated in the background by this many
+# workers, so taps on them hit the cache. Set to 0 to turn prefetching off.
+PLACE_PREFETCH_WORKERS = int(os.getenv("PLACE_PREFETCH_WORKERS", 2))
+
+# Places waiting for a prefetch worker; further places are dropped until the
+# queue drains.
+PLACE_PREFETCH_QUEUE_SIZE = int(os.getenv("PLACE_PREFETCH_QUEUE_SIZE", 500))
+
+# Prefetch workers wait while interactive planner requests are in flight,
+# but for at most this many seconds per place, so constant traffic cannot
+# starve them.
+PLACE_PREFETCH_MAX_DEFER = float(os.getenv("PLACE_PREFETCH_MAX_DEFER", 10))
+
+
+# ==========================================================
+# Text-to-Speech
+# ==========================================================
+
+# Speech engine for place-detail audio: "gtts" (Google, needs the network,
+# MP3), "espeak" (a local espeak-ng, WAV) or "stub" (silent WAV of a
+# deterministic length, for offline tests and benchmarks).
+TTS_ENGINE = os.getenv("TTS_ENGINE", "gtts")
+
+# Per-language overrides of TTS_ENGINE as comma-separated language=engine
+# pairs, e.g. "hi=espeak,en=gtts".
+TTS_ENGINE_BY_LANGUAGE = os.getenv("TTS_ENGINE_BY_LANGUAGE", "")
+
+# espeak-ng executable used by the espeak engine.
+TTS_ESPEAK_BINARY = os.getenv("TTS_ESPEAK_BINARY", "espeak-ng")
+
+# Characters the stub engine "synthesizes" per second; 0 returns at once.
+# Set it to model a real engine's cost in load tests.
+TTS_STUB_CHARS_PER_SECOND = float(os.getenv("TTS_STUB_CHARS_PER_SECOND", 0))
+
+# Audio files synthesized at once. Blocking engines run on a thread pool of
+# this size, separate from the one used for cache and dataset I/O.
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", 4))
+
+# How long in seconds an audio events stream waits for a place's audio
+# before closing with whatever status it has.
+AUDIO_EVENTS_TIMEOUT = float(os.getenv("AUDIO_EVENTS_TIMEOUT", 120))
+
+# How often in seconds an audio events stream checks for finished files.
+AUDIO_EVENTS_POLL_INTERVAL = float(os.getenv("AUDIO_EVENTS_POLL_INTERVAL", 0.5))
+
+# How often in seconds a progressive audio stream checks for the next
+# synthesized sentence. It gives up after AUDIO_EVENTS_TIMEOUT seconds.
+AUDIO_STREAM_POLL_INTERVAL = float(os.getenv("AUDIO_STREAM_POLL_INTERVAL", 0.1))
+
+
+# ==========================================================
+# Batch Planning Settings
+# ==========================================================
+
+# Maximum number of itinerary requests accepted in one batch call.
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 50))
+
+# Per-request stages (priority assignment and final route) run at once
+# across a batch.
+BATCH_REQUEST_CONCURRENCY = int(os.getenv("BATCH_REQUEST_CONCURRENCY", 4))
+
+
 # ==========================================================
 # Environment Validation
 # ==========================================================
@@ -1,11 +1,64 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from travel_ai.routes.admin import router as admin_router
 from travel_ai.routes.planner import router as planner_router
+from travel_ai.services.job_service import job_manager
+from travel_ai.services.llm_service import llm_breaker
+from travel_ai.services.loop_monitor import loop_lag_monitor
+from travel_ai.services.metrics import register_gauge, registry
+from travel_ai.services.narration_prefetch import narration_prefetcher
+from travel_ai.services.profiling import ProfilingMiddleware
+from travel_ai.services.token_accounting import TokenUsageMiddleware
+from travel_ai.services.tracing import TracingMiddleware
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
-app = FastAPI(title="Travel AI Multi-Agent Planner")
+
+
+register_gauge(
+    "travel_ai_event_loop_lag_seconds",
+    "Most recent event loop lag sample.",
+    lambda: loop_lag_monitor.snapshot()["last_ms"] / 1000,
+)
+register_gauge(
+    "travel_ai_event_loop_lag_p99_seconds",
+    "99th percentile of recent event loop lag samples.",
+    lambda: loop_lag_monitor.snapshot()["p99_ms"] / 1000,
+)
+register_gauge(
+    "travel_ai_event_loop_stalls",
+    "Event loop lag samples above the warning threshold since start.",
+    lambda: loop_lag_monitor.stalls,
+)
+register_gauge(
+    "travel_ai_llm_circuit_open",
+    "1 while the LLM circuit breaker is rejecting calls.",
+    lambda: 1 if llm_breaker.is_open else 0,
+)
+register_gauge(
+    "travel_ai_place_prefetch_queue_depth",
+    "Places waiting for a narration prefetch worker.",
+    lambda: narration_prefetcher.snapshot()["queue_depth"],
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop_lag_monitor.start()
+    job_manager.start()
+    narration_prefetcher.start()
+    yield
+    await narration_prefetcher.stop()
+    await job_manager.stop()
+    await loop_lag_monitor.stop()
+
+
+app = FastAPI(title="Travel AI Multi-Agent Planner", lifespan=lifespan)
 
 app.include_router(planner_router)
+app.include_router(admin_router)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -15,7 +68,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id", "X-Profile-Id"],
 )
+app.add_middleware(TokenUsageMiddleware)
+# Added before tracing so profiles run inside the request's trace.
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TracingMiddleware)
 
 cache_root = Path(__file__).resolve().parent / "cache"
 cache_root.mkdir(parents=True, exist_ok=True)
@@ -24,3 +82,26 @@ app.mount("/cache", StaticFiles(directory=str(cache_root)), name="cache")
 @app.get("/")
 def root():
     return {"status": "Travel AI backend running"}
+
+
+# The handlers below read state the event loop mutates (registry dicts,
+# sample deques, the breaker's call window), so they run on the loop rather
+# than in the threadpool, where iterating it could race with an update.
+@app.get("/diagnostics/event-loop")
+async def event_loop_diagnostics():
+    return loop_lag_monitor.snapshot()
+
+
+@app.get("/diagnostics/llm-breaker")
+async def llm_breaker_diagnostics():
+    return llm_breaker.snapshot()
+
+
+@app.get("/diagnostics/narration-prefetch")
+async def narration_prefetch_diagnostics():
+    return narration_prefetcher.snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
 class TravelRequest(BaseModel):
@@ -10,6 +10,10 @@ class TravelRequest(BaseModel):
     interests: List[str]
 
 
+class BatchTravelRequest(BaseModel):
+    requests: List[TravelRequest] = Field(min_length=1)
+
+
 class PlannerResponse(BaseModel):
     plan: Dict[str, Any]
     budget_analysis: Dict[str, Any]
@@ -29,6 +33,10 @@ class NarrationOutput(BaseModel):
     text: str
     audio_file: str
     audio_url: str
+    # "pending" until the audio file is written, or "failed".
+    status: str = "ready"
+    # Plays pending audio while it is synthesized (audio=deferred).
+    stream_url: Optional[str] = None
 
 
 class PlaceDetailResponse(BaseModel):
@@ -40,3 +48,8 @@ class PlaceDetailResponse(BaseModel):
     special_cautions: List[str]
     outputs: Dict[str, NarrationOutput]
     cached: bool
+    cache_key: str = ""
+    audio_status: str = "ready"
+    # Set when audio is still being synthesized (audio=deferred).
+    audio_status_url: Optional[str] = None
+    audio_events_url: Optional[str] = None
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from travel_ai.services.profiling import is_admin, list_profiles, profile_path, render_profile
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    # 404 rather than 401/403 so the admin endpoints are not advertised.
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+async def profiles():
+    return {"profiles": await list_profiles()}
+
+
+@router.get("/profiles/{profile_id}")
+async def profile(
+    profile_id: str,
+    format: str = Query("prof", pattern="^(prof|text)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Downloads a saved profile as a pstats file (load it with pstats or
+    snakeviz), or with format=text returns the pstats report.
+    """
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(await render_profile(path, sort, limit))
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
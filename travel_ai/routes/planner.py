@@ -1,30 +1,83 @@
 import asyncio
+import json
 import time
-from fastapi import APIRouter, HTTPException
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, TypeVar
 
-from travel_ai.services.agents import (
-    discovery_agent,
-    cluster_priority_agent,
-    rank_places_for_visit,
-)
-from travel_ai.services.tools import (
-    cluster_places_by_proximity,
-    estimate_transport_costs,
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+
+from travel_ai.services.agents import discovery_agent
+from travel_ai.services.itinerary_pipeline import generate_full_itinerary, iter_full_itinerary_events
+from travel_ai.config import (
+    AUDIO_EVENTS_POLL_INTERVAL,
+    AUDIO_EVENTS_TIMEOUT,
+    AUDIO_STREAM_POLL_INTERVAL,
+    BATCH_MAX_REQUESTS,
+    CLIENT_DISCONNECT_POLL_INTERVAL,
+    ITINERARY_DEADLINE,
 )
-from travel_ai.services.culinary_agent import culinary_agent
-from travel_ai.services.final_route_architect import final_route_architect
-from travel_ai.models.schemas import TravelRequest, PlaceDetailRequest, PlaceDetailResponse
+from travel_ai.models.schemas import BatchTravelRequest, TravelRequest, PlaceDetailRequest, PlaceDetailResponse
 from travel_ai.utils.logger import get_logger
-from travel_ai.services.place_detail_service import get_place_detail_with_tts
+from travel_ai.services.place_detail_service import (
+    PENDING,
+    get_audio_status,
+    get_place_detail_text_first,
+    get_place_detail_with_tts,
+    open_audio_stream,
+)
+from travel_ai.services.job_service import JobQueueFull, job_manager
+from travel_ai.services.batch_service import iter_batch_itinerary_events
+from travel_ai.services.deadline import Deadline
+from travel_ai.services.fallback_itinerary_service import get_fallback_itinerary
+from travel_ai.services.llm_service import CircuitOpenError, llm_breaker
+from travel_ai.services.narration_prefetch import narration_prefetcher
+from travel_ai.services.tracing import current_trace_tree
 from travel_ai.services.itinerary_cache_service import (
+    build_full_itinerary_once,
     get_cached_full_itinerary,
     save_cached_full_itinerary,
+    schedule_revalidation,
 )
 
 router = APIRouter(prefix="/planner", tags=["Planner"])
 logger = get_logger("planner_route")
 
 
+T = TypeVar("T")
+
+# Non-standard status (as used by nginx) for requests the client abandoned.
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+def _request_deadline() -> Optional[Deadline]:
+    return Deadline(ITINERARY_DEADLINE) if ITINERARY_DEADLINE > 0 else None
+
+
+async def _cancel_on_disconnect(http_request: Request, work: Awaitable[T]) -> T:
+    """
+    Awaits work while polling the connection, and cancels it (LLM calls, stage
+    tasks and TTS included) if the client goes away first. Streaming
+    endpoints need no such wrapper: the server cancels their body when the
+    client disconnects.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=CLIENT_DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                logger.info(f"Client disconnected from {http_request.url.path}; cancelling work")
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 # ==========================================================
 # DISCOVERY ONLY
 # ==========================================================
@@ -48,122 +101,327 @@ async def discover_places(request: TravelRequest):
 
 
 @router.post("/place-detail-tts", response_model=PlaceDetailResponse)
-async def place_detail_tts(request: PlaceDetailRequest):
+async def place_detail_tts(
+    request: PlaceDetailRequest,
+    http_request: Request,
+    audio: str = Query("inline", pattern="^(inline|deferred)$"),
+):
+    """
+    Narration, constraints and cautions for a place, with audio. With
+    audio=inline the response waits for both audio files; with
+    audio=deferred it returns as soon as the text is ready, and audio still
+    being synthesized is reported as pending along with URLs to follow it.
+    """
     try:
-        result = await get_place_detail_with_tts(request.dict())
+        with narration_prefetcher.interactive():
+            if audio == "deferred":
+                result = await _cancel_on_disconnect(http_request, get_place_detail_text_first(request.dict()))
+            else:
+                result = await _cancel_on_disconnect(http_request, get_place_detail_with_tts(request.dict()))
+        if result["audio_status"] == PENDING:
+            audio_path = f"{router.prefix}/place-detail-tts/audio/{result['cache_key']}"
+            outputs = {
+                lang: {**output, "stream_url": f"{audio_path}/{lang}/stream"}
+                for lang, output in result["outputs"].items()
+            }
+            result = {
+                **result,
+                "outputs": outputs,
+                "audio_status_url": audio_path,
+                "audio_events_url": f"{audio_path}/events",
+            }
         return result
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/place-detail-tts/audio/{cache_key}")
+async def place_detail_audio_status(cache_key: str):
+    status = await get_audio_status(cache_key)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Place detail not found")
+    return status
+
+
+@router.get("/place-detail-tts/audio/{cache_key}/events")
+async def place_detail_audio_events(
+    cache_key: str,
+    stream_format: str = Query("sse", alias="format", pattern="^(ndjson|sse)$"),
+):
+    """
+    Streams an "audio" event for each language as its file becomes ready or
+    fails, then a "done" event with the overall status. Gives up after
+    AUDIO_EVENTS_TIMEOUT seconds with whatever status the audio has.
+    """
+    status = await get_audio_status(cache_key)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Place detail not found")
+
+    async def body() -> AsyncIterator[str]:
+        current = status
+        reported: Dict[str, str] = {}
+        deadline = time.monotonic() + AUDIO_EVENTS_TIMEOUT
+        while True:
+            for lang, output in current["outputs"].items():
+                if output["status"] != PENDING and reported.get(lang) != output["status"]:
+                    reported[lang] = output["status"]
+                    event = {"event": "audio", "data": {"language": lang, **output}}
+                    yield _encode_stream_event(event, stream_format)
+            if current["audio_status"] != PENDING or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(AUDIO_EVENTS_POLL_INTERVAL)
+            current = await get_audio_status(cache_key) or current
+        done = {"event": "done", "data": {"cache_key": cache_key, "audio_status": current["audio_status"]}}
+        yield _encode_stream_event(done, stream_format)
+
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/place-detail-tts/audio/{cache_key}/{language}/stream")
+async def place_detail_audio_stream(cache_key: str, language: str):
+    """
+    The narration's audio in one language (english or hindi). Audio still
+    being synthesized arrives sentence by sentence, so playback can start
+    once the first sentence is ready.
+    """
+    stream = await open_audio_stream(cache_key, language, AUDIO_EVENTS_TIMEOUT, AUDIO_STREAM_POLL_INTERVAL)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Place detail audio not found")
+    media_type, body = stream
+    return StreamingResponse(body, media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
 # ==========================================================
 # FULL ITINERARY
 # ==========================================================
+async def _fallback_itinerary(request_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prebuilt deterministic itinerary served while the LLM provider's circuit
+    breaker is open.
+    """
+    fallback = await get_fallback_itinerary(request_dict)
+    if fallback is None:
+        raise HTTPException(status_code=503, detail="Itinerary generation is temporarily unavailable")
+    return fallback
+
+
+def _with_timings(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Adds the request's span tree (see services/tracing.py) under
+    metadata.timings.
+    """
+    return {**response, "metadata": {**response.get("metadata", {}), "timings": current_trace_tree()}}
+
+
 @router.post("/full-itinerary")
-async def full_itinerary(request: TravelRequest):
+async def full_itinerary(
+    request: TravelRequest,
+    http_request: Request,
+    debug: Optional[str] = Query(None, pattern="^timings$"),
+):
+    """
+    Plans a full itinerary. Pass debug=timings to get the request's span tree
+    in metadata.timings. The narration for every scheduled place is then
+    prefetched in the background.
+    """
+    with narration_prefetcher.interactive():
+        response = await _full_itinerary_response(request.dict(), http_request)
+    if isinstance(response, dict):
+        narration_prefetcher.enqueue_itinerary(response, request.destination_city)
+    if debug == "timings" and isinstance(response, dict):
+        return _with_timings(response)
+    return response
+
+
+async def _full_itinerary_response(request_dict: Dict[str, Any], http_request: Request) -> Any:
     start_total = time.time()
+    deadline = _request_deadline()
 
     try:
-        request_dict = request.dict()
-
-        cached_response = get_cached_full_itinerary(request_dict)
+        cached_response = await get_cached_full_itinerary(request_dict)
         if cached_response:
-            await asyncio.sleep(20)
             cached_meta = cached_response.get("metadata", {})
+            if cached_meta.get("cache_state") == "stale":
+                # Serve the stale copy now and rebuild it off the request path.
+                if schedule_revalidation(request_dict, lambda: generate_full_itinerary(request_dict)):
+                    cached_meta["cache_state"] = "revalidating"
             cached_meta["cache_hit"] = True
             cached_meta["returned_within_30_seconds"] = True
             cached_meta["total_latency_ms"] = round((time.time() - start_total) * 1000, 2)
             cached_response["metadata"] = cached_meta
             return cached_response
 
-        # 1) Run discovery + culinary intelligence in parallel
-        discovery_task = asyncio.create_task(discovery_agent(request_dict))
-        culinary_task = asyncio.create_task(culinary_agent(request.destination_city, request.interests))
-        discovery_result, culinary_result = await asyncio.gather(
-            discovery_task, culinary_task, return_exceptions=True
+        if llm_breaker.is_open:
+            return await _fallback_itinerary(request_dict)
+
+        return await _cancel_on_disconnect(
+            http_request,
+            build_full_itinerary_once(request_dict, lambda: generate_full_itinerary(request_dict, deadline)),
         )
 
-        if isinstance(discovery_result, Exception):
-            raise discovery_result
-        discovery = discovery_result
-        if isinstance(culinary_result, Exception):
-            logger.warning(f"Culinary task failed: {culinary_result}")
-            culinary_result = {
-                "city": request.destination_city,
-                "breakfast_signatures": [],
-                "lunch_style": [],
-                "snack_signatures": [],
-                "dinner_style": [],
-                "legacy_establishments": [],
-                "heritage_food_clusters": [],
-                "food_outlets": [],
-            }
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except CircuitOpenError:
+        return await _fallback_itinerary(request_dict)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        places = discovery.get("places", [])
-
-        if not places:
-            return {"error": "No places discovered"}
-
-        ranking = rank_places_for_visit(places, request.interests, top_n=4)
-        mandatory_top_places = [p["name"] for p in ranking.get("mandatory_top_places", [])]
-
-        # 2) Cluster
-        clusters = cluster_places_by_proximity(places)
-
-        structured_clusters = []
-        for idx, cluster in enumerate(clusters):
-            structured_clusters.append({
-                "cluster_id": idx,
-                "cluster_size": len(cluster),
-                "places": [
-                    {
-                        "name": p["name"],
-                        "category": p.get("category"),
-                        "effort_type": p.get("effort_type"),
-                    }
-                    for p in cluster
-                ]
-            })
-
-        # 3) Priority assignment
-        priority_plan = await cluster_priority_agent(
-            clusters=structured_clusters,
-            user_interests=request.interests,
-            num_days=request.num_days
-        )
 
-        # 4) Transport estimate
-        transport_est = estimate_transport_costs(
-            home=request.home_city,
-            dest=request.destination_city,
-            num_days=request.num_days
-        )
+# ==========================================================
+# STREAMING FULL ITINERARY
+# ==========================================================
+def _encode_stream_event(event: Dict[str, Any], stream_format: str) -> str:
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+    return json.dumps(event, ensure_ascii=False) + "\n"
 
-        # 5) Final route architect
-        final_result = await final_route_architect(
-            priority_output=priority_plan,
-            discovery_places=places,
-            culinary_intelligence=culinary_result,
-            original_request=request_dict,
-            transport_estimate=transport_est,
-            mandatory_top_places=mandatory_top_places,
-        )
 
-        total_latency = (time.time() - start_total) * 1000
+async def _full_itinerary_events(request_dict: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    start_total = time.time()
+    deadline = _request_deadline()
 
-        response_payload = {
-            "itinerary": final_result.get("itinerary", {}),
-            "metadata": {
-                "total_latency_ms": round(total_latency, 2),
-                "num_places_discovered": len(places),
-                "num_clusters": len(clusters),
-                "mandatory_top_places": mandatory_top_places,
-                "cache_hit": False,
-                "returned_within_30_seconds": total_latency <= 30000,
-            }
-        }
-        save_cached_full_itinerary(request_dict, response_payload)
-        return response_payload
+    cached_response = await get_cached_full_itinerary(request_dict)
+    if cached_response:
+        cached_meta = cached_response.get("metadata", {})
+        if cached_meta.get("cache_state") == "stale":
+            if schedule_revalidation(request_dict, lambda: generate_full_itinerary(request_dict)):
+                cached_meta["cache_state"] = "revalidating"
+        for day in cached_response.get("itinerary", {}).get("days", []):
+            yield {"event": "day", "data": {"day": day}}
+        cached_meta["cache_hit"] = True
+        cached_meta["total_latency_ms"] = round((time.time() - start_total) * 1000, 2)
+        cached_response["metadata"] = cached_meta
+        yield {"event": "final", "data": cached_response}
+        return
 
+    try:
+        if llm_breaker.is_open:
+            raise CircuitOpenError("LLM provider circuit breaker is open")
+        async for event in iter_full_itinerary_events(request_dict, deadline):
+            if event["event"] == "final":
+                await save_cached_full_itinerary(request_dict, event["data"])
+            yield event
+    except CircuitOpenError:
+        fallback = await get_fallback_itinerary(request_dict)
+        if fallback is None:
+            yield {"event": "error", "data": {"error": "Itinerary generation is temporarily unavailable"}}
+            return
+        for day in fallback["itinerary"].get("days", []):
+            yield {"event": "day", "data": {"day": day}}
+        yield {"event": "final", "data": fallback}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        yield {"event": "error", "data": {"error": str(e)}}
+
+
+@router.post("/full-itinerary/stream")
+async def full_itinerary_stream(
+    request: TravelRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+    debug: Optional[str] = Query(None, pattern="^timings$"),
+):
+    """
+    Streams pipeline progress as newline-delimited JSON (default) or
+    server-sent events. The "final" event carries the same payload as
+    /planner/full-itinerary, including metadata.timings with debug=timings.
+    """
+    request_dict = request.dict()
+
+    async def body() -> AsyncIterator[str]:
+        with narration_prefetcher.interactive():
+            async for event in _full_itinerary_events(request_dict):
+                if event["event"] == "final":
+                    narration_prefetcher.enqueue_itinerary(event["data"], request_dict["destination_city"])
+                    if debug == "timings":
+                        event = {**event, "data": _with_timings(event["data"])}
+                yield _encode_stream_event(event, stream_format)
+
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+# ==========================================================
+# BATCH FULL ITINERARY
+# ==========================================================
+@router.post("/full-itinerary/batch")
+async def full_itinerary_batch(
+    batch: BatchTravelRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+):
+    """
+    Plans many itineraries in one call. Requests for the same destination and
+    interests share discovery, culinary intelligence and clustering. Each
+    result streams back as an "item" event carrying the request's index,
+    followed by a "summary" event.
+    """
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {BATCH_MAX_REQUESTS} requests",
+        )
+    requests = [request.dict() for request in batch.requests]
+
+    async def body() -> AsyncIterator[str]:
+        async for event in iter_batch_itinerary_events(requests):
+            yield _encode_stream_event(event, stream_format)
+
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+# ==========================================================
+# ITINERARY JOBS
+# ==========================================================
+@router.post("/jobs", status_code=202)
+async def create_itinerary_job(request: TravelRequest):
+    """
+    Queues an itinerary build and returns its job ID without waiting for it.
+    An identical request that is already queued, running or recently
+    finished returns the existing job.
+    """
+    try:
+        job, deduplicated = await job_manager.submit(request.dict())
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "deduplicated": deduplicated,
+        "status_url": f"{router.prefix}/jobs/{job.id}",
+        "events_url": f"{router.prefix}/jobs/{job.id}/events",
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_itinerary_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def itinerary_job_events(
+    job_id: str,
+    stream_format: str = Query("sse", alias="format", pattern="^(ndjson|sse)$"),
+):
+    """
+    Streams the job's pipeline events (see /full-itinerary/stream) followed
+    by status changes, replaying anything published before the client
+    connected.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def body() -> AsyncIterator[str]:
+        async for event in job.follow():
+            yield _encode_stream_event(event, stream_format)
+
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+
+from travel_ai.services.place_detail_service import collect_audio_garbage, migrate_audio_to_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the content-addressed place-detail audio store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser(
+        "migrate",
+        help="Move per-place audio files into the store, deleting copies of audio it already holds.",
+    )
+    migrate.add_argument("--dry-run", action="store_true", help="Report what would change without changing it.")
+
+    gc = commands.add_parser("gc", help="Delete audio that no place-detail entry refers to.")
+    gc.add_argument(
+        "--min-age",
+        type=float,
+        default=3600,
+        help="Keep unreferenced audio younger than this many seconds; it may belong to an entry being written.",
+    )
+    gc.add_argument("--dry-run", action="store_true", help="List unreferenced audio without deleting it.")
+    args = parser.parse_args()
+
+    asyncio.run(_run(args))
+
+
+async def _run(args: argparse.Namespace) -> None:
+    if args.command == "migrate":
+        stats = await migrate_audio_to_store(dry_run=args.dry_run)
+        action = "Would migrate" if args.dry_run else "Migrated"
+        print(
+            f"{action} {stats['entries']} place-detail entries: {stats['moved']} files moved into the store, "
+            f"{stats['duplicates']} duplicates removed ({stats['bytes_freed'] / 1024:.0f} KB), "
+            f"{stats['missing']} files missing."
+        )
+        return
+
+    garbage = await collect_audio_garbage(args.min_age, dry_run=args.dry_run)
+    action = "Would delete" if args.dry_run else "Deleted"
+    print(f"{action} {len(garbage)} unreferenced audio files.")
+    for path in garbage:
+        print(f"  {path.name}")
+
+
+if __name__ == "__main__":
+    main()
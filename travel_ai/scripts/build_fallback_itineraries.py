@@ -0,0 +1,28 @@
+import argparse
+
+from travel_ai.services.data_loader import CITIES_PATH
+from travel_ai.services.fallback_itinerary_service import FALLBACK_DIR, write_fallback_itinerary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prebuild the deterministic itineraries served while the LLM circuit breaker is open."
+    )
+    parser.add_argument("--cities", nargs="+", help="Only build these cities (default: every city in data/cities).")
+    args = parser.parse_args()
+
+    cities = args.cities or [path.stem for path in sorted(CITIES_PATH.glob("*.json"))]
+    built, skipped = 0, []
+    for city in cities:
+        if write_fallback_itinerary(city) is None:
+            skipped.append(city)
+        else:
+            built += 1
+
+    print(f"Built {built} fallback itineraries in {FALLBACK_DIR}.")
+    if skipped:
+        print(f"Skipped (unknown city or no seed places): {', '.join(skipped)}")
+
+
+if __name__ == "__main__":
+    main()
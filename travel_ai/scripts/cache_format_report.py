@@ -0,0 +1,97 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from travel_ai.services.storage import (
+    LEGACY_ENTRY_SUFFIX,
+    decode_entry,
+    encode_entry,
+    read_entry_sync,
+    write_entry_sync,
+    zstandard,
+)
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+CACHE_ROOT = BASE_PATH / "cache"
+CACHE_DIRS = [
+    CACHE_ROOT / "full_itinerary.output",
+    CACHE_ROOT / "place.detail.output",
+]
+
+
+def _legacy_entries() -> List[Path]:
+    paths = []
+    for directory in CACHE_DIRS:
+        paths.extend(sorted(directory.glob(f"*{LEGACY_ENTRY_SUFFIX}")))
+    stage_root = CACHE_ROOT / "stage.output"
+    if stage_root.exists():
+        paths.extend(sorted(stage_root.glob(f"*/*{LEGACY_ENTRY_SUFFIX}")))
+    return paths
+
+
+def _mean_decode_ms(blob: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode_entry(blob)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def report(repeat: int) -> None:
+    paths = _legacy_entries()
+    if not paths:
+        print("No legacy JSON cache entries found.")
+        return
+
+    codecs = ["none", "gzip"] + (["zstd"] if zstandard is not None else [])
+    totals: Dict[str, Tuple[int, float]] = {"legacy": (0, 0.0), **{c: (0, 0.0) for c in codecs}}
+
+    for path in paths:
+        legacy_blob = path.read_bytes()
+        data = decode_entry(legacy_blob)
+        size, ms = totals["legacy"]
+        totals["legacy"] = (size + len(legacy_blob), ms + _mean_decode_ms(legacy_blob, repeat))
+        for codec in codecs:
+            blob = encode_entry(path.stem, data, codec=codec)
+            size, ms = totals[codec]
+            totals[codec] = (size + len(blob), ms + _mean_decode_ms(blob, repeat))
+
+    legacy_size, legacy_ms = totals["legacy"]
+    print(f"{len(paths)} legacy entries, decode time averaged over {repeat} runs each\n")
+    print(f"{'format':<22}{'bytes':>12}{'size':>9}{'decode ms':>12}{'decode':>9}")
+    for name, (size, ms) in totals.items():
+        label = "legacy indented JSON" if name == "legacy" else f"compact + {name}"
+        print(f"{label:<22}{size:>12,}{size / legacy_size:>9.1%}{ms:>12.3f}{ms / legacy_ms:>9.1%}")
+
+
+def migrate() -> int:
+    migrated = 0
+    for path in _legacy_entries():
+        base = path.with_name(path.stem)
+        data = read_entry_sync(base)
+        if data is None:
+            continue
+        write_entry_sync(base, path.stem, data)
+        migrated += 1
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare legacy JSON cache entries with the compact entry format, and optionally migrate them."
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="Decode repetitions per entry.")
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Rewrite legacy entries in the compact format (they are otherwise rewritten on their next save).",
+    )
+    args = parser.parse_args()
+
+    report(max(args.repeat, 1))
+    if args.migrate:
+        print(f"\nMigrated {migrate()} entries.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeRedis:
+    """
+    In-memory server for the subset of the Redis protocol the cache backend
+    uses (PING, GET, SET with NX/XX/PX/EX, DEL, EXISTS, SCAN, KEYS, FLUSHALL,
+    SELECT, AUTH). Meant for local development and multi-worker testing
+    without a real Redis.
+    """
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def handle(self, args: List[bytes]) -> Any:
+        command = args[0].upper().decode()
+        if command == "PING":
+            return "PONG"
+        if command in ("SELECT", "AUTH"):
+            return "OK"
+        if command == "FLUSHALL":
+            self.data.clear()
+            return "OK"
+        if command == "GET":
+            return self._get(args[1])
+        if command == "SET":
+            key, value = args[1], args[2]
+            options = [a.upper() for a in args[3:]]
+            expires_at = None
+            for name, unit in ((b"PX", 1000), (b"EX", 1)):
+                if name in options:
+                    expires_at = time.monotonic() + int(args[3 + options.index(name) + 1]) / unit
+            exists = self._get(key) is not None
+            if (b"NX" in options and exists) or (b"XX" in options and not exists):
+                return None
+            self.data[key] = (value, expires_at)
+            return "OK"
+        if command == "DEL":
+            removed = 0
+            for key in args[1:]:
+                if self._get(key) is not None:
+                    del self.data[key]
+                    removed += 1
+            return removed
+        if command == "EXISTS":
+            return sum(1 for key in args[1:] if self._get(key) is not None)
+        if command in ("KEYS", "SCAN"):
+            pattern = b"*"
+            if command == "KEYS":
+                pattern = args[1]
+            elif b"MATCH" in [a.upper() for a in args]:
+                pattern = args[[a.upper() for a in args].index(b"MATCH") + 1]
+            keys = [k for k in list(self.data) if self._get(k) is not None and fnmatch.fnmatchcase(k.decode(), pattern.decode())]
+            return keys if command == "KEYS" else [b"0", keys]
+        raise ValueError(f"ERR unknown command '{command}'")
+
+
+def _encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, bytes):
+        return f"${len(value)}\r\n".encode() + value + b"\r\n"
+    if isinstance(value, list):
+        return f"*{len(value)}\r\n".encode() + b"".join(_encode_reply(v) for v in value)
+    raise TypeError(f"Cannot encode {value!r}")
+
+
+async def _read_command(reader: asyncio.StreamReader) -> List[bytes]:
+    header = await reader.readuntil(b"\r\n")
+    if not header.startswith(b"*"):
+        return header.strip().split()
+    args = []
+    for _ in range(int(header[1:-2])):
+        length = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+async def serve(host: str, port: int) -> None:
+    store = FakeRedis()
+
+    async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                args = await _read_command(reader)
+                if not args:
+                    continue
+                try:
+                    reply = _encode_reply(store.handle(args))
+                except ValueError as exc:
+                    reply = f"-{exc}\r\n".encode()
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle_client, host, port)
+    print(f"Fake Redis listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an in-memory Redis-protocol server for local testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+
+from travel_ai.services.cache_versioning import PROMPTS
+from travel_ai.services.itinerary_cache_service import invalidate_cached_itineraries
+from travel_ai.services.place_detail_service import invalidate_cached_place_details
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Invalidate cached itineraries and place details by city, prompt or model. "
+            "All given filters must match."
+        )
+    )
+    parser.add_argument("--city", help="Only entries for this destination city.")
+    parser.add_argument(
+        "--prompt",
+        choices=sorted(PROMPTS),
+        help="Only entries built with an older version of this prompt.",
+    )
+    parser.add_argument("--model", help="Only entries generated with this model.")
+    parser.add_argument(
+        "--outdated",
+        action="store_true",
+        help="Only entries whose dataset, model or prompt versions differ from the current ones.",
+    )
+    parser.add_argument(
+        "--scope",
+        choices=["all", "itinerary", "place-detail"],
+        default="all",
+        help="Which cache to invalidate.",
+    )
+    parser.add_argument(
+        "--hard",
+        action="store_true",
+        help="Delete itineraries instead of marking them stale. Place details are always deleted.",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="List matching entries without changing them.")
+    args = parser.parse_args()
+
+    if not any([args.city, args.prompt, args.model, args.outdated]):
+        parser.error("give at least one of --city, --prompt, --model or --outdated")
+
+    asyncio.run(_invalidate(args))
+
+
+async def _invalidate(args: argparse.Namespace) -> None:
+    filters = {"city": args.city, "prompt": args.prompt, "model": args.model, "outdated": args.outdated}
+    action = "Would invalidate" if args.dry_run else "Invalidated"
+
+    if args.scope in ("all", "itinerary"):
+        keys = await invalidate_cached_itineraries(**filters, hard=args.hard, dry_run=args.dry_run)
+        print(f"{action} {len(keys)} itinerary entries.")
+        for key in keys:
+            print(f"  {key}")
+
+    if args.scope in ("all", "place-detail"):
+        keys = await invalidate_cached_place_details(**filters, dry_run=args.dry_run)
+        print(f"{action} {len(keys)} place-detail entries.")
+        for key in keys:
+            print(f"  {key}")
+
+
+if __name__ == "__main__":
+    main()
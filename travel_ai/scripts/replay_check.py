@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import difflib
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from travel_ai.services.cache_backend import FileCacheBackend, set_cache_backend
+from travel_ai.services.itinerary_cache_service import _cache_key
+from travel_ai.services.itinerary_pipeline import generate_full_itinerary
+from travel_ai.services.llm_cassette import AUTO, REPLAY, cassette_store
+from travel_ai.services.place_detail_service import _canonical_key, _resolve_local_language, generate_place_narration
+from travel_ai.services.storage import read_json_sync, write_json_sync
+
+# Metadata that changes from run to run without the plan changing.
+# Replayed calls spend no tokens, so token_usage differs from the recording run.
+VOLATILE_METADATA = {
+    "total_latency_ms",
+    "returned_within_30_seconds",
+    "cache_hit",
+    "cache_state",
+    "timings",
+    "token_usage",
+}
+
+
+def normalize(output: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = {k: v for k, v in output.get("metadata", {}).items() if k not in VOLATILE_METADATA}
+    return {**output, "metadata": metadata} if "metadata" in output else output
+
+
+async def _run_case(kind: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    if kind == "itinerary":
+        return normalize(await generate_full_itinerary(request))
+    return await generate_place_narration(request, _resolve_local_language(str(request.get("destination_city", ""))))
+
+
+def _cases(manifest: Dict[str, Any]) -> List[Tuple[str, str, Dict[str, Any]]]:
+    cases = []
+    for request in manifest.get("itineraries", []):
+        cases.append(("itinerary", f"itinerary_{_cache_key(request)[:16]}", request))
+    for request in manifest.get("place_details", []):
+        key = _canonical_key(str(request.get("destination_city", "")), str(request.get("place", "")))
+        cases.append(("place_detail", f"place_detail_{key}", request))
+    return cases
+
+
+def _diff(expected: Dict[str, Any], actual: Dict[str, Any], name: str) -> str:
+    before = json.dumps(expected, ensure_ascii=False, indent=2, sort_keys=True).splitlines()
+    after = json.dumps(actual, ensure_ascii=False, indent=2, sort_keys=True).splitlines()
+    return "\n".join(difflib.unified_diff(before, after, f"{name} (golden)", f"{name} (replayed)", lineterm=""))
+
+
+async def run(manifest: Dict[str, Any], golden_dir: Path, update: bool) -> int:
+    failures = 0
+    for kind, name, request in _cases(manifest):
+        golden_path = golden_dir / f"{name}.json"
+        try:
+            output = await _run_case(kind, request)
+        except Exception as exc:
+            failures += 1
+            print(f"FAIL {name}: {exc}")
+            continue
+
+        if update:
+            write_json_sync(golden_path, {"request": request, "output": output})
+            print(f"wrote {golden_path}")
+            continue
+
+        golden = read_json_sync(golden_path)
+        if golden is None:
+            failures += 1
+            print(f"FAIL {name}: no golden output; run with --update first")
+        elif golden["output"] != output:
+            failures += 1
+            print(f"FAIL {name}: output differs\n{_diff(golden['output'], output, name)}")
+        else:
+            print(f"ok   {name}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run itinerary and place-detail pipelines on recorded LLM responses and compare the "
+        "output with golden files."
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        required=True,
+        help='JSON file: {"itineraries": [TravelRequest, ...], "place_details": [PlaceDetailRequest, ...]}.',
+    )
+    parser.add_argument("--cassettes", type=Path, help="Cassette directory (default: LLM_CASSETTE_DIR).")
+    parser.add_argument("--golden", type=Path, help="Golden output directory (default: <cassettes>/golden).")
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Record missing LLM responses from the provider and rewrite the golden outputs.",
+    )
+    args = parser.parse_args()
+
+    if args.cassettes:
+        cassette_store.directory = args.cassettes
+    cassette_store.mode = AUTO if args.update else REPLAY
+    golden_dir = args.golden or cassette_store.directory / "golden"
+
+    with open(args.manifest, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    # A scratch cache, so every stage runs and nothing is served from or
+    # written to the real cache.
+    with tempfile.TemporaryDirectory(prefix="replay_check_") as scratch:
+        set_cache_backend(FileCacheBackend(Path(scratch)))
+        failures = asyncio.run(run(manifest, golden_dir, args.update))
+
+    if failures:
+        print(f"{failures} case(s) failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import os
+import statistics
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+# Only reads the ledger, but importing the services reads the config, which
+# insists on a key.
+os.environ.setdefault("OPENROUTER_API_KEY", "report")
+
+from travel_ai.services.token_accounting import ledger_day, ledger_dir, read_ledger  # noqa: E402
+
+
+def _days(end: str, count: int) -> List[str]:
+    last = date.fromisoformat(end)
+    return [(last - timedelta(days=offset)).isoformat() for offset in reversed(range(count))]
+
+
+def summarize(entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    by_agent: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "cached_prompt_tokens": 0,
+            "completion_tokens": 0,
+            "duration_ms": 0.0,
+            "cost_usd": 0.0,
+            "ttft_ms": {"hit": [], "miss": []},
+        }
+    )
+    for entry in entries:
+        totals = by_agent[entry.get("agent", "unknown")]
+        totals["calls"] += 1
+        totals["prompt_tokens"] += entry.get("prompt_tokens") or 0
+        totals["cached_prompt_tokens"] += entry.get("cached_prompt_tokens") or 0
+        if entry.get("ttft_ms") is not None:
+            totals["ttft_ms"]["hit" if entry.get("cached_prompt_tokens") else "miss"].append(entry["ttft_ms"])
+        totals["completion_tokens"] += entry.get("completion_tokens") or 0
+        totals["duration_ms"] += entry.get("duration_ms") or 0.0
+        totals["cost_usd"] += entry.get("cost_usd") or 0.0
+    return dict(by_agent)
+
+
+def _median(values: List[float]) -> str:
+    return f"{statistics.median(values):.0f}" if values else "-"
+
+
+def _print_table(by_agent: Dict[str, Dict[str, Any]]) -> None:
+    print(
+        f"{'agent':<18}{'calls':>7}{'prompt tok':>12}{'avg prompt':>12}{'cached':>8}{'completion':>12}"
+        f"{'avg ms':>9}{'ttft hit':>10}{'ttft miss':>10}{'cost usd':>11}"
+    )
+    ordered = sorted(by_agent.items(), key=lambda item: item[1]["prompt_tokens"] + item[1]["completion_tokens"])
+    for agent, t in reversed(ordered):
+        calls = max(t["calls"], 1)
+        cached = t["cached_prompt_tokens"] / max(t["prompt_tokens"], 1)
+        print(
+            f"{agent:<18}{t['calls']:>7}{t['prompt_tokens']:>12,}{t['prompt_tokens'] // calls:>12,}{cached:>8.0%}"
+            f"{t['completion_tokens']:>12,}{t['duration_ms'] / calls:>9.0f}"
+            f"{_median(t['ttft_ms']['hit']):>10}{_median(t['ttft_ms']['miss']):>10}{t['cost_usd']:>11.4f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the LLM token ledger per agent and per request.")
+    parser.add_argument("--day", default=ledger_day(), help="Last UTC day to include (YYYY-MM-DD).")
+    parser.add_argument("--days", type=int, default=1, help="Number of days up to --day.")
+    parser.add_argument("--top", type=int, default=5, help="Most expensive requests to list.")
+    args = parser.parse_args()
+
+    entries = [entry for day in _days(args.day, max(args.days, 1)) for entry in read_ledger(day)]
+    if not entries:
+        print(f"No ledger entries in {ledger_dir()} for the {args.days} day(s) up to {args.day}.")
+        return
+
+    estimated = sum(1 for entry in entries if entry.get("estimated"))
+    print(f"{len(entries)} calls, {estimated} with locally estimated token counts\n")
+    _print_table(summarize(entries))
+
+    by_request: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        if entry.get("request_id"):
+            by_request[entry["request_id"]] += (entry.get("prompt_tokens") or 0) + (entry.get("completion_tokens") or 0)
+    if by_request and args.top > 0:
+        print("\nLargest requests by total tokens (trace ID):")
+        for request_id, tokens in sorted(by_request.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"  {request_id}  {tokens:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set
+
+from travel_ai.services.data_loader import CITIES_PATH
+from travel_ai.services.itinerary_cache_service import (
+    _cache_key,
+    build_full_itinerary_once,
+    get_cached_full_itinerary,
+)
+from travel_ai.services.itinerary_pipeline import generate_full_itinerary
+from travel_ai.services.narration_prefetch import itinerary_place_payloads
+from travel_ai.services.place_detail_service import get_place_detail_with_tts
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("warm_cache")
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+DEFAULT_PROGRESS_PATH = BASE_PATH / "cache" / "warm_cache.progress.jsonl"
+
+# Defaults used when deriving a manifest from data/cities. The interests match
+# the planner form's defaults.
+DEFAULT_HOME_CITY = "mumbai"
+DEFAULT_DAYS = [1, 2, 3]
+DEFAULT_INTERESTS = [["history", "architecture"]]
+DEFAULT_BUDGETS = [10000.0, 25000.0]
+
+
+def _as_list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else [value]
+
+
+def expand_manifest(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Expands manifest entries into TravelRequest-shaped dicts. Each entry names a
+    destination_city and may give num_days, budget and interests either as a
+    single value or as a list of alternatives; every combination is produced.
+    Interest alternatives are lists of interests, e.g. [["history"], ["food", "art"]].
+    """
+    requests = []
+    for entry in entries:
+        interests_options = entry.get("interests", DEFAULT_INTERESTS)
+        if interests_options and not isinstance(interests_options[0], list):
+            interests_options = [interests_options]
+        combos = itertools.product(
+            _as_list(entry.get("num_days", DEFAULT_DAYS)),
+            _as_list(entry.get("budget", DEFAULT_BUDGETS)),
+            interests_options,
+        )
+        for num_days, budget, interests in combos:
+            requests.append(
+                {
+                    "home_city": entry.get("home_city", DEFAULT_HOME_CITY),
+                    "destination_city": entry["destination_city"],
+                    "num_days": int(num_days),
+                    "budget": float(budget),
+                    "interests": list(interests),
+                }
+            )
+    return requests
+
+
+def manifest_from_cities(
+    days: List[int], budgets: List[float], interests: List[List[str]], home_city: str
+) -> List[Dict[str, Any]]:
+    return [
+        {
+            "home_city": home_city,
+            "destination_city": path.stem,
+            "num_days": days,
+            "budget": budgets,
+            "interests": interests,
+        }
+        for path in sorted(CITIES_PATH.glob("*.json"))
+    ]
+
+
+def _load_progress(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    done = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                done.add(json.loads(line)["cache_key"])
+    return done
+
+
+def _record_progress(path: Path, key: str, request_dict: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"cache_key": key, "request": request_dict}) + "\n")
+
+
+async def _prefetch_place_details(
+    response: Dict[str, Any], city: str, semaphore: asyncio.Semaphore
+) -> int:
+    async def fetch(payload: Dict[str, Any]) -> bool:
+        async with semaphore:
+            try:
+                await get_place_detail_with_tts(payload)
+                return True
+            except Exception as exc:
+                logger.warning(f"Place detail prefetch failed for {payload['place']}: {exc}")
+                return False
+
+    payloads = itinerary_place_payloads(response, city)
+    results = await asyncio.gather(*(fetch(payload) for payload in payloads))
+    return sum(results)
+
+
+async def warm(
+    requests: List[Dict[str, Any]],
+    concurrency: int,
+    progress_path: Path,
+    prefetch_place_details: bool,
+    place_concurrency: int,
+) -> Dict[str, int]:
+    done = _load_progress(progress_path)
+    semaphore = asyncio.Semaphore(concurrency)
+    place_semaphore = asyncio.Semaphore(place_concurrency)
+    stats = {"generated": 0, "skipped": 0, "failed": 0, "place_details": 0}
+
+    async def warm_one(index: int, request_dict: Dict[str, Any]) -> None:
+        key = _cache_key(request_dict)
+        label = f"[{index + 1}/{len(requests)}] {request_dict['destination_city']} " \
+                f"{request_dict['num_days']}d {request_dict['interests']} {request_dict['budget']:.0f}"
+
+        cached = await get_cached_full_itinerary(request_dict)
+        if key in done or (cached and cached["metadata"].get("cache_state") == "fresh"):
+            stats["skipped"] += 1
+            logger.info(f"{label}: already warm")
+            if cached and prefetch_place_details:
+                stats["place_details"] += await _prefetch_place_details(
+                    cached, request_dict["destination_city"], place_semaphore
+                )
+            return
+
+        async with semaphore:
+            try:
+                response = await build_full_itinerary_once(
+                    request_dict, lambda: generate_full_itinerary(request_dict)
+                )
+            except Exception as exc:
+                stats["failed"] += 1
+                logger.warning(f"{label}: failed: {exc}")
+                return
+
+        if response.get("error"):
+            stats["failed"] += 1
+            logger.warning(f"{label}: {response['error']}")
+            return
+
+        _record_progress(progress_path, key, request_dict)
+        stats["generated"] += 1
+        logger.info(f"{label}: generated in {response['metadata']['total_latency_ms']:.0f}ms")
+
+        if prefetch_place_details:
+            stats["place_details"] += await _prefetch_place_details(
+                response, request_dict["destination_city"], place_semaphore
+            )
+
+    await asyncio.gather(*(warm_one(idx, req) for idx, req in enumerate(requests)))
+    return stats
+
+
+def _parse_interests(values: List[str]) -> List[List[str]]:
+    return [[i.strip() for i in value.split(",") if i.strip()] for value in values]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-generate full itineraries (and optionally place-detail narration) into the caches."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--manifest",
+        type=Path,
+        help="JSON file with a list of {destination_city, num_days, interests, budget, home_city} entries.",
+    )
+    source.add_argument(
+        "--from-cities",
+        action="store_true",
+        help="Derive the manifest from every city in data/cities.",
+    )
+    parser.add_argument("--days", type=int, nargs="+", default=DEFAULT_DAYS)
+    parser.add_argument("--budgets", type=float, nargs="+", default=DEFAULT_BUDGETS)
+    parser.add_argument(
+        "--interests",
+        action="append",
+        help="Comma-separated interest combination; repeat for several. Used with --from-cities.",
+    )
+    parser.add_argument("--home-city", default=DEFAULT_HOME_CITY)
+    parser.add_argument("--cities", nargs="+", help="Restrict the manifest to these destinations.")
+    parser.add_argument("--concurrency", type=int, default=2, help="Pipelines running at once.")
+    parser.add_argument(
+        "--progress",
+        type=Path,
+        default=DEFAULT_PROGRESS_PATH,
+        help="Progress file; completed requests listed here are skipped on the next run.",
+    )
+    parser.add_argument("--reset-progress", action="store_true", help="Ignore and clear the progress file.")
+    parser.add_argument(
+        "--prefetch-place-details",
+        action="store_true",
+        help="Also generate place-detail narration and audio for every scheduled place.",
+    )
+    parser.add_argument("--place-concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.manifest:
+        with open(args.manifest, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    else:
+        interests = _parse_interests(args.interests) if args.interests else DEFAULT_INTERESTS
+        entries = manifest_from_cities(args.days, args.budgets, interests, args.home_city)
+
+    if args.cities:
+        wanted = {" ".join(c.lower().split()) for c in args.cities}
+        entries = [e for e in entries if " ".join(e["destination_city"].lower().split()) in wanted]
+
+    if args.reset_progress:
+        args.progress.unlink(missing_ok=True)
+
+    requests = expand_manifest(entries)
+    print(f"Warming {len(requests)} itinerary requests with concurrency {args.concurrency}.")
+    stats = asyncio.run(
+        warm(
+            requests,
+            concurrency=max(args.concurrency, 1),
+            progress_path=args.progress,
+            prefetch_place_details=args.prefetch_place_details,
+            place_concurrency=max(args.place_concurrency, 1),
+        )
+    )
+    print(
+        f"Generated {stats['generated']}, skipped {stats['skipped']}, failed {stats['failed']}, "
+        f"place details prefetched {stats['place_details']}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,30 @@ import time
 from typing import Any, Dict, List
 
 from travel_ai.services.data_loader import load_city_dataset
-from travel_ai.services.llm_service import generate_content
+from travel_ai.services.llm_service import generate_content, split_json_prompt
+from travel_ai.services.metrics import JSON_REPAIRS
 from travel_ai.utils.logger import get_logger
 
 logger = get_logger("agents")
 
 
 def _clean_json(raw: str) -> Dict[str, Any]:
-    raw = raw.strip().replace("```json", "").replace("```", "").strip()
+    original = raw.strip()
+    raw = original.replace("```json", "").replace("```", "").strip()
     json_match = re.search(r"\{.*\}", raw, re.DOTALL)
     if not json_match:
+        JSON_REPAIRS.inc(outcome="failed")
         raise ValueError(f"No valid JSON object found in the raw string:\n{raw}")
 
     try:
-        return json.loads(json_match.group(0))
+        parsed = json.loads(json_match.group(0))
     except json.JSONDecodeError as exc:
+        JSON_REPAIRS.inc(outcome="failed")
         logger.error(f"Failed to decode JSON: {json_match.group(0)}")
         raise ValueError(f"Invalid JSON format: {exc}") from exc
+    if json_match.group(0) != original:
+        JSON_REPAIRS.inc(outcome="repaired")
+    return parsed
 
 
 def _canonical_name(name: str) -> str:
@@ -144,35 +151,7 @@ JSON only.
 """
 
 
-async def discovery_agent(request_data: Dict[str, Any]) -> Dict[str, Any]:
-    city = request_data["destination_city"]
-    city_data = load_city_dataset(city)
-    seed_places = city_data.get("places", [])
-    verified_place_names = [p.get("name", "") for p in seed_places if p.get("name")]
-
-    llm_input = {
-        "city": city,
-        "verified_place_names": verified_place_names,
-        "user_interests": request_data.get("interests", []),
-    }
-
-    start = time.time()
-    additional_places: List[Dict[str, Any]] = []
-    try:
-        response = await generate_content(SYSTEM_PROMPT_DISCOVERY, json.dumps(llm_input))
-        additional_places = _clean_json(response).get("additional_places", [])
-    except Exception as exc:
-        logger.warning(f"Discovery augmentation failed for {city}: {exc}")
-
-    merged_places = _normalize_discovered_places(seed_places, additional_places)
-    logger.info(f"Discovery latency: {(time.time() - start) * 1000:.2f}ms")
-    return {"places": merged_places}
-
-
-async def cluster_priority_agent(
-    clusters: List[List[Dict[str, Any]]], user_interests: List[str], num_days: int
-) -> Dict[str, Any]:
-    system_prompt = """
+SYSTEM_PROMPT_CLUSTER_PRIORITY = """
 You are a senior Indian city guide. Organize place clusters into day-level priorities.
 
 Rules:
@@ -200,13 +179,106 @@ Return STRICT JSON:
   ]
 }
 """
+
+
+async def discovery_agent(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    city = request_data["destination_city"]
+    city_data = await load_city_dataset(city)
+    seed_places = city_data.get("places", [])
+    verified_place_names = [p.get("name", "") for p in seed_places if p.get("name")]
+
+    # The city and its verified places are the same for every request, so
+    # they go first as a cacheable prefix.
+    prefix, user_prompt = split_json_prompt(
+        {"city": city, "verified_place_names": verified_place_names},
+        {"user_interests": request_data.get("interests", [])},
+    )
+
+    start = time.time()
+    additional_places: List[Dict[str, Any]] = []
+    augmented = False
+    try:
+        response = await generate_content(SYSTEM_PROMPT_DISCOVERY, user_prompt, agent="discovery", user_prefix=prefix)
+        additional_places = _clean_json(response).get("additional_places", [])
+        augmented = True
+    except Exception as exc:
+        logger.warning(f"Discovery augmentation failed for {city}: {exc}")
+
+    merged_places = _normalize_discovered_places(seed_places, additional_places)
+    logger.info(f"Discovery latency: {(time.time() - start) * 1000:.2f}ms")
+    return {"places": merged_places, "augmented": augmented}
+
+
+async def seed_only_discovery(city: str) -> Dict[str, Any]:
+    """
+    Discovery without LLM augmentation: the verified places from the city
+    dataset only.
+    """
+    city_data = await load_city_dataset(city)
+    return {"places": verified_seed_places(city_data), "augmented": False}
+
+
+def verified_seed_places(city_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    A city dataset's places, validated and deduplicated as discovery does.
+    """
+    return _normalize_discovered_places(city_data.get("places", []), [])
+
+
+async def cluster_priority_agent(
+    clusters: List[List[Dict[str, Any]]], user_interests: List[str], num_days: int
+) -> Dict[str, Any]:
     response = await generate_content(
-        system_prompt,
+        SYSTEM_PROMPT_CLUSTER_PRIORITY,
         json.dumps({"clusters": clusters, "user_interests": user_interests, "num_days": num_days}),
+        agent="cluster_priority",
     )
     return _clean_json(response)
 
 
+def rule_based_priority_plan(
+    clusters: List[Dict[str, Any]], user_interests: List[str], num_days: int, places_per_day: int = 4
+) -> Dict[str, Any]:
+    """
+    Deterministic stand-in for cluster_priority_agent. Clusters with the most
+    places matching the user's interests are scheduled first, one cluster's
+    places per day, spilling over to the next day when a day is full.
+    """
+    interests = [str(i).strip().lower() for i in user_interests if str(i).strip()]
+
+    def interest_hits(cluster: Dict[str, Any]) -> int:
+        return sum(
+            1
+            for p in cluster.get("places", [])
+            if any(i in f"{p.get('name', '')} {p.get('category', '')}".lower() for i in interests)
+        )
+
+    ordered = sorted(clusters, key=lambda c: (interest_hits(c), c.get("cluster_size", 0)), reverse=True)
+    queue = [p for cluster in ordered for p in cluster.get("places", []) if p.get("name")]
+    slots = ["Morning", "Morning", "Afternoon", "Evening"]
+
+    days = []
+    for day in range(1, max(num_days, 1) + 1):
+        chosen, queue = queue[:places_per_day], queue[places_per_day:]
+        days.append(
+            {
+                "day": day,
+                "theme": ", ".join(sorted({str(p.get("category") or "Sightseeing") for p in chosen})) or "Free day",
+                "logic": "Rule-based: nearby places grouped by proximity cluster.",
+                "places": [
+                    {
+                        "name": p["name"],
+                        "suggested_time": slots[min(idx, len(slots) - 1)],
+                        "reason": "Grouped with nearby places from the same cluster.",
+                    }
+                    for idx, p in enumerate(chosen)
+                ],
+                "extra_constraints": [],
+            }
+        )
+    return {"days": days}
+
+
 async def optimization_agent(
     discovery_output: Dict[str, Any], budget_feedback: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -227,5 +299,6 @@ Return STRICT JSON:
     response = await generate_content(
         system_prompt,
         json.dumps({"places": discovery_output.get("places", []), "budget_feedback": budget_feedback}),
+        agent="optimization",
     )
     return _clean_json(response)
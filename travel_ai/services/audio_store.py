@@ -0,0 +1,67 @@
+import hashlib
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Iterable, List, Set
+
+from travel_ai.services.storage import write_bytes
+
+# Under the cache root, so the /cache static mount serves the files.
+AUDIO_DIR = Path(__file__).resolve().parent.parent / "cache" / "audio"
+AUDIO_URL_PREFIX = "/cache/audio"
+
+
+def normalize_text(text: str) -> str:
+    """
+    The text as synthesized: NFC with runs of whitespace collapsed, so
+    narrations that differ only in spacing share their audio.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def audio_blob_id(engine: str, language: str, tld: str, text: str, audio_format: str) -> str:
+    """
+    Name of the blob holding text spoken by engine in language: the SHA-256
+    of everything that changes the audio, plus the format's extension.
+    """
+    source = "\x1f".join((engine, language, tld, normalize_text(text)))
+    return f"{hashlib.sha256(source.encode('utf-8')).hexdigest()}.{audio_format}"
+
+
+def blob_path(blob_id: str) -> Path:
+    # Sharded by the first two hex digits to keep directories small.
+    return AUDIO_DIR / blob_id[:2] / blob_id
+
+
+def blob_url(blob_id: str) -> str:
+    return f"{AUDIO_URL_PREFIX}/{blob_id[:2]}/{blob_id}"
+
+
+def blob_exists(blob_id: str) -> bool:
+    return blob_path(blob_id).exists()
+
+
+def read_blob(blob_id: str) -> bytes:
+    return blob_path(blob_id).read_bytes()
+
+
+async def write_blob(blob_id: str, audio: bytes) -> None:
+    await write_bytes(blob_path(blob_id), audio)
+
+
+def _list_blobs() -> List[Path]:
+    if not AUDIO_DIR.exists():
+        return []
+    return [path for path in AUDIO_DIR.glob("??/*") if path.is_file()]
+
+
+def unreferenced_blobs(referenced: Iterable[str], min_age: float) -> List[Path]:
+    """
+    Blobs not in referenced and older than min_age seconds, including temp
+    files left by interrupted writes. The age guard spares audio written
+    just before the entry pointing to it is saved.
+    """
+    keep: Set[str] = set(referenced)
+    cutoff = time.time() - min_age
+    return [path for path in _list_blobs() if path.name not in keep and path.stat().st_mtime < cutoff]
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from travel_ai.config import BATCH_REQUEST_CONCURRENCY
+from travel_ai.services.itinerary_cache_service import (
+    _cache_key,
+    _normalize_request,
+    build_full_itinerary_once,
+    get_cached_full_itinerary,
+    schedule_revalidation,
+)
+from travel_ai.services.itinerary_pipeline import (
+    build_city_context,
+    generate_full_itinerary,
+    plan_from_city_context,
+)
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("batch_service")
+
+_DONE = object()
+
+
+def group_requests(requests: List[Dict[str, Any]]) -> Dict[Tuple[str, Tuple[str, ...]], Dict[str, List[int]]]:
+    """
+    Groups request indices by (destination, interests), and within a group by
+    cache key so identical requests are planned once.
+    """
+    groups: Dict[Tuple[str, Tuple[str, ...]], Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+    for index, request_dict in enumerate(requests):
+        normalized = _normalize_request(request_dict)
+        group_key = (normalized["destination_city"], tuple(normalized["interests"]))
+        groups[group_key][_cache_key(request_dict)].append(index)
+    return groups
+
+
+async def iter_batch_itinerary_events(
+    requests: List[Dict[str, Any]],
+    concurrency: int = BATCH_REQUEST_CONCURRENCY,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Plans a batch of TravelRequest-shaped dicts, yielding an "item" event
+    ({"index", "result"} or {"index", "error"}) as each request finishes and
+    a closing "summary" event. Discovery, culinary intelligence and
+    clustering run once per (destination, interests) group; only priority
+    assignment and final routing run per request, at most `concurrency` at
+    a time. Cached itineraries are returned without planning and new ones
+    are written to the itinerary cache.
+    """
+    start_total = time.time()
+    groups = group_requests(requests)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+    stats = {"cached": 0, "planned": 0, "failed": 0}
+
+    def emit(indices: List[int], outcome: Dict[str, Any]) -> None:
+        for index in indices:
+            queue.put_nowait({"event": "item", "data": {"index": index, **outcome}})
+
+    async def plan_group(group_key: Tuple[str, Tuple[str, ...]], members: Dict[str, List[int]]) -> None:
+        pending = []
+        for indices in members.values():
+            request_dict = requests[indices[0]]
+            cached = await get_cached_full_itinerary(request_dict)
+            if not cached:
+                pending.append(indices)
+                continue
+            metadata = cached.get("metadata", {})
+            if metadata.get("cache_state") == "stale":
+                if schedule_revalidation(request_dict, lambda r=request_dict: generate_full_itinerary(r)):
+                    metadata["cache_state"] = "revalidating"
+            metadata["cache_hit"] = True
+            stats["cached"] += len(indices)
+            emit(indices, {"result": {**cached, "metadata": metadata}})
+
+        if not pending:
+            return
+
+        city, interests = group_key
+        try:
+            context = await build_city_context(requests[pending[0][0]]["destination_city"], list(interests))
+        except Exception as exc:
+            logger.warning(f"Batch group {city} {list(interests)} failed: {exc}")
+            for indices in pending:
+                stats["failed"] += len(indices)
+                emit(indices, {"error": str(exc)})
+            return
+
+        async def plan_one(indices: List[int]) -> None:
+            request_dict = requests[indices[0]]
+            async with semaphore:
+                try:
+                    result = await build_full_itinerary_once(
+                        request_dict, lambda: plan_from_city_context(request_dict, context)
+                    )
+                except Exception as exc:
+                    result = {"error": str(exc)}
+            if result.get("error"):
+                stats["failed"] += len(indices)
+                emit(indices, {"error": result["error"]})
+            else:
+                stats["planned"] += len(indices)
+                emit(indices, {"result": result})
+
+        await asyncio.gather(*(plan_one(indices) for indices in pending))
+
+    async def run_all() -> None:
+        try:
+            await asyncio.gather(*(plan_group(key, members) for key, members in groups.items()))
+        finally:
+            queue.put_nowait(_DONE)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            event = await queue.get()
+            if event is _DONE:
+                break
+            yield event
+        await runner
+    finally:
+        if not runner.done():
+            runner.cancel()
+
+    yield {
+        "event": "summary",
+        "data": {
+            "requests": len(requests),
+            "groups": len(groups),
+            **stats,
+            "total_latency_ms": round((time.time() - start_total) * 1000, 2),
+        },
+    }
@@ -0,0 +1,388 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import unquote, urlparse
+
+from travel_ai.config import CACHE_BACKEND, CACHE_LEASE_TTL, CACHE_LEASE_WAIT, REDIS_URL
+from travel_ai.services.storage import (
+    decode_entry,
+    delete_entry_sync,
+    encode_entry,
+    entry_bases,
+    read_entry,
+    run_io,
+    write_entry,
+)
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("cache_backend")
+
+T = TypeVar("T")
+
+CACHE_ROOT = Path(__file__).resolve().parent.parent / "cache"
+
+# How often a worker waiting on another worker's lease re-checks the cache.
+_LEASE_POLL_INTERVAL = 0.5
+
+
+class CacheBackend:
+    """
+    Storage for cache entries plus short-lived leases used to make sure only
+    one worker builds a given entry at a time. Namespaces mirror the cache
+    directory names, e.g. "full_itinerary.output".
+    """
+
+    async def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def set(self, namespace: str, key: str, data: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    async def keys(self, namespace: str) -> List[str]:
+        raise NotImplementedError
+
+    async def acquire_lease(self, namespace: str, key: str, ttl: int = CACHE_LEASE_TTL) -> Optional[str]:
+        """
+        Returns a lease token if the lease was free, otherwise None.
+        """
+        raise NotImplementedError
+
+    async def release_lease(self, namespace: str, key: str, token: str) -> None:
+        raise NotImplementedError
+
+    async def lease_held(self, namespace: str, key: str) -> bool:
+        raise NotImplementedError
+
+
+# ==========================================================
+# Local file backend
+# ==========================================================
+
+def _acquire_file_lease(path: Path, token: str, ttl: int) -> bool:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    expires_at = float(json.load(f).get("expires_at", 0))
+            except (OSError, ValueError):
+                # Being written right now by the holder, or already released.
+                return False
+            if expires_at > time.time():
+                return False
+            path.unlink(missing_ok=True)
+            continue
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"token": token, "expires_at": time.time() + ttl}, f)
+        return True
+    return False
+
+
+def _release_file_lease(path: Path, token: str) -> None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            holder = json.load(f).get("token")
+    except (OSError, ValueError):
+        return
+    if holder == token:
+        path.unlink(missing_ok=True)
+
+
+def _file_lease_held(path: Path) -> bool:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return float(json.load(f).get("expires_at", 0)) > time.time()
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        return True
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    Entries under travel_ai/cache/<namespace>/ and leases as exclusive-create
+    lock files, which single-flights workers on one host.
+    """
+
+    def __init__(self, root: Path = CACHE_ROOT):
+        self.root = root
+
+    def _base(self, namespace: str, key: str) -> Path:
+        return self.root / namespace / key
+
+    def _lease_path(self, namespace: str, key: str) -> Path:
+        return self.root / ".leases" / namespace / f"{key}.lease"
+
+    async def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        return await read_entry(self._base(namespace, key))
+
+    async def set(self, namespace: str, key: str, data: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        await write_entry(self._base(namespace, key), key, data)
+
+    async def delete(self, namespace: str, key: str) -> None:
+        await run_io(delete_entry_sync, self._base(namespace, key))
+
+    async def keys(self, namespace: str) -> List[str]:
+        bases = await run_io(entry_bases, self.root / namespace)
+        return [base.name for base in bases]
+
+    async def acquire_lease(self, namespace: str, key: str, ttl: int = CACHE_LEASE_TTL) -> Optional[str]:
+        token = uuid.uuid4().hex
+        acquired = await run_io(_acquire_file_lease, self._lease_path(namespace, key), token, ttl)
+        return token if acquired else None
+
+    async def release_lease(self, namespace: str, key: str, token: str) -> None:
+        await run_io(_release_file_lease, self._lease_path(namespace, key), token)
+
+    async def lease_held(self, namespace: str, key: str) -> bool:
+        return await run_io(_file_lease_held, self._lease_path(namespace, key))
+
+
+# ==========================================================
+# Redis-protocol backend
+# ==========================================================
+
+class RedisError(RuntimeError):
+    pass
+
+
+def _encode_command(args: Tuple[Any, ...]) -> bytes:
+    out = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        out.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+    return b"".join(out)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b"\r\n")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        raise RedisError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unexpected reply from server: {line!r}")
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Speaks the Redis protocol (RESP2) directly over asyncio streams, so any
+    Redis-compatible server works, including scripts/fake_redis_server.py.
+    Values are stored in the compact cache entry format.
+    """
+
+    def __init__(self, url: str = REDIS_URL, pool_size: int = 8, prefix: str = "travel_ai"):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.pool_size = pool_size
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        for command in ([("AUTH", self.password)] if self.password else []) + (
+            [("SELECT", self.db)] if self.db else []
+        ):
+            writer.write(_encode_command(command))
+            await writer.drain()
+            await _read_reply(reader)
+        return reader, writer
+
+    async def execute(self, *args: Any) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            reader, writer = conn
+            try:
+                writer.write(_encode_command(args))
+                await writer.drain()
+                reply = await _read_reply(reader)
+            except RedisError:
+                self._idle.append(conn)
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            self._idle.append(conn)
+            return reply
+
+    def _data_key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def _lease_key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:lease:{namespace}:{key}"
+
+    async def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        blob = await self.execute("GET", self._data_key(namespace, key))
+        return decode_entry(blob) if blob is not None else None
+
+    async def set(self, namespace: str, key: str, data: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        args: List[Any] = ["SET", self._data_key(namespace, key), encode_entry(key, data)]
+        if ttl:
+            args += ["PX", int(ttl * 1000)]
+        await self.execute(*args)
+
+    async def delete(self, namespace: str, key: str) -> None:
+        await self.execute("DEL", self._data_key(namespace, key))
+
+    async def keys(self, namespace: str) -> List[str]:
+        prefix = self._data_key(namespace, "")
+        cursor, found = "0", []
+        while True:
+            cursor, batch = await self.execute("SCAN", cursor, "MATCH", f"{prefix}*", "COUNT", 500)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+            found.extend(item.decode()[len(prefix):] for item in batch)
+            if cursor == "0":
+                return sorted(set(found))
+
+    async def acquire_lease(self, namespace: str, key: str, ttl: int = CACHE_LEASE_TTL) -> Optional[str]:
+        token = uuid.uuid4().hex
+        reply = await self.execute("SET", self._lease_key(namespace, key), token, "NX", "PX", int(ttl * 1000))
+        return token if reply == "OK" else None
+
+    async def release_lease(self, namespace: str, key: str, token: str) -> None:
+        # GET-then-DEL keeps the backend usable on servers without scripting;
+        # the window in which another worker's fresh lease could be deleted is
+        # limited to a lease that expired during our build.
+        lease_key = self._lease_key(namespace, key)
+        holder = await self.execute("GET", lease_key)
+        if holder is not None and holder.decode() == token:
+            await self.execute("DEL", lease_key)
+
+    async def lease_held(self, namespace: str, key: str) -> bool:
+        return bool(await self.execute("EXISTS", self._lease_key(namespace, key)))
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        if CACHE_BACKEND == "redis":
+            _backend = RedisCacheBackend(REDIS_URL)
+        elif CACHE_BACKEND == "file":
+            _backend = FileCacheBackend()
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}; expected 'file' or 'redis'")
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """
+    Replaces the configured backend, e.g. with a FileCacheBackend on a
+    scratch directory for scripts that must not touch the real cache.
+    """
+    global _backend
+    _backend = backend
+
+
+# ==========================================================
+# Single-flight
+# ==========================================================
+
+# Builds in progress in this process, so concurrent requests for the same
+# entry share one build before the cross-worker lease is even consulted.
+_inflight: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+
+
+async def _build_with_lease(
+    namespace: str,
+    key: str,
+    build: Callable[[], Awaitable[T]],
+    lookup: Callable[[], Awaitable[Optional[T]]],
+) -> T:
+    backend = get_cache_backend()
+    deadline = time.monotonic() + CACHE_LEASE_WAIT
+    while True:
+        token = await backend.acquire_lease(namespace, key)
+        if token is not None:
+            try:
+                # Another worker may have finished between our miss and the lease.
+                existing = await lookup()
+                if existing is not None:
+                    return existing
+                return await build()
+            finally:
+                await backend.release_lease(namespace, key, token)
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LEASE_POLL_INTERVAL)
+            existing = await lookup()
+            if existing is not None:
+                return existing
+            if not await backend.lease_held(namespace, key):
+                break  # the holder gave up or crashed; try to take over
+        else:
+            logger.warning(f"Timed out waiting for {namespace}/{key}; building it here")
+            return await build()
+
+
+async def single_flight(
+    namespace: str,
+    key: str,
+    build: Callable[[], Awaitable[T]],
+    lookup: Callable[[], Awaitable[Optional[T]]],
+) -> T:
+    """
+    Runs build() for a cache entry unless another request or worker is
+    already building it, in which case waits and returns lookup()'s result
+    once that build lands. build() is expected to store its result so that
+    lookup() can see it.
+    """
+    flight_key = (namespace, key)
+    while flight_key in _inflight:
+        leader = _inflight[flight_key]
+        try:
+            return await asyncio.shield(leader)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            cancelling = getattr(current, "cancelling", lambda: 0)()
+            if not leader.cancelled() or cancelling:
+                raise
+            # The leading request was cancelled, not this one; build it here.
+
+    future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+    _inflight[flight_key] = future
+    try:
+        result = await _build_with_lease(namespace, key, build, lookup)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        # Mark the exception retrieved when no other request was waiting.
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(flight_key, None)
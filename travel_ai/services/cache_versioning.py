@@ -0,0 +1,128 @@
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from travel_ai.config import MODEL_NAME
+from travel_ai.prompts.system_prompts import (
+    SYSTEM_PROMPT_CULINARY_INTELLIGENCE,
+    SYSTEM_PROMPT_FINAL_ROUTE_ARCHITECT,
+    SYSTEM_PROMPT_PLACE_DETAIL,
+)
+from travel_ai.services.agents import SYSTEM_PROMPT_CLUSTER_PRIORITY, SYSTEM_PROMPT_DISCOVERY
+from travel_ai.services.data_loader import resolve_city_dataset_path
+
+
+# Every prompt whose wording influences a cached artifact, by short name.
+# These names are what the invalidation CLI accepts for --prompt.
+PROMPTS: Dict[str, str] = {
+    "discovery": SYSTEM_PROMPT_DISCOVERY,
+    "cluster_priority": SYSTEM_PROMPT_CLUSTER_PRIORITY,
+    "culinary": SYSTEM_PROMPT_CULINARY_INTELLIGENCE,
+    "final_route": SYSTEM_PROMPT_FINAL_ROUTE_ARCHITECT,
+    "place_detail": SYSTEM_PROMPT_PLACE_DETAIL,
+}
+
+ITINERARY_PROMPTS: Tuple[str, ...] = ("discovery", "cluster_priority", "culinary", "final_route")
+PLACE_DETAIL_PROMPTS: Tuple[str, ...] = ("place_detail",)
+
+# (path, mtime_ns, size) -> digest, so unchanged city files are hashed once.
+_dataset_digests: Dict[Tuple[str, int, int], str] = {}
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def prompt_fingerprint(name: str) -> str:
+    return _digest(PROMPTS[name].encode("utf-8"))
+
+
+def dataset_fingerprint(city: str) -> str:
+    """
+    Content hash of the city dataset file, or "none" for unknown cities.
+    """
+    path = resolve_city_dataset_path(city)
+    if path is None:
+        return "none"
+    stat = path.stat()
+    cache_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if cache_key not in _dataset_digests:
+        _dataset_digests[cache_key] = _digest(path.read_bytes())
+    return _dataset_digests[cache_key]
+
+
+def itinerary_versions(city: str) -> Dict[str, Any]:
+    return {
+        "dataset": dataset_fingerprint(city),
+        "model": MODEL_NAME,
+        "prompts": {name: prompt_fingerprint(name) for name in ITINERARY_PROMPTS},
+    }
+
+
+def place_detail_versions() -> Dict[str, Any]:
+    return {
+        "model": MODEL_NAME,
+        "prompts": {name: prompt_fingerprint(name) for name in PLACE_DETAIL_PROMPTS},
+    }
+
+
+def stage_versions(stage: str, city: str) -> Dict[str, Any]:
+    """
+    Versions a single pipeline stage depends on; only discovery reads the
+    city dataset.
+    """
+    versions: Dict[str, Any] = {"model": MODEL_NAME, "prompts": {stage: prompt_fingerprint(stage)}}
+    if stage == "discovery":
+        versions["dataset"] = dataset_fingerprint(city)
+    return versions
+
+
+def outdated_components(recorded: Optional[Dict[str, Any]], current: Dict[str, Any]) -> List[str]:
+    """
+    Lists the parts of a cache entry's recorded versions that no longer match,
+    e.g. ["dataset", "prompt:final_route"]. Entries written before versions
+    were recorded report every component as outdated.
+    """
+    recorded = recorded or {}
+    outdated = []
+    if "dataset" in current and recorded.get("dataset") != current["dataset"]:
+        outdated.append("dataset")
+    if recorded.get("model") != current["model"]:
+        outdated.append("model")
+    recorded_prompts = recorded.get("prompts", {})
+    for name, fingerprint in current["prompts"].items():
+        if recorded_prompts.get(name) != fingerprint:
+            outdated.append(f"prompt:{name}")
+    return outdated
+
+
+def matches_invalidation(
+    entry_city: str,
+    recorded: Optional[Dict[str, Any]],
+    current: Dict[str, Any],
+    city: Optional[str] = None,
+    prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    outdated: bool = False,
+) -> bool:
+    """
+    Decides whether a cache entry is targeted by an invalidation request.
+    Every filter that is given must match:
+      city     - the entry was built for this city
+      prompt   - the entry's recorded hash of this prompt differs from the current one
+      model    - the entry was generated with this model
+      outdated - any recorded version differs from the current one
+    """
+    if city is not None and " ".join(entry_city.strip().lower().split()) != " ".join(city.strip().lower().split()):
+        return False
+    if prompt is not None:
+        if prompt not in current["prompts"]:
+            return False
+        if f"prompt:{prompt}" not in outdated_components(recorded, current):
+            return False
+    if model is not None and (recorded or {}).get("model") != model:
+        return False
+    if outdated and not outdated_components(recorded, current):
+        return False
+    return True
@@ -44,21 +44,25 @@ def _sanitize_culinary_payload(payload: Dict[str, Any], city: str) -> Dict[str,
     }
 
 
+def empty_culinary_intelligence(city: str) -> Dict[str, Any]:
+    return {
+        "city": city,
+        "breakfast_signatures": [],
+        "lunch_style": [],
+        "snack_signatures": [],
+        "dinner_style": [],
+        "legacy_establishments": [],
+        "heritage_food_clusters": [],
+        "food_outlets": [],
+    }
+
+
 async def culinary_agent(city: str, user_interests: List[str]) -> Dict[str, Any]:
     user_prompt = json.dumps({"city": city, "user_interests": user_interests})
     try:
-        response = await generate_content(SYSTEM_PROMPT_CULINARY_INTELLIGENCE, user_prompt)
+        response = await generate_content(SYSTEM_PROMPT_CULINARY_INTELLIGENCE, user_prompt, agent="culinary")
         parsed = _clean_json(response)
         return _sanitize_culinary_payload(parsed, city)
     except Exception as exc:
         logger.warning(f"Culinary intelligence generation failed for {city}: {exc}")
-        return {
-            "city": city,
-            "breakfast_signatures": [],
-            "lunch_style": [],
-            "snack_signatures": [],
-            "dinner_style": [],
-            "legacy_establishments": [],
-            "heritage_food_clusters": [],
-            "food_outlets": [],
-        }
+        return empty_culinary_intelligence(city)
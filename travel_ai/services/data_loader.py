@@ -1,6 +1,7 @@
-import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from travel_ai.services.storage import read_json_sync, run_io
 
 
 BASE_PATH = Path(__file__).resolve().parent.parent
@@ -11,24 +12,40 @@ def _normalize_city_name(city_name: str) -> str:
     return " ".join(city_name.strip().lower().split())
 
 
-def load_city_dataset(city_name: str) -> Dict[str, Any]:
+def resolve_city_dataset_path(city_name: str) -> Optional[Path]:
     """
-    Loads city dataset from travel_ai/data/cities/{city}.json
-    Returns empty structure if file not found.
+    Returns the dataset file for a city, or None if the city is unknown.
     """
     normalized_city = _normalize_city_name(city_name)
     direct_match = CITIES_PATH / f"{normalized_city}.json"
 
     if direct_match.exists():
-        with open(direct_match, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return direct_match
 
     for candidate in CITIES_PATH.glob("*.json"):
         if _normalize_city_name(candidate.stem) == normalized_city:
-            with open(candidate, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return candidate
+
+    return None
+
+
+def read_city_dataset_sync(city_name: str) -> Dict[str, Any]:
+    path = resolve_city_dataset_path(city_name)
+
+    if path is not None:
+        data = read_json_sync(path)
+        if data is not None:
+            return data
 
     return {
         "city": city_name,
         "places": []
     }
+
+
+async def load_city_dataset(city_name: str) -> Dict[str, Any]:
+    """
+    Loads city dataset from travel_ai/data/cities/{city}.json
+    Returns empty structure if file not found.
+    """
+    return await run_io(read_city_dataset_sync, city_name)
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+from travel_ai.config import ITINERARY_STAGE_BUDGETS
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("deadline")
+
+T = TypeVar("T")
+
+# Message of the CancelledError a stage's work sees when its budget runs out,
+# telling it apart from other cancellations (e.g. the client going away).
+BUDGET_EXPIRED = "stage time budget expired"
+
+
+class Deadline:
+    """
+    An end-to-end time budget for one request, split into per-stage budgets.
+    Each stage may use its share of the total, but never past the overall
+    deadline. Stages that time out are recorded in degraded_stages.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.degraded_stages: List[str] = []
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def stage_end(self, stage: str) -> float:
+        """
+        Absolute monotonic time by which a stage starting now must finish.
+        """
+        share = ITINERARY_STAGE_BUDGETS.get(stage, 1.0)
+        return min(time.monotonic() + self.seconds * share, self.expires_at)
+
+
+async def within_budget(
+    deadline: Optional[Deadline],
+    stage: str,
+    awaitable: Awaitable[T],
+    stage_end: Optional[float] = None,
+) -> Optional[T]:
+    """
+    Awaits a stage until its budget runs out. Returns None and marks the stage
+    degraded on timeout, after cancelling the stage. Without a deadline the
+    stage runs to completion.
+    """
+    if deadline is None:
+        return await awaitable
+    end = stage_end if stage_end is not None else deadline.stage_end(stage)
+    task = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=max(end - time.monotonic(), 0.0))
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if not done:
+        task.cancel(BUDGET_EXPIRED)
+        await asyncio.wait({task})
+        if task.cancelled():
+            logger.warning(f"Stage {stage} ran out of its time budget; using deterministic fallback")
+            deadline.degraded_stages.append(stage)
+            return None
+    return task.result()
+
+
+def cancelled_by_budget(exc: asyncio.CancelledError) -> bool:
+    """
+    Whether a cancellation came from within_budget running out of time.
+    """
+    return bool(exc.args) and exc.args[0] == BUDGET_EXPIRED
+
+
+def deadline_metadata(deadline: Optional[Deadline]) -> Dict[str, Any]:
+    if deadline is None:
+        return {"degraded_stages": []}
+    return {"degraded_stages": list(deadline.degraded_stages), "deadline_ms": round(deadline.seconds * 1000)}
@@ -0,0 +1,164 @@
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from travel_ai.config import FALLBACK_ITINERARY_MAX_DAYS
+from travel_ai.services.agents import rule_based_priority_plan, verified_seed_places
+from travel_ai.services.cache_versioning import dataset_fingerprint
+from travel_ai.services.data_loader import read_city_dataset_sync, resolve_city_dataset_path
+from travel_ai.services.final_route_architect import rule_based_route
+from travel_ai.services.itinerary_pipeline import rank_and_cluster
+from travel_ai.services.storage import read_json_sync, run_io, write_json_sync
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("fallback_itinerary")
+
+NAMESPACE = "fallback.itinerary"
+FALLBACK_DIR = Path(__file__).resolve().parent.parent / "cache" / NAMESPACE
+
+# Bump when the fallback builder changes so prebuilt files are rebuilt.
+BUILDER_VERSION = 1
+
+# Generic meal stops used in place of LLM culinary intelligence. They name a
+# kind of eatery rather than a specific outlet, since nothing here is verified.
+MEAL_TEMPLATES: List[Dict[str, Any]] = [
+    {
+        "name": "Local breakfast stall near the first stop",
+        "meal_slots": ["Breakfast"],
+        "signature_dishes": ["Regional breakfast staples"],
+        "cuisine": "Regional",
+        "area_or_neighborhood": "Near the day's first stop",
+    },
+    {
+        "name": "Busy family restaurant near the midday stop",
+        "meal_slots": ["Lunch"],
+        "signature_dishes": ["Regional thali"],
+        "cuisine": "Regional",
+        "area_or_neighborhood": "Near the midday stop",
+    },
+    {
+        "name": "Street-food lane near the afternoon stop",
+        "meal_slots": ["Snacks"],
+        "signature_dishes": ["Local chaat and tea"],
+        "cuisine": "Street food",
+        "area_or_neighborhood": "Near the afternoon stop",
+    },
+    {
+        "name": "Well-reviewed restaurant near the hotel",
+        "meal_slots": ["Dinner"],
+        "signature_dishes": ["Regional dinner specialties"],
+        "cuisine": "Regional",
+        "area_or_neighborhood": "Near the hotel",
+    },
+]
+
+
+def _fallback_path(city: str) -> Optional[Path]:
+    dataset_path = resolve_city_dataset_path(city)
+    if dataset_path is None:
+        return None
+    return FALLBACK_DIR / f"{dataset_path.stem}.json"
+
+
+def build_fallback_document(city: str, max_days: int = FALLBACK_ITINERARY_MAX_DAYS) -> Optional[Dict[str, Any]]:
+    """
+    Builds deterministic itineraries for 1 to max_days days from the city's
+    seed places, proximity clusters and generic meal templates. Returns None
+    for cities without usable seed places.
+    """
+    dataset = read_city_dataset_sync(city)
+    places = verified_seed_places(dataset)
+    if not places:
+        return None
+
+    city_name = str(dataset.get("city") or city).strip()
+    clustered = rank_and_cluster(places, [])
+    culinary = {"city": city_name, "food_outlets": MEAL_TEMPLATES}
+    plans = {}
+    for num_days in range(1, max(max_days, 1) + 1):
+        request = {"destination_city": city_name, "num_days": num_days, "budget": 0.0}
+        priority = rule_based_priority_plan(clustered["structured_clusters"], [], num_days)
+        plans[str(num_days)] = rule_based_route(
+            priority, places, culinary, request, clustered["mandatory_top_places"]
+        )["itinerary"]
+
+    return {
+        "city": city_name,
+        "builder_version": BUILDER_VERSION,
+        "dataset": dataset_fingerprint(city),
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "num_places": len(places),
+        "num_clusters": len(clustered["clusters"]),
+        "mandatory_top_places": clustered["mandatory_top_places"],
+        "plans": plans,
+    }
+
+
+def _load_or_build_sync(city: str) -> Optional[Dict[str, Any]]:
+    path = _fallback_path(city)
+    if path is None:
+        return None
+    document = read_json_sync(path)
+    if (
+        document is not None
+        and document.get("builder_version") == BUILDER_VERSION
+        and document.get("dataset") == dataset_fingerprint(city)
+    ):
+        return document
+
+    document = build_fallback_document(city)
+    if document is not None:
+        write_json_sync(path, document)
+    return document
+
+
+def write_fallback_itinerary(city: str) -> Optional[Path]:
+    """
+    Builds and stores the fallback document for one city. Used by the
+    offline builder script.
+    """
+    path = _fallback_path(city)
+    document = build_fallback_document(city)
+    if path is None or document is None:
+        return None
+    write_json_sync(path, document)
+    return path
+
+
+async def get_fallback_itinerary(request_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Returns a /planner/full-itinerary shaped payload from the prebuilt
+    fallback for the destination, building it on first use. Trips longer
+    than the prebuilt range are built on the spot. Returns None for unknown
+    cities.
+    """
+    start = time.time()
+    city = str(request_dict.get("destination_city", ""))
+    num_days = int(request_dict.get("num_days", 1))
+    budget = float(request_dict.get("budget", 0))
+
+    document = await run_io(_load_or_build_sync, city)
+    if document is None:
+        return None
+    itinerary = document["plans"].get(str(num_days))
+    if itinerary is None:
+        longer = await run_io(build_fallback_document, city, num_days)
+        itinerary = longer["plans"][str(num_days)]
+
+    itinerary = {**itinerary, "within_budget": itinerary.get("total_estimated_cost", 0) <= budget}
+    latency = (time.time() - start) * 1000
+    return {
+        "itinerary": itinerary,
+        "metadata": {
+            "total_latency_ms": round(latency, 2),
+            "num_places_discovered": document["num_places"],
+            "num_clusters": document["num_clusters"],
+            "mandatory_top_places": document["mandatory_top_places"],
+            "cache_hit": False,
+            "cache_state": "fallback",
+            "returned_within_30_seconds": latency <= 30000,
+            "degraded_stages": ["discovery", "culinary", "priority", "final_route"],
+            "fallback": True,
+        },
+    }
@@ -1,11 +1,18 @@
-import json
 import math
 from datetime import datetime
 from typing import Any, Dict, List, Tuple, Optional
 
 from travel_ai.prompts.system_prompts import SYSTEM_PROMPT_FINAL_ROUTE_ARCHITECT
 from travel_ai.services.agents import _clean_json
-from travel_ai.services.llm_service import generate_content
+from travel_ai.services.llm_service import generate_content, split_json_prompt
+
+# Nominal slot for each priority-plan time of day, used by the rule-based
+# route; _apply_visit_durations assigns the final times.
+SUGGESTED_TIME_SLOTS: Dict[str, str] = {
+    "morning": "09:00-10:30",
+    "afternoon": "14:00-15:30",
+    "evening": "17:00-18:30",
+}
 
 MEAL_SLOTS: List[Tuple[str, str]] = [
     ("Breakfast", "08:00-09:00"),
@@ -465,15 +472,10 @@ async def final_route_architect(
     allowed_places = _sorted_allowed_places(place_index)
     allowed_food_outlets = list(food_index.values())
 
-    llm_input = {
-        "request": {
-            "destination_city": original_request.get("destination_city"),
-            "num_days": original_request.get("num_days"),
-            "budget": original_request.get("budget"),
-            "interests": original_request.get("interests", []),
-        },
-        "priority_day_plan": _slim_priority_payload(priority_output),
-        "mandatory_top_places": mandatory_top_places or [],
+    # Everything derived from the city's discovery and culinary results comes
+    # first and is identical across requests for the city, so it is sent as
+    # a cacheable prefix ahead of the per-request fields.
+    city_context = {
         "allowed_places": allowed_places,
         "allowed_food_outlets": allowed_food_outlets,
         "culinary_intelligence": {
@@ -484,13 +486,26 @@ async def final_route_architect(
             "legacy_establishments": culinary_intelligence.get("legacy_establishments", []),
             "heritage_food_clusters": culinary_intelligence.get("heritage_food_clusters", []),
         },
+    }
+    request_input = {
+        "request": {
+            "destination_city": original_request.get("destination_city"),
+            "num_days": original_request.get("num_days"),
+            "budget": original_request.get("budget"),
+            "interests": original_request.get("interests", []),
+        },
+        "priority_day_plan": _slim_priority_payload(priority_output),
+        "mandatory_top_places": mandatory_top_places or [],
         "transport_estimate": {
             "local_daily_avg": transport_estimate.get("local_daily_avg"),
             "notes": transport_estimate.get("notes", ""),
         },
     }
 
-    response = await generate_content(SYSTEM_PROMPT_FINAL_ROUTE_ARCHITECT, json.dumps(llm_input))
+    prefix, user_prompt = split_json_prompt(city_context, request_input)
+    response = await generate_content(
+        SYSTEM_PROMPT_FINAL_ROUTE_ARCHITECT, user_prompt, agent="final_route", user_prefix=prefix
+    )
     parsed = _clean_json(response)
     return _sanitize_itinerary(
         parsed=parsed,
@@ -501,3 +516,44 @@ async def final_route_architect(
         budget=_safe_float(original_request.get("budget"), 0.0),
         mandatory_top_places=mandatory_top_places or [],
     )
+
+
+def rule_based_route(
+    priority_output: Dict[str, Any],
+    discovery_places: List[Dict[str, Any]],
+    culinary_intelligence: Dict[str, Any],
+    original_request: Dict[str, Any],
+    mandatory_top_places: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Deterministic stand-in for final_route_architect: schedules each day's
+    priority-plan places in their suggested time of day and runs them through
+    the same sanitizer as the LLM output.
+    """
+    place_index = _build_place_index(discovery_places)
+    food_index = _build_food_index(culinary_intelligence)
+    days = []
+    for day in priority_output.get("days", []):
+        days.append(
+            {
+                "schedule_blocks": [
+                    {
+                        "time": SUGGESTED_TIME_SLOTS.get(
+                            str(p.get("suggested_time", "")).strip().lower(), "09:00-10:30"
+                        ),
+                        "place": p.get("name", ""),
+                        "reason_for_time_choice": str(p.get("reason", "")).strip(),
+                    }
+                    for p in day.get("places", [])
+                ],
+            }
+        )
+    return _sanitize_itinerary(
+        parsed={"itinerary": {"days": days}},
+        place_index=place_index,
+        food_index=food_index,
+        destination_city=str(original_request.get("destination_city", "City")).strip() or "City",
+        num_days=int(original_request.get("num_days", 1)),
+        budget=_safe_float(original_request.get("budget"), 0.0),
+        mandatory_top_places=mandatory_top_places or [],
+    )
@@ -1,11 +1,33 @@
+import asyncio
 import hashlib
 import json
-from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+from travel_ai.config import (
+    ITINERARY_CACHE_SOFT_TTL,
+    ITINERARY_CACHE_HARD_TTL,
+    ITINERARY_REVALIDATE_CONCURRENCY,
+)
+from travel_ai.services.cache_versioning import (
+    itinerary_versions,
+    matches_invalidation,
+    outdated_components,
+)
+from travel_ai.services.cache_backend import get_cache_backend, single_flight
+from travel_ai.services.metrics import record_cache_lookup
+from travel_ai.services.storage import run_io
+from travel_ai.services.tracing import root_span, span
+from travel_ai.utils.logger import get_logger
 
-CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "full_itinerary.output"
+logger = get_logger("itinerary_cache")
+
+NAMESPACE = "full_itinerary.output"
+
+# Keys currently being regenerated in the background, mapped to their task so
+# the task is not garbage collected while it runs.
+_revalidating: Dict[str, "asyncio.Task[None]"] = {}
+_revalidate_semaphore = asyncio.Semaphore(ITINERARY_REVALIDATE_CONCURRENCY)
 
 
 def _normalize_request(request_dict: Dict[str, Any]) -> Dict[str, Any]:
@@ -26,26 +48,210 @@ def _cache_key(request_dict: Dict[str, Any]) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def get_cached_full_itinerary(request_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+def _utc_timestamp(value: datetime) -> str:
+    return value.isoformat() + "Z"
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(str(value).rstrip("Z"))
+    except ValueError:
+        return None
+
+
+def _cache_state(
+    cached: Dict[str, Any],
+    key: str,
+    now: datetime,
+    current_versions: Dict[str, Any],
+) -> Optional[str]:
+    """
+    Returns "fresh", "stale" or "revalidating" for a cache entry, or None
+    once the entry is past its hard TTL. Entries written before TTLs were
+    recorded fall back to created_at plus the configured defaults.
+    An entry built from a different dataset, model or prompt is stale
+    regardless of its age.
+    """
+    created_at = _parse_timestamp(cached.get("created_at")) or datetime.min
+    soft_expires_at = _parse_timestamp(cached.get("soft_expires_at")) or (
+        created_at + timedelta(seconds=ITINERARY_CACHE_SOFT_TTL)
+    )
+    hard_expires_at = _parse_timestamp(cached.get("hard_expires_at")) or (
+        created_at + timedelta(seconds=ITINERARY_CACHE_HARD_TTL)
+    )
+
+    if now >= hard_expires_at:
+        return None
+    if now < soft_expires_at and not outdated_components(cached.get("versions"), current_versions):
+        return "fresh"
+    return "revalidating" if key in _revalidating else "stale"
+
+
+async def get_cached_full_itinerary(request_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    with span("cache.lookup", cache="itinerary") as lookup_span:
+        cached = await _lookup_full_itinerary(request_dict)
+        lookup_span.set("result", cached["metadata"]["cache_state"] if cached else "miss")
+    record_cache_lookup("itinerary", cached["metadata"]["cache_state"] if cached else None)
+    return cached
+
+
+async def _lookup_full_itinerary(request_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     key = _cache_key(request_dict)
-    path = CACHE_DIR / f"{key}.json"
-    if not path.exists():
+    cached = await get_cache_backend().get(NAMESPACE, key)
+    if cached is None:
+        return None
+
+    current_versions = await run_io(itinerary_versions, str(request_dict.get("destination_city", "")))
+    state = _cache_state(cached, key, datetime.utcnow(), current_versions)
+    response = cached.get("response")
+    if state is None or not response:
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        cached = json.load(f)
-    return cached.get("response")
 
+    metadata = dict(response.get("metadata", {}))
+    metadata["cache_state"] = state
+    return {**response, "metadata": metadata}
 
-def save_cached_full_itinerary(request_dict: Dict[str, Any], response: Dict[str, Any]) -> None:
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+async def save_cached_full_itinerary(
+    request_dict: Dict[str, Any],
+    response: Dict[str, Any],
+    soft_ttl: int = ITINERARY_CACHE_SOFT_TTL,
+    hard_ttl: int = ITINERARY_CACHE_HARD_TTL,
+) -> None:
     key = _cache_key(request_dict)
-    path = CACHE_DIR / f"{key}.json"
+    now = datetime.utcnow()
+    if response.get("metadata", {}).get("degraded_stages"):
+        # Deadline fallbacks are served from cache but count as stale, so the
+        # next hit regenerates the full-quality itinerary in the background.
+        soft_ttl = 0
+    versions = await run_io(itinerary_versions, str(request_dict.get("destination_city", "")))
     payload = {
         "cache_key": key,
-        "created_at": datetime.utcnow().isoformat() + "Z",
+        "created_at": _utc_timestamp(now),
+        "soft_expires_at": _utc_timestamp(now + timedelta(seconds=soft_ttl)),
+        "hard_expires_at": _utc_timestamp(now + timedelta(seconds=max(hard_ttl, soft_ttl))),
+        "versions": versions,
         "request": _normalize_request(request_dict),
         "response": response,
     }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    await get_cache_backend().set(NAMESPACE, key, payload, ttl=max(hard_ttl, soft_ttl))
+
+
+async def build_full_itinerary_once(
+    request_dict: Dict[str, Any],
+    build: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """
+    Builds and caches an itinerary on a cache miss. If another request or
+    worker is already building the same itinerary, waits for that build and
+    returns its cached result instead of starting a second one.
+    """
+    async def build_and_save() -> Dict[str, Any]:
+        response = await build()
+        if response and not response.get("error"):
+            await save_cached_full_itinerary(request_dict, response)
+        return response
+
+    return await single_flight(
+        NAMESPACE,
+        _cache_key(request_dict),
+        build_and_save,
+        lambda: _lookup_full_itinerary(request_dict),
+    )
+
+
+async def _revalidate(
+    key: str,
+    request_dict: Dict[str, Any],
+    regenerate: Callable[[], Awaitable[Dict[str, Any]]],
+) -> None:
+    try:
+        with root_span("itinerary.revalidate", cache_key=key):
+            await _regenerate_entry(key, request_dict, regenerate)
+    finally:
+        _revalidating.pop(key, None)
+
+
+async def _regenerate_entry(
+    key: str,
+    request_dict: Dict[str, Any],
+    regenerate: Callable[[], Awaitable[Dict[str, Any]]],
+) -> None:
+    backend = get_cache_backend()
+    token = None
+    try:
+        # The lease is taken only once a slot is free, so it cannot expire
+        # while the revalidation waits its turn.
+        async with _revalidate_semaphore:
+            # Only one worker across the deployment refreshes a given entry.
+            token = await backend.acquire_lease(NAMESPACE, key)
+            if token is None:
+                return
+            cached = await _lookup_full_itinerary(request_dict)
+            if cached and cached["metadata"]["cache_state"] == "fresh":
+                return  # another worker refreshed it while this one waited
+            response = await regenerate()
+        if response and not response.get("error"):
+            await save_cached_full_itinerary(request_dict, response)
+            logger.info(f"Revalidated cached itinerary {key}")
+    except Exception as exc:
+        logger.warning(f"Background revalidation failed for {key}: {exc}")
+    finally:
+        if token is not None:
+            await backend.release_lease(NAMESPACE, key, token)
+
+
+def schedule_revalidation(
+    request_dict: Dict[str, Any],
+    regenerate: Callable[[], Awaitable[Dict[str, Any]]],
+) -> bool:
+    """
+    Regenerates a stale itinerary in the background and overwrites its cache
+    entry. At most ITINERARY_REVALIDATE_CONCURRENCY regenerations run at once
+    and a key is never regenerated twice concurrently.
+    Returns False if the key is already being revalidated.
+    """
+    key = _cache_key(request_dict)
+    if key in _revalidating:
+        return False
+    _revalidating[key] = asyncio.create_task(_revalidate(key, request_dict, regenerate))
+    return True
+
+
+async def invalidate_cached_itineraries(
+    city: Optional[str] = None,
+    prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    outdated: bool = False,
+    hard: bool = False,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Invalidates the cached itineraries selected by the filters (see
+    cache_versioning.matches_invalidation) and returns their keys.
+    By default entries are only marked stale, so they keep being served while
+    the next request regenerates them; hard=True deletes them outright.
+    """
+    backend = get_cache_backend()
+    now = _utc_timestamp(datetime.utcnow())
+    invalidated = []
+    for key in await backend.keys(NAMESPACE):
+        cached = await backend.get(NAMESPACE, key)
+        if cached is None:
+            continue
+        entry_city = str(cached.get("request", {}).get("destination_city", ""))
+        current = await run_io(itinerary_versions, entry_city)
+        if not matches_invalidation(entry_city, cached.get("versions"), current, city, prompt, model, outdated):
+            continue
+
+        invalidated.append(key)
+        if dry_run:
+            continue
+        if hard:
+            await backend.delete(NAMESPACE, key)
+            continue
+        cached["soft_expires_at"] = now
+        hard_expires_at = _parse_timestamp(cached.get("hard_expires_at"))
+        ttl = int((hard_expires_at - datetime.utcnow()).total_seconds()) if hard_expires_at else None
+        await backend.set(NAMESPACE, key, cached, ttl=max(ttl, 1) if ttl is not None else None)
+    return invalidated
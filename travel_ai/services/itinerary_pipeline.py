@@ -0,0 +1,327 @@
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, TypeVar
+
+from travel_ai.services.agents import (
+    discovery_agent,
+    cluster_priority_agent,
+    rank_places_for_visit,
+    rule_based_priority_plan,
+    seed_only_discovery,
+)
+from travel_ai.services.cache_versioning import stage_versions
+from travel_ai.services.culinary_agent import culinary_agent, empty_culinary_intelligence
+from travel_ai.services.deadline import Deadline, deadline_metadata, within_budget
+from travel_ai.services.final_route_architect import final_route_architect, rule_based_route
+from travel_ai.services.metrics import STAGE_DURATION
+from travel_ai.services.stage_cache_service import get_or_build_stage
+from travel_ai.services.storage import run_io
+from travel_ai.services.token_accounting import usage_metadata, usage_scope
+from travel_ai.services.tracing import span
+from travel_ai.services.tools import (
+    cluster_places_by_proximity,
+    estimate_transport_costs,
+)
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("itinerary_pipeline")
+
+T = TypeVar("T")
+
+
+async def _timed(stage: str, awaitable: Awaitable[T]) -> T:
+    with span(f"stage.{stage}"), STAGE_DURATION.time(stage=stage):
+        return await awaitable
+
+
+async def run_discovery_stage(city: str, interests: List[str]) -> Dict[str, Any]:
+    versions = await run_io(stage_versions, "discovery", city)
+    return await _timed("discovery", get_or_build_stage(
+        "discovery",
+        city,
+        interests,
+        versions,
+        build=lambda: discovery_agent({"destination_city": city, "interests": interests}),
+        # Seed-only results after a failed augmentation are not worth keeping.
+        cacheable=lambda discovery: bool(discovery.get("augmented") and discovery.get("places")),
+    ))
+
+
+async def run_culinary_stage(city: str, interests: List[str]) -> Dict[str, Any]:
+    versions = await run_io(stage_versions, "culinary", city)
+    return await _timed("culinary", get_or_build_stage(
+        "culinary",
+        city,
+        interests,
+        versions,
+        build=lambda: culinary_agent(city, interests),
+        cacheable=lambda culinary: bool(culinary.get("food_outlets")),
+    ))
+
+
+def structure_clusters(clusters: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    structured_clusters = []
+    for idx, cluster in enumerate(clusters):
+        structured_clusters.append({
+            "cluster_id": idx,
+            "cluster_size": len(cluster),
+            "places": [
+                {
+                    "name": p["name"],
+                    "category": p.get("category"),
+                    "effort_type": p.get("effort_type"),
+                }
+                for p in cluster
+            ]
+        })
+    return structured_clusters
+
+
+def _event(name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"event": name, "data": data}
+
+
+def _culinary_highlights(culinary: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "breakfast_signatures": culinary.get("breakfast_signatures", []),
+        "snack_signatures": culinary.get("snack_signatures", []),
+        "legacy_establishments": culinary.get("legacy_establishments", []),
+        "food_outlets": [outlet.get("name", "") for outlet in culinary.get("food_outlets", [])],
+    }
+
+
+def _priority_day_themes(priority_plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "day": day.get("day"),
+            "theme": day.get("theme", ""),
+            "places": [p.get("name", "") for p in day.get("places", []) if p.get("name")],
+        }
+        for day in priority_plan.get("days", [])
+    ]
+
+
+def rank_and_cluster(places: List[Dict[str, Any]], interests: List[str]) -> Dict[str, Any]:
+    with span("stage.clustering", places=len(places)), STAGE_DURATION.time(stage="clustering"):
+        ranking = rank_places_for_visit(places, interests, top_n=4)
+        clusters = cluster_places_by_proximity(places)
+    return {
+        "mandatory_top_places": [p["name"] for p in ranking.get("mandatory_top_places", [])],
+        "clusters": clusters,
+        "structured_clusters": structure_clusters(clusters),
+    }
+
+
+async def run_final_route_stage(
+    request_dict: Dict[str, Any],
+    priority_plan: Dict[str, Any],
+    places: List[Dict[str, Any]],
+    culinary: Dict[str, Any],
+    mandatory_top_places: List[str],
+) -> Dict[str, Any]:
+    transport_est = estimate_transport_costs(
+        home=request_dict.get("home_city", ""),
+        dest=request_dict["destination_city"],
+        num_days=request_dict["num_days"]
+    )
+    final_result = await _timed("final_route", final_route_architect(
+        priority_output=priority_plan,
+        discovery_places=places,
+        culinary_intelligence=culinary,
+        original_request=request_dict,
+        transport_estimate=transport_est,
+        mandatory_top_places=mandatory_top_places,
+    ))
+    return final_result.get("itinerary", {})
+
+
+def build_itinerary_response(
+    itinerary: Dict[str, Any],
+    places: List[Dict[str, Any]],
+    clustered: Dict[str, Any],
+    start_total: float,
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    total_latency = (time.time() - start_total) * 1000
+    return {
+        "itinerary": itinerary,
+        "metadata": {
+            "total_latency_ms": round(total_latency, 2),
+            "num_places_discovered": len(places),
+            "num_clusters": len(clustered["clusters"]),
+            "mandatory_top_places": clustered["mandatory_top_places"],
+            "cache_hit": False,
+            "cache_state": "fresh",
+            "returned_within_30_seconds": total_latency <= 30000,
+            **deadline_metadata(deadline),
+            **usage_metadata(),
+        }
+    }
+
+
+async def build_city_context(city: str, interests: List[str]) -> Dict[str, Any]:
+    """
+    Runs the stages that depend only on the destination and interests
+    (discovery, culinary intelligence, ranking and clustering) so several
+    requests for the same city can share them. "places" is empty when
+    nothing was discovered.
+    """
+    discovery, culinary = await asyncio.gather(
+        run_discovery_stage(city, interests),
+        run_culinary_stage(city, interests),
+        return_exceptions=True,
+    )
+    if isinstance(discovery, BaseException):
+        raise discovery
+    if isinstance(culinary, BaseException):
+        logger.warning(f"Culinary task failed: {culinary}")
+        culinary = empty_culinary_intelligence(city)
+
+    places = discovery.get("places", [])
+    context: Dict[str, Any] = {"places": places, "culinary": culinary}
+    if places:
+        context.update(rank_and_cluster(places, interests))
+    return context
+
+
+async def plan_from_city_context(
+    request_dict: Dict[str, Any],
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Runs the per-request stages (priority assignment and final route) on a
+    context from build_city_context and returns the
+    /planner/full-itinerary response payload.
+    """
+    start_total = time.time()
+    if not context["places"]:
+        return {"error": "No places discovered"}
+
+    with usage_scope():
+        priority_plan = await _timed("priority", cluster_priority_agent(
+            clusters=context["structured_clusters"],
+            user_interests=request_dict.get("interests", []),
+            num_days=request_dict["num_days"]
+        ))
+        itinerary = await run_final_route_stage(
+            request_dict,
+            priority_plan,
+            context["places"],
+            context["culinary"],
+            context["mandatory_top_places"],
+        )
+        return build_itinerary_response(itinerary, context["places"], context, start_total)
+
+
+async def iter_full_itinerary_events(
+    request_dict: Dict[str, Any],
+    deadline: Optional[Deadline] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Runs the full planning pipeline for a TravelRequest-shaped dict, yielding
+    {"event", "data"} dicts as stages complete:
+      discovered_places, clusters, mandatory_top_places, culinary_highlights,
+      priority_day_themes, one "day" per sanitized day, then "final" with the
+    /planner/full-itinerary response payload (or "error" if nothing was
+    discovered). Discovery and culinary results go through the per-city stage
+    cache. Closing the generator early cancels any stage still running.
+
+    With a deadline, each stage that exceeds its budget is replaced by a
+    deterministic fallback (seed-only discovery, empty culinary intelligence,
+    rule-based priority and routing) and listed in metadata.degraded_stages.
+    """
+    start_total = time.time()
+    destination_city = request_dict["destination_city"]
+    interests = request_dict.get("interests", [])
+    num_days = request_dict["num_days"]
+
+    # 1) Run discovery + culinary intelligence in parallel
+    discovery_task = asyncio.create_task(run_discovery_stage(destination_city, interests))
+    culinary_task = asyncio.create_task(run_culinary_stage(destination_city, interests))
+    priority_task: Optional["asyncio.Task[Dict[str, Any]]"] = None
+    discovery_end = deadline.stage_end("discovery") if deadline else None
+    culinary_end = deadline.stage_end("culinary") if deadline else None
+
+    try:
+        discovery = await within_budget(deadline, "discovery", discovery_task, discovery_end)
+        if discovery is None:
+            discovery = await seed_only_discovery(destination_city)
+        places = discovery.get("places", [])
+        yield _event("discovered_places", {"places": places})
+
+        if not places:
+            yield _event("error", {"error": "No places discovered"})
+            return
+
+        # 2) Rank and cluster
+        clustered = rank_and_cluster(places, interests)
+        yield _event("clusters", {"clusters": clustered["structured_clusters"]})
+        yield _event("mandatory_top_places", {"mandatory_top_places": clustered["mandatory_top_places"]})
+
+        # 3) Priority assignment only needs the clusters, so it overlaps with
+        # culinary intelligence if that is still running.
+        priority_task = asyncio.create_task(
+            _timed("priority", cluster_priority_agent(
+                clusters=clustered["structured_clusters"],
+                user_interests=interests,
+                num_days=num_days
+            ))
+        )
+        priority_end = deadline.stage_end("priority") if deadline else None
+
+        try:
+            culinary_result = await within_budget(deadline, "culinary", culinary_task, culinary_end)
+        except Exception as exc:
+            logger.warning(f"Culinary task failed: {exc}")
+            culinary_result = None
+        if culinary_result is None:
+            culinary_result = empty_culinary_intelligence(destination_city)
+        yield _event("culinary_highlights", _culinary_highlights(culinary_result))
+
+        priority_plan = await within_budget(deadline, "priority", priority_task, priority_end)
+        if priority_plan is None:
+            priority_plan = rule_based_priority_plan(clustered["structured_clusters"], interests, num_days)
+        yield _event("priority_day_themes", {"days": _priority_day_themes(priority_plan)})
+
+        # 4) Transport estimate + final route architect
+        itinerary = await within_budget(
+            deadline,
+            "final_route",
+            run_final_route_stage(
+                request_dict,
+                priority_plan,
+                places,
+                culinary_result,
+                clustered["mandatory_top_places"],
+            ),
+        )
+        if itinerary is None:
+            itinerary = rule_based_route(
+                priority_plan, places, culinary_result, request_dict, clustered["mandatory_top_places"]
+            )["itinerary"]
+        for day in itinerary.get("days", []):
+            yield _event("day", {"day": day})
+
+        STAGE_DURATION.observe(time.time() - start_total, stage="pipeline")
+        yield _event("final", build_itinerary_response(itinerary, places, clustered, start_total, deadline))
+    finally:
+        for task in (discovery_task, culinary_task, priority_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+async def generate_full_itinerary(
+    request_dict: Dict[str, Any],
+    deadline: Optional[Deadline] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the full planning pipeline and returns only the final
+    /planner/full-itinerary response payload.
+    """
+    with usage_scope():
+        async with aclosing(iter_full_itinerary_events(request_dict, deadline)) as events:
+            async for event in events:
+                if event["event"] in ("final", "error"):
+                    return event["data"]
+    raise RuntimeError("Itinerary pipeline finished without a result")
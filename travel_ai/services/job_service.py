@@ -0,0 +1,241 @@
+import asyncio
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from travel_ai.config import (
+    ITINERARY_JOB_QUEUE_SIZE,
+    ITINERARY_JOB_RETENTION,
+    ITINERARY_JOB_WORKERS,
+)
+from travel_ai.services.itinerary_cache_service import (
+    _cache_key,
+    build_full_itinerary_once,
+    get_cached_full_itinerary,
+    schedule_revalidation,
+)
+from travel_ai.services.itinerary_pipeline import generate_full_itinerary, iter_full_itinerary_events
+from travel_ai.services.narration_prefetch import narration_prefetcher
+from travel_ai.services.token_accounting import usage_scope
+from travel_ai.services.tracing import root_span
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("job_service")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class ItineraryJob:
+    """
+    One itinerary generation request. Pipeline events are kept on the job so
+    a subscriber that connects late still receives everything from the start.
+    """
+
+    def __init__(self, request_dict: Dict[str, Any], cache_key: str):
+        self.id = uuid.uuid4().hex
+        self.cache_key = cache_key
+        self.request = request_dict
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    async def publish(self, event: Dict[str, Any]) -> None:
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def set_status(self, status: str) -> None:
+        self.status = status
+        if status == RUNNING:
+            self.started_at = time.time()
+        elif status in (SUCCEEDED, FAILED):
+            self.finished_at = time.time()
+        await self.publish({"event": "status", "data": {"status": status}})
+
+    async def follow(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields every event published so far, then new events as they arrive,
+        until the job finishes.
+        """
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.events) > index or self.done)
+                batch = self.events[index:]
+                finished = self.done
+            index += len(batch)
+            for event in batch:
+                yield event
+            if finished and index == len(self.events):
+                return
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "completed_stages": [e["event"] for e in self.events if e["event"] != "status"],
+        }
+        if self.status == SUCCEEDED:
+            payload["result"] = self.result
+        if self.status == FAILED:
+            payload["error"] = self.error
+        return payload
+
+
+class ItineraryJobManager:
+    """
+    Runs itinerary jobs on a fixed number of worker tasks. Submitting a
+    request that matches a queued, running or recently finished job returns
+    that job instead of creating a new one.
+    """
+
+    def __init__(
+        self,
+        workers: int = ITINERARY_JOB_WORKERS,
+        queue_size: int = ITINERARY_JOB_QUEUE_SIZE,
+        retention: int = ITINERARY_JOB_RETENTION,
+    ):
+        self.workers = max(workers, 1)
+        self.queue_size = queue_size
+        self.retention = retention
+        self._jobs: Dict[str, ItineraryJob] = {}
+        self._by_key: Dict[str, str] = {}
+        self._queue: Optional["asyncio.Queue[ItineraryJob]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def get(self, job_id: str) -> Optional[ItineraryJob]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    async def submit(self, request_dict: Dict[str, Any]) -> Tuple[ItineraryJob, bool]:
+        """
+        Returns the job for request_dict and whether it was deduplicated onto
+        an existing one. Cached itineraries complete the job immediately.
+        Raises JobQueueFull when no more jobs can be queued.
+        """
+        if self._queue is None:
+            raise RuntimeError("Job workers are not running")
+        self._purge_expired()
+
+        key = _cache_key(request_dict)
+        existing = self._jobs.get(self._by_key.get(key, ""))
+        if existing is not None and existing.status != FAILED:
+            return existing, True
+
+        job = ItineraryJob(request_dict, key)
+        # Registered before the first await, so identical requests arriving
+        # meanwhile are deduplicated onto this job.
+        self._jobs[job.id] = job
+        self._by_key[key] = job.id
+        try:
+            cached = await get_cached_full_itinerary(request_dict)
+            if cached:
+                metadata = cached.get("metadata", {})
+                if metadata.get("cache_state") == "stale":
+                    if schedule_revalidation(request_dict, lambda: generate_full_itinerary(request_dict)):
+                        metadata["cache_state"] = "revalidating"
+                metadata["cache_hit"] = True
+                job.result = {**cached, "metadata": metadata}
+                narration_prefetcher.enqueue_itinerary(job.result, request_dict["destination_city"])
+                await job.publish({"event": "final", "data": job.result})
+                await job.set_status(SUCCEEDED)
+            else:
+                self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            job.error = "Job queue is full"
+            await job.set_status(FAILED)
+            raise JobQueueFull(f"{self.queue_size} itinerary jobs are already queued")
+        except BaseException as exc:
+            # Fail the job rather than leave it queued forever for whoever
+            # was deduplicated onto it.
+            job.error = str(exc) or "Job cancelled"
+            await job.set_status(FAILED)
+            raise
+        return job, False
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job.done and job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[job_id]
+                if self._by_key.get(job.cache_key) == job_id:
+                    del self._by_key[job.cache_key]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                with root_span("itinerary.job", job_id=job.id), usage_scope():
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ItineraryJob) -> None:
+        await job.set_status(RUNNING)
+
+        async def build() -> Dict[str, Any]:
+            result: Dict[str, Any] = {"error": "Pipeline finished without a result"}
+            async for event in iter_full_itinerary_events(job.request):
+                await job.publish(event)
+                if event["event"] in ("final", "error"):
+                    result = event["data"]
+            return result
+
+        try:
+            # Shares the build with concurrent requests for the same
+            # itinerary and stores the result in the itinerary cache.
+            result = await build_full_itinerary_once(job.request, build)
+        except asyncio.CancelledError:
+            job.error = "Job cancelled"
+            await job.set_status(FAILED)
+            raise
+        except Exception as exc:
+            logger.warning(f"Itinerary job {job.id} failed: {exc}")
+            job.error = str(exc)
+            await job.set_status(FAILED)
+            return
+
+        if result.get("error"):
+            job.error = result["error"]
+            await job.set_status(FAILED)
+        else:
+            job.result = result
+            narration_prefetcher.enqueue_itinerary(result, job.request["destination_city"])
+            if not any(e["event"] == "final" for e in job.events):
+                # Built by another request or worker; only the result is known.
+                await job.publish({"event": "final", "data": result})
+            await job.set_status(SUCCEEDED)
+
+
+job_manager = ItineraryJobManager()
@@ -0,0 +1,90 @@
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from travel_ai.config import LLM_CASSETTE_DIR, LLM_CASSETTE_MODE
+from travel_ai.services.storage import read_json_sync, run_io, write_json_sync
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("llm_cassette")
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+AUTO = "auto"
+MODES = (OFF, RECORD, REPLAY, AUTO)
+
+DEFAULT_CASSETTE_DIR = Path(__file__).resolve().parent.parent / "cassettes"
+
+
+class CassetteMissError(RuntimeError):
+    pass
+
+
+def cassette_key(model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+    """
+    Identifies a call by everything that is sent to the provider.
+    """
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "system": system_prompt, "user": user_prompt},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CassetteStore:
+    """
+    Prompt/response pairs on disk, one JSON file per call under a directory
+    per agent. mode and directory may be changed at runtime (the replay
+    check script does).
+    """
+
+    def __init__(self, directory: Path, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM_CASSETTE_MODE {mode!r}; expected one of {', '.join(MODES)}")
+        self.directory = directory
+        self.mode = mode
+
+    @property
+    def replays(self) -> bool:
+        return self.mode in (REPLAY, AUTO)
+
+    @property
+    def records(self) -> bool:
+        return self.mode in (RECORD, AUTO)
+
+    def _path(self, agent: str, key: str) -> Path:
+        return self.directory / agent / f"{key}.json"
+
+    async def load(self, agent: str, key: str) -> Optional[Dict[str, Any]]:
+        return await run_io(read_json_sync, self._path(agent, key))
+
+    async def save(
+        self,
+        agent: str,
+        key: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        content: str,
+        usage: Dict[str, Any],
+    ) -> None:
+        cassette = {
+            "key": key,
+            "agent": agent,
+            "model": model,
+            "recorded_at": datetime.utcnow().isoformat() + "Z",
+            "request": {"system_prompt": system_prompt, "user_prompt": user_prompt},
+            "response": {"content": content, "usage": usage},
+        }
+        try:
+            await run_io(write_json_sync, self._path(agent, key), cassette)
+        except OSError as exc:
+            logger.warning(f"Could not record {agent} call {key}: {exc}")
+
+
+cassette_store = CassetteStore(Path(LLM_CASSETTE_DIR) if LLM_CASSETTE_DIR else DEFAULT_CASSETTE_DIR, LLM_CASSETTE_MODE)
@@ -1,20 +1,326 @@
 # travel_ai/services/llm_service.py
 
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
 import httpx
-from typing import Dict, Any
 from travel_ai.config import (
     OPENROUTER_API_KEY,
     OPENROUTER_URL,
     MODEL_NAME,
     TEMPERATURE,
     REQUEST_TIMEOUT,
+    LLM_BREAKER_WINDOW,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_FAILURE_RATE,
+    LLM_BREAKER_SLOW_CALL,
+    LLM_BREAKER_SLOW_CALL_RATE,
+    LLM_BREAKER_COOLDOWN,
+    LLM_PROMPT_CACHE_MARKERS,
+    LLM_STREAM,
 )
+from travel_ai.services.deadline import cancelled_by_budget
+from travel_ai.services.llm_cassette import CassetteMissError, cassette_key, cassette_store
+from travel_ai.services.metrics import LLM_CALLS, LLM_COST, LLM_DURATION, LLM_TOKENS, LLM_TTFT
+from travel_ai.services.token_accounting import call_cost, current_usage, estimate_tokens, record_call
+from travel_ai.services.tracing import current_trace_id, span
 from travel_ai.utils.logger import get_logger
 
 logger = get_logger("llm_service")
 
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Fails LLM calls immediately while the provider is unhealthy. The breaker
+    opens when too many recent calls failed or were slow, stays open for a
+    cooldown, then lets one trial call through: success closes it again,
+    failure reopens it.
+    """
+
+    def __init__(
+        self,
+        window: float = LLM_BREAKER_WINDOW,
+        min_calls: int = LLM_BREAKER_MIN_CALLS,
+        failure_rate: float = LLM_BREAKER_FAILURE_RATE,
+        slow_call: float = LLM_BREAKER_SLOW_CALL,
+        slow_call_rate: float = LLM_BREAKER_SLOW_CALL_RATE,
+        cooldown: float = LLM_BREAKER_COOLDOWN,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.slow_call_rate = slow_call_rate
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+        # (finished_at, succeeded, duration_seconds)
+        self._calls: Deque[Tuple[float, bool, float]] = deque()
+
+    @property
+    def is_open(self) -> bool:
+        """
+        True while calls are being rejected, i.e. open and still cooling down.
+        """
+        return self.state == OPEN and time.monotonic() - self.opened_at < self.cooldown
+
+    def before_call(self) -> None:
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                raise CircuitOpenError("LLM provider circuit breaker is open")
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                raise CircuitOpenError("LLM provider circuit breaker is half-open; trial call in flight")
+            self._trial_in_flight = True
+
+    def record(self, succeeded: bool, duration: float) -> None:
+        now = time.monotonic()
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+            if succeeded and duration < self.slow_call:
+                self.state = CLOSED
+                self._calls.clear()
+                logger.info("LLM circuit breaker closed")
+            else:
+                self._open(now)
+            return
+
+        self._calls.append((now, succeeded, duration))
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+        if self.state == CLOSED and len(self._calls) >= self.min_calls:
+            failures = sum(1 for _, ok, _ in self._calls if not ok)
+            slow = sum(1 for _, _, d in self._calls if d >= self.slow_call)
+            if (
+                failures / len(self._calls) >= self.failure_rate
+                or slow / len(self._calls) >= self.slow_call_rate
+            ):
+                self._open(now)
+
+    def release_trial(self) -> None:
+        """
+        Called when a trial call ends without an outcome (e.g. cancelled).
+        """
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self.times_opened += 1
+        self._calls.clear()
+        logger.warning(f"LLM circuit breaker opened for {self.cooldown:.0f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        calls = list(self._calls)
+        state = self.state
+        if state == OPEN and not self.is_open:
+            state = HALF_OPEN  # the next call is the trial
+        return {
+            "state": state,
+            "recent_calls": len(calls),
+            "recent_failures": sum(1 for _, ok, _ in calls if not ok),
+            "recent_slow_calls": sum(1 for _, _, d in calls if d >= self.slow_call),
+            "times_opened": self.times_opened,
+            "seconds_until_trial": round(max(self.cooldown - (time.monotonic() - self.opened_at), 0.0), 1)
+            if self.state == OPEN
+            else 0.0,
+        }
+
+
+llm_breaker = CircuitBreaker()
+
+
+# Models that only cache prompts at explicit cache_control breakpoints.
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/gemini")
+
+
+def _uses_cache_markers() -> bool:
+    if LLM_PROMPT_CACHE_MARKERS == "auto":
+        return MODEL_NAME.startswith(CACHE_CONTROL_MODEL_PREFIXES)
+    return LLM_PROMPT_CACHE_MARKERS == "on"
 
-async def generate_content(system_prompt: str, user_prompt: str) -> str:
+
+def split_json_prompt(static: Dict[str, Any], dynamic: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    json.dumps({**static, **dynamic}) cut right after the static keys, so the
+    static part can be sent as a cacheable prefix. The two halves
+    concatenate to the full JSON object.
+    """
+    full = json.dumps({**static, **dynamic})
+    if not static or not dynamic:
+        return "", full
+    prefix = json.dumps(static)[:-1] + ", "
+    return prefix, full[len(prefix):]
+
+
+def build_messages(
+    system_prompt: str,
+    user_prompt: str,
+    user_prefix: str = "",
+    cache_markers: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Chat messages with the static text first: the system prompt, then
+    user_prefix (context shared by every request for a city), then the
+    per-request user_prompt. With cache_markers each static part ends in a
+    cache_control breakpoint; without them the text is sent as plain strings,
+    which providers with automatic prefix caching reuse as is.
+    """
+    if not cache_markers:
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prefix + user_prompt},
+        ]
+    breakpoint_ = {"type": "ephemeral"}
+    user_content: Any = user_prompt
+    if user_prefix:
+        user_content = [
+            {"type": "text", "text": user_prefix, "cache_control": breakpoint_},
+            {"type": "text", "text": user_prompt},
+        ]
+    return [
+        {"role": "system", "content": [{"type": "text", "text": system_prompt, "cache_control": breakpoint_}]},
+        {"role": "user", "content": user_content},
+    ]
+
+
+async def _post_streaming(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    start: float,
+) -> Tuple[httpx.Response, Optional[Dict[str, Any]], Optional[float]]:
+    """
+    Streams the completion and reassembles it into the non-streaming
+    response shape. Also returns the seconds from start to the first content
+    token, or None for an error response.
+    """
+    async with client.stream("POST", OPENROUTER_URL, headers=headers, json={**payload, "stream": True}) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return response, None, None
+        parts: List[str] = []
+        usage: Dict[str, Any] = {}
+        first_token: Optional[float] = None
+        async for line in response.aiter_lines():
+            # OpenRouter interleaves ": OPENROUTER PROCESSING" comment lines.
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            if chunk.get("error"):
+                raise RuntimeError(f"OpenRouter stream failed: {chunk['error']}")
+            usage = chunk.get("usage") or usage
+            for choice in chunk.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    if first_token is None:
+                        first_token = time.monotonic() - start
+                    parts.append(delta)
+    return response, {"choices": [{"message": {"content": "".join(parts)}}], "usage": usage}, first_token
+
+
+def _cached_tokens(usage: Dict[str, Any]) -> int:
+    return int((usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0)
+
+
+async def _account_usage(
+    agent: str,
+    system_prompt: str,
+    user_prompt: str,
+    content: str,
+    usage: Dict[str, Any],
+    duration: float,
+    ttft: Optional[float],
+) -> Dict[str, Any]:
+    """
+    Attributes a call's tokens to its agent, the current request and the
+    daily ledger. Counts the provider leaves out are estimated locally.
+    """
+    prompt_tokens = usage.get("prompt_tokens")
+    completion_tokens = usage.get("completion_tokens")
+    estimated = prompt_tokens is None or completion_tokens is None
+    if prompt_tokens is None:
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+    if completion_tokens is None:
+        completion_tokens = estimate_tokens(content)
+    system_prompt_tokens = estimate_tokens(system_prompt)
+    cached_tokens = _cached_tokens(usage)
+    cost = call_cost(prompt_tokens, completion_tokens, usage.get("cost"))
+
+    LLM_TOKENS.inc(prompt_tokens, agent=agent, direction="in")
+    LLM_TOKENS.inc(cached_tokens, agent=agent, direction="cached_in")
+    LLM_TOKENS.inc(completion_tokens, agent=agent, direction="out")
+    if cost is not None:
+        LLM_COST.inc(cost, agent=agent)
+    if ttft is not None:
+        LLM_TTFT.observe(ttft, agent=agent, prompt_cache="hit" if cached_tokens else "miss")
+    request_usage = current_usage()
+    if request_usage is not None:
+        request_usage.add(
+            agent,
+            prompt_tokens,
+            completion_tokens,
+            system_prompt_tokens,
+            int(estimated),
+            cost,
+            cached_prompt_tokens=cached_tokens,
+        )
+    await record_call(
+        {
+            "request_id": current_trace_id(),
+            "agent": agent,
+            "model": MODEL_NAME,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_prompt_tokens": cached_tokens,
+            "system_prompt_tokens": system_prompt_tokens,
+            "prompt_chars": len(system_prompt) + len(user_prompt),
+            "estimated": estimated,
+            "cost_usd": cost,
+            "duration_ms": round(duration * 1000, 1),
+            "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+        }
+    )
+    attributes: Dict[str, Any] = {
+        "tokens_in": prompt_tokens,
+        "tokens_out": completion_tokens,
+        "tokens_cached": cached_tokens,
+        "tokens_estimated": estimated,
+    }
+    if ttft is not None:
+        attributes["ttft_ms"] = round(ttft * 1000, 1)
+    return attributes
+
+
+async def generate_content(
+    system_prompt: str,
+    user_prompt: str,
+    agent: str = "unknown",
+    user_prefix: str = "",
+) -> str:
+    """
+    One chat completion. user_prefix is static context that precedes
+    user_prompt and is the same for many calls (e.g. a city's places), so it
+    is sent where provider prompt caching can reuse it.
+    """
     headers: Dict[str, str] = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
         "Content-Type": "application/json",
@@ -23,22 +329,86 @@ async def generate_content(system_prompt: str, user_prompt: str) -> str:
     payload: Dict[str, Any] = {
         "model": MODEL_NAME,
         "temperature": TEMPERATURE,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
+        "messages": build_messages(system_prompt, user_prompt, user_prefix, _uses_cache_markers()),
+        # Asks OpenRouter to include the call's cost in the usage block.
+        "usage": {"include": True},
     }
+    full_user_prompt = user_prefix + user_prompt
 
-    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-        response = await client.post(
-            OPENROUTER_URL,
-            headers=headers,
-            json=payload,
-        )
+    # There are no retries: each call is a single attempt.
+    with span(
+        "llm.call",
+        agent=agent,
+        model=MODEL_NAME,
+        prompt_chars=len(system_prompt) + len(full_user_prompt),
+        attempts=1,
+    ) as call_span:
+        key = None
+        if cassette_store.mode != "off":
+            key = cassette_key(MODEL_NAME, TEMPERATURE, system_prompt, full_user_prompt)
+        if cassette_store.replays:
+            recorded = await cassette_store.load(agent, key)
+            if recorded is not None:
+                LLM_CALLS.inc(agent=agent, outcome="replayed")
+                call_span.set("cassette", "replayed")
+                return recorded["response"]["content"]
+            if cassette_store.mode == "replay":
+                LLM_CALLS.inc(agent=agent, outcome="error")
+                call_span.set("cassette", "missing")
+                logger.error(f"No recorded {agent} response for prompt {key} in {cassette_store.directory}")
+                raise CassetteMissError(f"No recorded {agent} response for prompt {key}")
+
+        try:
+            llm_breaker.before_call()
+        except CircuitOpenError:
+            LLM_CALLS.inc(agent=agent, outcome="rejected")
+            call_span.set("circuit", "open")
+            raise
+        start = time.monotonic()
+        outcome: Optional[str] = None
+        try:
+            ttft: Optional[float] = None
+            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+                if LLM_STREAM:
+                    response, data, ttft = await _post_streaming(client, headers, payload, start)
+                else:
+                    response = await client.post(OPENROUTER_URL, headers=headers, json=payload)
+            call_span.set("http.status_code", response.status_code)
+
+            if response.status_code != 200:
+                logger.error(f"OpenRouter error: {response.text}")
+                raise RuntimeError(f"OpenRouter API failed: {response.status_code}")
 
-    if response.status_code != 200:
-        logger.error(f"OpenRouter error: {response.text}")
-        raise RuntimeError(f"OpenRouter API failed: {response.status_code}")
+            if not LLM_STREAM:
+                data = response.json()
+            content = data["choices"][0]["message"]["content"]
+            outcome = "success"
+        except asyncio.CancelledError as exc:
+            # Stage budgets are shorter than the slow-call threshold, so a
+            # hanging provider shows up as calls cut off by their budget.
+            # Other cancellations (the client went away) say nothing about it.
+            if cancelled_by_budget(exc):
+                outcome = "timeout"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            duration = time.monotonic() - start
+            if outcome is None:
+                llm_breaker.release_trial()
+            else:
+                llm_breaker.record(outcome == "success", duration)
+                LLM_DURATION.observe(duration, agent=agent)
+                LLM_CALLS.inc(agent=agent, outcome=outcome)
 
-    data = response.json()
-    return data["choices"][0]["message"]["content"]
\ No newline at end of file
+        # Local bookkeeping, after the outcome is recorded: a ledger or
+        # cassette write error is not the provider's fault.
+        usage = data.get("usage") or {}
+        accounted = await _account_usage(agent, system_prompt, full_user_prompt, content, usage, duration, ttft)
+        for attribute, value in accounted.items():
+            call_span.set(attribute, value)
+        if cassette_store.records:
+            await cassette_store.save(agent, key, MODEL_NAME, system_prompt, full_user_prompt, content, usage)
+            call_span.set("cassette", "recorded")
+        return content
@@ -0,0 +1,78 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from travel_ai.config import EVENT_LOOP_LAG_INTERVAL, EVENT_LOOP_LAG_WARN_MS
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("loop_monitor")
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed-interval sleep.
+    Any delay beyond the interval is time the loop spent blocked on
+    something else, e.g. synchronous file I/O in a handler.
+    """
+
+    def __init__(self, interval: float = EVENT_LOOP_LAG_INTERVAL, warn_ms: float = EVENT_LOOP_LAG_WARN_MS):
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self._samples: Deque[float] = deque(maxlen=1200)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+        self.count = 0
+        self.stalls = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def record(self, lag_ms: float) -> None:
+        self._samples.append(lag_ms)
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+        if lag_ms >= self.warn_ms:
+            self.stalls += 1
+            logger.warning(f"Event loop stalled for {lag_ms:.1f}ms")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max((loop.time() - started - self.interval) * 1000, 0.0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = sorted(self._samples)
+
+        def percentile(q: float) -> float:
+            if not recent:
+                return 0.0
+            return round(recent[min(int(q * len(recent)), len(recent) - 1)], 2)
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": self.count,
+            "last_ms": round(self._samples[-1], 2) if self._samples else 0.0,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "stalls_over_warn_threshold": self.stalls,
+            "warn_threshold_ms": self.warn_ms,
+        }
+
+
+loop_lag_monitor = EventLoopLagMonitor()
@@ -0,0 +1,219 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from cache hits (milliseconds) to slow LLM
+# calls (a minute).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """
+    A gauge whose value is read from a callback at scrape time, so nothing
+    is recorded on the request path.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.read = read
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_format_value(self.read())}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket (non-cumulative) counts, +Inf last, then sum.
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+STAGE_DURATION = registry.register(
+    Histogram(
+        "travel_ai_stage_duration_seconds",
+        "Wall time of itinerary pipeline stages, including stage cache lookups.",
+        ["stage"],
+    )
+)
+LLM_DURATION = registry.register(
+    Histogram("travel_ai_llm_call_duration_seconds", "Duration of LLM provider calls per agent.", ["agent"])
+)
+LLM_CALLS = registry.register(
+    Counter(
+        "travel_ai_llm_calls_total",
+        "LLM provider calls per agent by outcome (success, error, timeout cut off by a stage budget, rejected by the circuit breaker, replayed from a cassette).",
+        ["agent", "outcome"],
+    )
+)
+LLM_TOKENS = registry.register(
+    Counter(
+        "travel_ai_llm_tokens_total",
+        "Tokens per agent (in, out, and cached_in for prompt tokens served from the provider's prompt cache), "
+        "as reported by the provider or estimated when it reports none.",
+        ["agent", "direction"],
+    )
+)
+LLM_TTFT = registry.register(
+    Histogram(
+        "travel_ai_llm_time_to_first_token_seconds",
+        "Time to the first streamed token per agent, by whether part of the prompt was a provider cache hit.",
+        ["agent", "prompt_cache"],
+    )
+)
+LLM_COST = registry.register(
+    Counter("travel_ai_llm_cost_usd_total", "Cost of LLM provider calls per agent in USD, when known.", ["agent"])
+)
+JSON_REPAIRS = registry.register(
+    Counter(
+        "travel_ai_llm_json_repairs_total",
+        "LLM outputs that were not plain JSON and needed cleaning (repaired) or could not be parsed (failed).",
+        ["outcome"],
+    )
+)
+CACHE_REQUESTS = registry.register(
+    Counter(
+        "travel_ai_cache_requests_total",
+        "Cache lookups per cache by result (hit, stale, miss).",
+        ["cache", "result"],
+    )
+)
+TTS_DURATION = registry.register(
+    Histogram(
+        "travel_ai_tts_duration_seconds",
+        "Duration of text-to-speech synthesis of one narration sentence, per language and engine.",
+        ["language", "engine"],
+    )
+)
+
+
+def register_gauge(name: str, documentation: str, read: Callable[[], float]) -> None:
+    registry.register(Gauge(name, documentation, read))
+
+
+def record_cache_lookup(cache: str, state: Optional[str]) -> None:
+    """
+    Counts a cache lookup. state is the entry's cache state, or None on a
+    miss; anything other than "fresh" that was still served counts as stale.
+    """
+    if state is None:
+        result = "miss"
+    elif state == "fresh":
+        result = "hit"
+    else:
+        result = "stale"
+    CACHE_REQUESTS.inc(cache=cache, result=result)
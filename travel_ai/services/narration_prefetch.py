@@ -0,0 +1,166 @@
+import asyncio
+import itertools
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from travel_ai.config import PLACE_PREFETCH_MAX_DEFER, PLACE_PREFETCH_QUEUE_SIZE, PLACE_PREFETCH_WORKERS
+from travel_ai.services.llm_service import llm_breaker
+from travel_ai.services.place_detail_service import _canonical_key, get_place_detail_with_tts
+from travel_ai.services.tracing import root_span
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("narration_prefetch")
+
+# (position in its itinerary, arrival order, cache key, place-detail payload)
+PrefetchItem = Tuple[int, int, str, Dict[str, Any]]
+
+
+def itinerary_place_payloads(response: Dict[str, Any], city: str) -> List[Dict[str, Any]]:
+    """
+    /planner/place-detail-tts payloads for every scheduled place, in visiting
+    order.
+    """
+    return [
+        {
+            "place": block["place"],
+            "destination_city": city,
+            "time": block.get("time", ""),
+            "reason_for_time_choice": block.get("reason_for_time_choice", ""),
+            "image_url": block.get("image_url", ""),
+        }
+        for day in response.get("itinerary", {}).get("days", [])
+        for block in day.get("schedule_blocks", [])
+        if block.get("place")
+    ]
+
+
+class NarrationPrefetcher:
+    """
+    Generates place details for the places of served itineraries in the
+    background, so the frontend's taps on them hit the place-detail cache.
+    Work is done by a few worker tasks and yields to interactive requests:
+    a worker waits while any is in flight, for at most max_defer seconds per
+    place. Places that come earlier in an itinerary are prefetched first.
+    """
+
+    def __init__(
+        self,
+        workers: int = PLACE_PREFETCH_WORKERS,
+        queue_size: int = PLACE_PREFETCH_QUEUE_SIZE,
+        max_defer: float = PLACE_PREFETCH_MAX_DEFER,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_defer = max_defer
+        self._queue: Optional["asyncio.PriorityQueue[PrefetchItem]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._pending: Set[str] = set()
+        self._order = itertools.count()
+        self._interactive = 0
+        self._quiet = asyncio.Event()
+        self._quiet.set()
+        self.stats = {"queued": 0, "generated": 0, "cached": 0, "failed": 0, "dropped": 0, "skipped": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def start(self) -> None:
+        if self._tasks or not self.enabled:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+
+    @contextmanager
+    def interactive(self) -> Iterator[None]:
+        """
+        Marks an interactive request as in flight for the duration of the
+        block; prefetching pauses meanwhile.
+        """
+        self._interactive += 1
+        self._quiet.clear()
+        try:
+            yield
+        finally:
+            self._interactive -= 1
+            if self._interactive == 0:
+                self._quiet.set()
+
+    def enqueue_itinerary(self, response: Dict[str, Any], city: str) -> int:
+        """
+        Queues every scheduled place of an itinerary response that is not
+        already queued or being generated, and returns how many were queued.
+        Places that do not fit in the queue are dropped.
+        """
+        if self._queue is None or not isinstance(response, dict) or response.get("error"):
+            return 0
+        queued = 0
+        for position, payload in enumerate(itinerary_place_payloads(response, city)):
+            key = _canonical_key(city, payload["place"])
+            if key in self._pending:
+                continue
+            try:
+                self._queue.put_nowait((position, next(self._order), key, payload))
+            except asyncio.QueueFull:
+                self.stats["dropped"] += 1
+                continue
+            self._pending.add(key)
+            queued += 1
+        self.stats["queued"] += queued
+        return queued
+
+    async def _yield_to_interactive(self) -> None:
+        try:
+            await asyncio.wait_for(self._quiet.wait(), self.max_defer)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            _, _, key, payload = await self._queue.get()
+            try:
+                await self._yield_to_interactive()
+                await self._prefetch(key, payload)
+            finally:
+                self._pending.discard(key)
+                self._queue.task_done()
+
+    async def _prefetch(self, key: str, payload: Dict[str, Any]) -> None:
+        if llm_breaker.is_open:
+            self.stats["skipped"] += 1
+            return
+        start = time.monotonic()
+        try:
+            with root_span("place_detail.prefetch", cache_key=key):
+                result = await get_place_detail_with_tts(payload, prefetch=True)
+        except Exception as exc:
+            self.stats["failed"] += 1
+            logger.warning(f"Place detail prefetch failed for {payload['place']}: {exc}")
+            return
+        if result.get("cached"):
+            self.stats["cached"] += 1
+        else:
+            self.stats["generated"] += 1
+            logger.info(f"Prefetched place detail {key} in {(time.monotonic() - start) * 1000:.0f}ms")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "workers": len(self._tasks),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "interactive_in_flight": self._interactive,
+            **self.stats,
+        }
+
+
+narration_prefetcher = NarrationPrefetcher()
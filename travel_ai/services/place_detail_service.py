@@ -1,18 +1,56 @@
 import asyncio
 import json
 import re
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
-from gtts import gTTS
 from gtts.lang import tts_langs
 
 from travel_ai.prompts.system_prompts import SYSTEM_PROMPT_PLACE_DETAIL
+from travel_ai.services.audio_store import (
+    audio_blob_id,
+    blob_exists,
+    blob_path,
+    blob_url,
+    normalize_text,
+    read_blob,
+    unreferenced_blobs,
+    write_blob,
+)
+from travel_ai.services.cache_versioning import (
+    matches_invalidation,
+    outdated_components,
+    place_detail_versions,
+)
 from travel_ai.services.llm_service import generate_content
+from travel_ai.services.cache_backend import get_cache_backend, single_flight
+from travel_ai.services.metrics import JSON_REPAIRS, TTS_DURATION, record_cache_lookup
+from travel_ai.services.storage import run_io
+from travel_ai.services.tracing import root_span, span
+from travel_ai.services.tts_engines import MEDIA_TYPES, TTSEngine, TTSItem, engine_for, split_sentences
+from travel_ai.utils.logger import get_logger
 
+logger = get_logger("place_detail_service")
 
-CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / "place.detail.output"
+NAMESPACE = "place.detail.output"
+CACHE_DIR = Path(__file__).resolve().parent.parent / "cache" / NAMESPACE
+# Leases only: one worker synthesizes a place's audio at a time.
+AUDIO_NAMESPACE = "place.detail.audio"
+
+# Narration output, language code and gTTS accent of each audio file.
+AUDIO_LANGUAGES = (("english", "en", "com"), ("hindi", "hi", "co.in"))
+# Per-place audio files kept in CACHE_DIR before the audio store.
+LEGACY_AUDIO_SUFFIXES = (".mp3", ".wav")
+
+# Audio status of each narration output.
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+# Audio synthesis running in the background for text-first responses.
+_audio_tasks: Set["asyncio.Task[Any]"] = set()
 
 CITY_LOCAL_LANG = {
     "pune": ("Marathi", "mr"),
@@ -43,23 +81,87 @@ CITY_LOCAL_LANG = {
 }
 
 
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.strip().lower()).strip("_")
+
+
 def _canonical_key(city: str, place: str) -> str:
-    raw = f"{city}_{place}".strip().lower()
-    raw = re.sub(r"[^a-z0-9]+", "_", raw)
-    return raw.strip("_")
+    """
+    city_place, with the city dropped from the start of the place name, so
+    "Pune Tulsi Baug" and "Tulsi Baug" in Pune share an entry.
+    """
+    city_slug, place_slug = _slug(city), _slug(place)
+    if city_slug and place_slug.startswith(f"{city_slug}_"):
+        place_slug = place_slug[len(city_slug) + 1 :]
+    return "_".join(part for part in (city_slug, place_slug) if part)
 
 
 def _clean_json(raw: str) -> Dict[str, Any]:
-    raw = raw.strip().replace("```json", "").replace("```", "").strip()
+    original = raw.strip()
+    raw = original.replace("```json", "").replace("```", "").strip()
     match = re.search(r"\{.*\}", raw, re.DOTALL)
     if not match:
+        JSON_REPAIRS.inc(outcome="failed")
         raise ValueError("No JSON object found in model output")
-    return json.loads(match.group(0))
-
-
-def _generate_tts_file(text: str, file_path: Path, language: str, tld: str = "co.in") -> None:
-    tts = gTTS(text=text, lang=language, tld=tld)
-    tts.save(str(file_path))
+    try:
+        parsed = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        JSON_REPAIRS.inc(outcome="failed")
+        raise
+    if match.group(0) != original:
+        JSON_REPAIRS.inc(outcome="repaired")
+    return parsed
+
+
+async def _synthesize_chunk(engine: TTSEngine, sentence: str, blob_id: str, language: str, tld: str) -> bytes:
+    """
+    One sentence's audio, synthesized unless an earlier narration with the
+    same sentence stored it already.
+    """
+    if await run_io(blob_exists, blob_id):
+        return await run_io(read_blob, blob_id)
+    with span("tts.synthesize", language=language, engine=engine.name, chars=len(sentence)):
+        with TTS_DURATION.time(language=language, engine=engine.name):
+            audio = await engine.synthesize(TTSItem(text=sentence, language=language, tld=tld))
+    await write_blob(blob_id, audio)
+    return audio
+
+
+async def _join_chunks(chunks: List["asyncio.Future[bytes]"], artifact: Dict[str, Any]) -> None:
+    parts = await asyncio.gather(*chunks)
+    if artifact["chunk_blobs"] != [artifact["audio_blob"]]:
+        await write_blob(artifact["audio_blob"], engine_for(artifact["lang_code"]).join_audio(parts))
+
+
+def _synthesize(
+    texts: Dict[str, str], artifacts: Dict[str, Dict[str, Any]]
+) -> Tuple[Dict["asyncio.Future[None]", str], List["asyncio.Future[bytes]"]]:
+    """
+    Starts synthesizing narrations sentence by sentence, all sentences at
+    once, storing each sentence and then each narration's joined audio as
+    blobs. Returns a task per narration and the sentence tasks. Sentences
+    are started in reading order, interleaved across languages, so with a
+    busy TTS pool every narration's first sentences finish first for
+    streaming clients.
+    """
+    plans = {
+        lang: list(zip(split_sentences(normalize_text(text)), artifacts[lang]["chunk_blobs"]))
+        for lang, text in texts.items()
+    }
+    chunks: Dict[str, List["asyncio.Future[bytes]"]] = {lang: [] for lang in plans}
+    for index in range(max((len(plan) for plan in plans.values()), default=0)):
+        for lang, plan in plans.items():
+            if index < len(plan):
+                sentence, blob_id = plan[index]
+                artifact = artifacts[lang]
+                engine = engine_for(artifact["lang_code"])
+                chunks[lang].append(
+                    asyncio.ensure_future(
+                        _synthesize_chunk(engine, sentence, blob_id, artifact["lang_code"], artifact["tld"])
+                    )
+                )
+    joins = {asyncio.ensure_future(_join_chunks(chunks[lang], artifacts[lang])): lang for lang in plans}
+    return joins, [chunk for lang_chunks in chunks.values() for chunk in lang_chunks]
 
 
 def _contains_native_script(text: str, lang_code: str) -> bool:
@@ -92,7 +194,7 @@ async def _regenerate_local_in_native_script(
         "Keep facts unchanged and keep output between 120-190 words. "
         "Return STRICT JSON only: {\"local_text\": \"string\"}"
     )
-    raw = await generate_content(prompt, english_text)
+    raw = await generate_content(prompt, english_text, agent="place_detail_local_script")
     parsed = _clean_json(raw)
     return str(parsed.get("local_text", "")).strip()
 
@@ -106,18 +208,57 @@ def _resolve_local_language(city: str) -> Dict[str, str]:
     return {"name": lang_name, "code": lang_code}
 
 
-def _build_audio_artifacts(cache_key: str) -> Dict[str, Dict[str, str]]:
+def _audio_artifacts(texts: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """
+    The audio blob for each narration text, and one for each of its
+    sentences, as the engine currently configured for its language would
+    speak them. Narrations with the same text share a blob, whichever place
+    they belong to, and an edited narration reuses its unchanged sentences.
+    """
+    artifacts = {}
+    for lang, lang_code, tld in AUDIO_LANGUAGES:
+        if lang not in texts:
+            continue
+        engine = engine_for(lang_code)
+        blob_id = audio_blob_id(engine.name, lang_code, tld, texts[lang], engine.audio_format)
+        artifacts[lang] = {
+            "audio_blob": blob_id,
+            "audio_url": blob_url(blob_id),
+            "chunk_blobs": [
+                audio_blob_id(engine.name, lang_code, tld, sentence, engine.audio_format)
+                for sentence in split_sentences(normalize_text(texts[lang]))
+            ],
+            "lang_code": lang_code,
+            "tld": tld,
+        }
+    return artifacts
+
+
+def _legacy_audio_path(audio_file: str) -> Path:
+    """
+    A per-place audio file from before the audio store. Entries record
+    absolute paths from the host that wrote them, so a path that does not
+    exist here is looked up by name in CACHE_DIR.
+    """
+    path = Path(audio_file)
+    return path if path.exists() else CACHE_DIR / path.name
+
+
+def _audio_path(output: Dict[str, Any]) -> Optional[Path]:
+    if output.get("audio_blob"):
+        return blob_path(output["audio_blob"])
+    if output.get("audio_file"):
+        return _legacy_audio_path(output["audio_file"])
+    return None
+
+
+def _public_output(output: Dict[str, Any], status: str) -> Dict[str, Any]:
+    path = _audio_path(output)
     return {
-        "english": {
-            "audio_file": str(CACHE_DIR / f"{cache_key}_en.mp3"),
-            "audio_url": f"/cache/place.detail.output/{cache_key}_en.mp3",
-            "lang_code": "en",
-        },
-        "hindi": {
-            "audio_file": str(CACHE_DIR / f"{cache_key}_hi.mp3"),
-            "audio_url": f"/cache/place.detail.output/{cache_key}_hi.mp3",
-            "lang_code": "hi",
-        },
+        "text": output.get("text", ""),
+        "audio_file": str(path) if path is not None else "",
+        "audio_url": blob_url(output["audio_blob"]) if output.get("audio_blob") else output.get("audio_url", ""),
+        "status": status,
     }
 
 
@@ -177,38 +318,361 @@ def _apply_royal_honorifics(text: str) -> str:
     return out
 
 
-async def get_place_detail_with_tts(payload: Dict[str, Any]) -> Dict[str, Any]:
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+def _audio_statuses(outputs: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Status of each narration's audio: ready once the file exists, otherwise
+    the recorded status. Entries from before statuses were recorded only
+    have files.
+    """
+    statuses = {}
+    for lang, _, _ in AUDIO_LANGUAGES:
+        output = outputs.get(lang, {})
+        path = _audio_path(output)
+        if path is not None and path.exists():
+            statuses[lang] = READY
+        else:
+            statuses[lang] = output.get("status") if output.get("status") in (PENDING, FAILED) else PENDING
+    return statuses
+
+
+def _overall_audio_status(statuses: Dict[str, str]) -> str:
+    if any(status == PENDING for status in statuses.values()):
+        return PENDING
+    if any(status == FAILED for status in statuses.values()):
+        return FAILED
+    return READY
+
+
+async def _load_cached_place_detail(
+    cache_key: str, place: str, city: str, local_lang: Dict[str, str], require_audio: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    The cached place detail, or None. Entries whose audio is still pending
+    or failed count only when require_audio is False.
+    """
+    cached = await get_cache_backend().get(NAMESPACE, cache_key)
+    if cached is None:
+        return None
+
+    cached_outputs = cached.get("outputs", {})
+    local_cached_text = str(cached.get("local_text", "")).strip()
+    statuses = await run_io(_audio_statuses, cached_outputs)
+    audio_status = _overall_audio_status(statuses)
+    local_script_ok = _contains_native_script(local_cached_text, local_lang["code"])
+    # Entries from before versions were recorded are kept; use the
+    # invalidation CLI to drop them explicitly.
+    versions_ok = "versions" not in cached or not outdated_components(
+        cached["versions"], place_detail_versions()
+    )
+    if not (local_script_ok and versions_ok) or (require_audio and audio_status != READY):
+        return None
+    return {
+        "place": place,
+        "destination_city": city,
+        "local_language": cached.get("local_language", local_lang["name"]),
+        "local_text": local_cached_text,
+        "constraints": _to_str_list(cached.get("constraints")) or _default_constraints(place),
+        "special_cautions": _to_str_list(cached.get("special_cautions")) or _default_special_cautions(place),
+        "outputs": {
+            lang: _public_output(output, statuses.get(lang, PENDING)) for lang, output in cached_outputs.items()
+        },
+        "audio_status": audio_status,
+        "cache_key": cache_key,
+        "cached": True,
+    }
+
+
+async def _lookup_place_detail(
+    cache_key: str,
+    place: str,
+    city: str,
+    local_lang: Dict[str, str],
+    cache_name: str,
+    require_audio: bool,
+) -> Optional[Dict[str, Any]]:
+    with span("cache.lookup", cache=cache_name) as lookup_span:
+        cached = await _load_cached_place_detail(cache_key, place, city, local_lang, require_audio)
+        lookup_span.set("result", "hit" if cached is not None else "miss")
+    record_cache_lookup(cache_name, "fresh" if cached is not None else None)
+    return cached
+
+
+async def get_place_detail_with_tts(payload: Dict[str, Any], prefetch: bool = False) -> Dict[str, Any]:
+    """
+    The cached place detail, or a newly generated one, returned once both
+    audio files are written. Background prefetches count their cache
+    lookups separately from user requests.
+    """
+    place = str(payload.get("place", "")).strip()
+    city = str(payload.get("destination_city", "")).strip()
+    cache_key = _canonical_key(city, place)
+    local_lang = _resolve_local_language(city)
+    cache_name = "place_detail_prefetch" if prefetch else "place_detail"
+
+    cached = await _lookup_place_detail(cache_key, place, city, local_lang, cache_name, require_audio=True)
+    if cached is not None:
+        return cached
+
+    detail = await _ensure_narration(payload, cache_key, local_lang)
+    if detail["audio_status"] == READY:
+        return detail
+    audio = await _ensure_audio(cache_key, place, city, local_lang)
+    return {**audio, "cached": detail["cached"]}
+
+
+async def get_place_detail_text_first(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Like get_place_detail_with_tts, but returns as soon as the narration is
+    available. Audio that is not ready yet is synthesized in the background
+    and reported as pending; poll get_audio_status for progress.
+    """
+    place = str(payload.get("place", "")).strip()
+    city = str(payload.get("destination_city", "")).strip()
+    cache_key = _canonical_key(city, place)
+    local_lang = _resolve_local_language(city)
+
+    detail = await _lookup_place_detail(cache_key, place, city, local_lang, "place_detail", require_audio=False)
+    if detail is None:
+        detail = await _ensure_narration(payload, cache_key, local_lang)
+    if detail["audio_status"] != READY:
+        _schedule_audio(cache_key, place, city, local_lang)
+        detail = _mark_retrying(detail)
+    return detail
+
+
+def _mark_retrying(detail: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Failed audio is synthesized again, so it is reported as pending.
+    """
+    outputs = {
+        lang: {**output, "status": PENDING if output.get("status") == FAILED else output.get("status", PENDING)}
+        for lang, output in detail["outputs"].items()
+    }
+    return {**detail, "outputs": outputs, "audio_status": PENDING}
+
+
+async def get_audio_status(cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Audio status and URLs for a place detail, or None if there is no such
+    entry. Pending audio that no worker is synthesizing (e.g. after a
+    restart) is scheduled again.
+    """
+    cached = await get_cache_backend().get(NAMESPACE, cache_key)
+    if cached is None:
+        return None
+    outputs = cached.get("outputs", {})
+    statuses = await run_io(_audio_statuses, outputs)
+    audio_status = _overall_audio_status(statuses)
+    if audio_status == PENDING:
+        await _resume_audio(cache_key, cached)
+    return {
+        "cache_key": cache_key,
+        "audio_status": audio_status,
+        "outputs": {
+            lang: {"status": status, "audio_url": _public_output(outputs.get(lang, {}), status)["audio_url"]}
+            for lang, status in statuses.items()
+        },
+    }
+
+
+async def open_audio_stream(
+    cache_key: str, lang: str, timeout: float, poll_interval: float
+) -> Optional[Tuple[str, AsyncIterator[bytes]]]:
+    """
+    The media type and bytes of a narration's audio, or None if there is no
+    such entry. Audio that is still being synthesized is sent a sentence at
+    a time as each one is stored, so playback can start after the first;
+    formats that cannot be played progressively are sent once complete.
+    Gives up, ending the stream early, after timeout seconds.
+    """
+    cached = await get_cache_backend().get(NAMESPACE, cache_key)
+    output = (cached or {}).get("outputs", {}).get(lang)
+    if cached is None or output is None:
+        return None
+
+    path = _audio_path(output)
+    if path is not None and await run_io(path.exists):
+        return MEDIA_TYPES.get(path.suffix.lstrip("."), "application/octet-stream"), _iter_files([path])
+
+    await _resume_audio(cache_key, cached)
+    artifact = _audio_artifacts({lang: output.get("text", "")})[lang]
+    engine = engine_for(artifact["lang_code"])
+    blob_ids = artifact["chunk_blobs"] if engine.streamable else [artifact["audio_blob"]]
+    return MEDIA_TYPES[engine.audio_format], _iter_blobs(blob_ids, timeout, poll_interval)
+
+
+async def _iter_files(paths: List[Path]) -> AsyncIterator[bytes]:
+    for path in paths:
+        yield await run_io(path.read_bytes)
+
+
+async def _iter_blobs(blob_ids: List[str], timeout: float, poll_interval: float) -> AsyncIterator[bytes]:
+    # Blobs are written atomically, so one that exists is complete.
+    deadline = time.monotonic() + timeout
+    for blob_id in blob_ids:
+        while not await run_io(blob_exists, blob_id):
+            if time.monotonic() >= deadline:
+                logger.warning(f"Audio stream gave up waiting for {blob_id}")
+                return
+            await asyncio.sleep(poll_interval)
+        yield await run_io(read_blob, blob_id)
+
+
+# ----------------------------------------------------------
+# Narration and audio builds
+# ----------------------------------------------------------
+async def _ensure_narration(
+    payload: Dict[str, Any], cache_key: str, local_lang: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    The cached narration, audio ready or not, or a newly generated one.
+    Concurrent requests for the same place, from any worker, share one
+    generation.
+    """
+    place = str(payload.get("place", "")).strip()
+    city = str(payload.get("destination_city", "")).strip()
+    return await single_flight(
+        NAMESPACE,
+        cache_key,
+        lambda: _generate_place_detail(payload, cache_key, local_lang),
+        lambda: _load_cached_place_detail(cache_key, place, city, local_lang, require_audio=False),
+    )
+
+
+async def _ensure_audio(cache_key: str, place: str, city: str, local_lang: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Synthesizes a cached narration's missing audio and returns the complete
+    place detail. Concurrent calls, from any worker, share one synthesis.
+    """
+    return await single_flight(
+        AUDIO_NAMESPACE,
+        cache_key,
+        lambda: _synthesize_audio(cache_key, place, city, local_lang),
+        lambda: _load_cached_place_detail(cache_key, place, city, local_lang),
+    )
+
+
+def _audio_in_progress(cache_key: str) -> bool:
+    return any(task.get_name() == f"audio:{cache_key}" and not task.done() for task in _audio_tasks)
+
+
+async def _resume_audio(cache_key: str, cached: Dict[str, Any]) -> None:
+    """
+    Schedules synthesis of an entry's pending audio unless some worker is
+    already on it, e.g. after the worker that started it restarted.
+    """
+    if _audio_in_progress(cache_key) or await get_cache_backend().lease_held(AUDIO_NAMESPACE, cache_key):
+        return
+    city = str(cached.get("destination_city", ""))
+    place = str(cached.get("place", ""))
+    _schedule_audio(cache_key, place, city, _resolve_local_language(city))
+
+
+def _schedule_audio(cache_key: str, place: str, city: str, local_lang: Dict[str, str]) -> None:
+    """
+    Starts synthesizing a narration's audio in the background, unless that
+    is already under way in this process. The task outlives the request.
+    """
+    if _audio_in_progress(cache_key):
+        return
+
+    async def synthesize() -> None:
+        with root_span("place_detail.audio", cache_key=cache_key):
+            await _ensure_audio(cache_key, place, city, local_lang)
+
+    task = asyncio.create_task(synthesize(), name=f"audio:{cache_key}")
+    _audio_tasks.add(task)
+    task.add_done_callback(_audio_task_done)
+
+
+def _audio_task_done(task: "asyncio.Task[Any]") -> None:
+    _audio_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background audio synthesis {task.get_name()} failed: {task.exception()}")
+
+
+async def _set_audio_status(cache_key: str, lang: str, status: str, **fields: Any) -> None:
+    backend = get_cache_backend()
+    entry = await backend.get(NAMESPACE, cache_key)
+    if entry is None:
+        return
+    output = entry.setdefault("outputs", {}).setdefault(lang, {})
+    output.update(status=status, **fields)
+    if "audio_blob" in fields:
+        output.pop("audio_file", None)  # a per-place file from before the audio store
+    await backend.set(NAMESPACE, cache_key, entry)
 
+
+def _stored_audio(artifact: Dict[str, Any]) -> Dict[str, Any]:
+    # Sentence blobs are recorded so that garbage collection keeps them.
+    return {
+        "audio_blob": artifact["audio_blob"],
+        "audio_url": artifact["audio_url"],
+        "chunk_blobs": artifact["chunk_blobs"],
+    }
+
+
+async def _synthesize_audio(
+    cache_key: str, place: str, city: str, local_lang: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Writes every audio file of a cached narration that is not ready yet,
+    recording each file's status on the entry as soon as it is known.
+    """
+    entry = await get_cache_backend().get(NAMESPACE, cache_key)
+    if entry is None:
+        raise ValueError(f"No narration cached for {cache_key}")
+    outputs = entry.get("outputs", {})
+    statuses = await run_io(_audio_statuses, outputs)
+    # Addressed by the current engine, which differs from the recorded blob
+    # if the engine was switched since the narration.
+    artifacts = _audio_artifacts({lang: outputs[lang]["text"] for lang in statuses})
+    missing = []
+    for lang, status in statuses.items():
+        if status == READY:
+            continue
+        if await run_io(blob_exists, artifacts[lang]["audio_blob"]):
+            # Another place's narration had the same text.
+            await _set_audio_status(cache_key, lang, READY, **_stored_audio(artifacts[lang]))
+        else:
+            missing.append(lang)
+
+    tasks, chunk_tasks = _synthesize({lang: outputs[lang]["text"] for lang in missing}, artifacts)
+    failed = []
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                lang = tasks[task]
+                if task.exception() is not None:
+                    logger.warning(f"Audio synthesis failed for {cache_key} ({lang}): {task.exception()}")
+                    failed.append(lang)
+                    await _set_audio_status(cache_key, lang, FAILED)
+                else:
+                    await _set_audio_status(cache_key, lang, READY, **_stored_audio(artifacts[lang]))
+    finally:
+        for task in [*tasks, *chunk_tasks]:
+            task.cancel()
+
+    if failed:
+        raise RuntimeError(f"Audio synthesis failed for {cache_key}: {', '.join(failed)}")
+    detail = await _load_cached_place_detail(cache_key, place, city, local_lang)
+    if detail is None:
+        raise RuntimeError(f"Audio for {cache_key} was written but the entry is no longer valid")
+    return detail
+
+
+async def generate_place_narration(payload: Dict[str, Any], local_lang: Dict[str, str]) -> Dict[str, Any]:
+    """
+    The LLM half of a place detail: narration in English, Hindi and the
+    local language plus visitor constraints, without audio.
+    """
     place = str(payload.get("place", "")).strip()
     city = str(payload.get("destination_city", "")).strip()
     time_slot = str(payload.get("time", "")).strip()
     reason = str(payload.get("reason_for_time_choice", "")).strip()
     image_url = str(payload.get("image_url", "")).strip()
-    cache_key = _canonical_key(city, place)
-    json_path = CACHE_DIR / f"{cache_key}.json"
-    local_lang = _resolve_local_language(city)
-    audio = _build_audio_artifacts(cache_key)
-
-    if json_path.exists():
-        with open(json_path, "r", encoding="utf-8") as f:
-            cached = json.load(f)
-        cached_outputs = cached.get("outputs", {})
-        local_cached_text = str(cached.get("local_text", "")).strip()
-        english_ok = cached_outputs.get("english", {}).get("audio_file") and Path(cached_outputs["english"]["audio_file"]).exists()
-        hindi_ok = cached_outputs.get("hindi", {}).get("audio_file") and Path(cached_outputs["hindi"]["audio_file"]).exists()
-        local_script_ok = _contains_native_script(local_cached_text, local_lang["code"])
-        if english_ok and hindi_ok and local_script_ok:
-            return {
-                "place": place,
-                "destination_city": city,
-                "local_language": cached.get("local_language", local_lang["name"]),
-                "local_text": local_cached_text,
-                "constraints": _to_str_list(cached.get("constraints")) or _default_constraints(place),
-                "special_cautions": _to_str_list(cached.get("special_cautions")) or _default_special_cautions(place),
-                "outputs": cached_outputs,
-                "cached": True,
-            }
 
     llm_input = {
         "place": place,
@@ -218,7 +682,7 @@ async def get_place_detail_with_tts(payload: Dict[str, Any]) -> Dict[str, Any]:
         "image_url": image_url,
         "local_language_hint": local_lang["name"],
     }
-    raw = await generate_content(SYSTEM_PROMPT_PLACE_DETAIL, json.dumps(llm_input))
+    raw = await generate_content(SYSTEM_PROMPT_PLACE_DETAIL, json.dumps(llm_input), agent="place_detail")
     parsed = _clean_json(raw)
     english_text = str(parsed.get("english_text", "")).strip()
     hindi_text = str(parsed.get("hindi_text", "")).strip()
@@ -245,56 +709,203 @@ async def get_place_detail_with_tts(payload: Dict[str, Any]) -> Dict[str, Any]:
         if repaired_local:
             local_text = repaired_local
 
-    await asyncio.gather(
-        asyncio.to_thread(
-            _generate_tts_file,
-            english_text,
-            Path(audio["english"]["audio_file"]),
-            audio["english"]["lang_code"],
-            "com",
-        ),
-        asyncio.to_thread(
-            _generate_tts_file,
-            hindi_text,
-            Path(audio["hindi"]["audio_file"]),
-            audio["hindi"]["lang_code"],
-            "co.in",
-        ),
-    )
-
-    outputs = {
-        "english": {
-            "text": english_text,
-            "audio_file": audio["english"]["audio_file"],
-            "audio_url": audio["english"]["audio_url"],
-        },
-        "hindi": {
-            "text": hindi_text,
-            "audio_file": audio["hindi"]["audio_file"],
-            "audio_url": audio["hindi"]["audio_url"],
-        },
-    }
-
-    cache_doc = {
+    return {
         "place": place,
         "destination_city": city,
+        "english_text": english_text,
+        "hindi_text": hindi_text,
         "local_language": local_language_name,
         "local_text": local_text,
         "constraints": constraints,
         "special_cautions": special_cautions,
+    }
+
+
+async def _generate_place_detail(
+    payload: Dict[str, Any], cache_key: str, local_lang: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Generates and caches a place's narration with its audio marked pending;
+    _synthesize_audio writes the audio.
+    """
+    narration = await generate_place_narration(payload, local_lang)
+    place, city = narration["place"], narration["destination_city"]
+    audio = _audio_artifacts({lang: narration[f"{lang}_text"] for lang, _, _ in AUDIO_LANGUAGES})
+    outputs = {}
+    for lang, _, _ in AUDIO_LANGUAGES:
+        # Audio of a narration with the same text may be stored already.
+        exists = await run_io(blob_exists, audio[lang]["audio_blob"])
+        outputs[lang] = {
+            "text": narration[f"{lang}_text"],
+            **_stored_audio(audio[lang]),
+            "status": READY if exists else PENDING,
+        }
+    statuses = {lang: output["status"] for lang, output in outputs.items()}
+
+    cache_doc = {
+        "place": place,
+        "destination_city": city,
+        "local_language": narration["local_language"],
+        "local_text": narration["local_text"],
+        "constraints": narration["constraints"],
+        "special_cautions": narration["special_cautions"],
         "outputs": outputs,
+        "versions": place_detail_versions(),
         "created_at": datetime.utcnow().isoformat() + "Z",
     }
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(cache_doc, f, ensure_ascii=False, indent=2)
+    await get_cache_backend().set(NAMESPACE, cache_key, cache_doc)
 
     return {
         "place": place,
         "destination_city": city,
-        "local_language": local_language_name,
-        "local_text": local_text,
-        "constraints": constraints,
-        "special_cautions": special_cautions,
-        "outputs": outputs,
+        "local_language": narration["local_language"],
+        "local_text": narration["local_text"],
+        "constraints": narration["constraints"],
+        "special_cautions": narration["special_cautions"],
+        "outputs": {lang: _public_output(output, statuses[lang]) for lang, output in outputs.items()},
+        "audio_status": _overall_audio_status(statuses),
+        "cache_key": cache_key,
         "cached": False,
     }
+
+
+async def invalidate_cached_place_details(
+    city: Optional[str] = None,
+    prompt: Optional[str] = None,
+    model: Optional[str] = None,
+    outdated: bool = False,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Deletes the place-detail entries selected by the filters (see
+    cache_versioning.matches_invalidation) and returns their keys. Audio
+    blobs may be shared with other entries and are left for
+    collect_audio_garbage; per-place files from before the audio store are
+    deleted with their entry.
+    """
+    backend = get_cache_backend()
+    current = place_detail_versions()
+    invalidated = []
+    for key in await backend.keys(NAMESPACE):
+        cached = await backend.get(NAMESPACE, key)
+        if cached is None:
+            continue
+        entry_city = str(cached.get("destination_city", ""))
+        if not matches_invalidation(entry_city, cached.get("versions"), current, city, prompt, model, outdated):
+            continue
+
+        invalidated.append(key)
+        if dry_run:
+            continue
+        outputs = cached.get("outputs", {}).values()
+        legacy_files = [_legacy_audio_path(o["audio_file"]) for o in outputs if o.get("audio_file")]
+        for audio_file in legacy_files:
+            await run_io(audio_file.unlink, missing_ok=True)
+        await backend.delete(NAMESPACE, key)
+    return invalidated
+
+
+# ----------------------------------------------------------
+# Audio store maintenance
+# ----------------------------------------------------------
+async def _referenced_audio() -> Tuple[Set[str], Set[str]]:
+    """
+    Audio blobs and names of per-place audio files that entries point to.
+    """
+    backend = get_cache_backend()
+    blobs, legacy_files = set(), set()
+    for key in await backend.keys(NAMESPACE):
+        cached = await backend.get(NAMESPACE, key)
+        for output in (cached or {}).get("outputs", {}).values():
+            if output.get("audio_blob"):
+                blobs.add(output["audio_blob"])
+            blobs.update(output.get("chunk_blobs", []))
+            if output.get("audio_file"):
+                legacy_files.add(Path(output["audio_file"]).name)
+    return blobs, legacy_files
+
+
+def _unreferenced_legacy_files(referenced: Set[str], min_age: float) -> List[Path]:
+    if not CACHE_DIR.exists():
+        return []
+    cutoff = time.time() - min_age
+    return [
+        path
+        for path in CACHE_DIR.iterdir()
+        if path.suffix in LEGACY_AUDIO_SUFFIXES and path.name not in referenced and path.stat().st_mtime < cutoff
+    ]
+
+
+async def collect_audio_garbage(min_age: float, dry_run: bool = False) -> List[Path]:
+    """
+    Deletes audio that no place-detail entry points to and that is older
+    than min_age seconds: blobs in the audio store and per-place files left
+    from before it. Returns the files.
+    """
+    blobs, legacy_files = await _referenced_audio()
+    garbage = await run_io(unreferenced_blobs, blobs, min_age)
+    garbage += await run_io(_unreferenced_legacy_files, legacy_files, min_age)
+    if not dry_run:
+        for path in garbage:
+            await run_io(path.unlink, missing_ok=True)
+    return garbage
+
+
+def _move_file(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    source.replace(target)
+
+
+async def migrate_audio_to_store(dry_run: bool = False) -> Dict[str, int]:
+    """
+    Moves per-place audio files into the audio store and points their
+    entries at the blobs. Files whose blob already exists (the same text
+    spoken under another key) are deleted instead. Per-place files predate
+    speech engines, so they are taken as gTTS output. Returns counts of what
+    was done.
+    """
+    backend = get_cache_backend()
+    stats = {"entries": 0, "moved": 0, "duplicates": 0, "missing": 0, "bytes_freed": 0}
+    # Blobs this run stores and files it moves or deletes, so that a dry run
+    # counts the same as a real one.
+    stored: Set[str] = set()
+    consumed: Set[Path] = set()
+    for key in await backend.keys(NAMESPACE):
+        cached = await backend.get(NAMESPACE, key)
+        if cached is None:
+            continue
+        changed = False
+        outputs = cached.get("outputs", {})
+        for lang, lang_code, tld in AUDIO_LANGUAGES:
+            output = outputs.get(lang, {})
+            if output.get("audio_blob") or not output.get("audio_file"):
+                continue
+            legacy = _legacy_audio_path(output["audio_file"])
+            blob_id = audio_blob_id("gtts", lang_code, tld, output.get("text", ""), legacy.suffix.lstrip("."))
+            # The file may also be gone because an entry sharing it was
+            # migrated first.
+            duplicate = blob_id in stored or await run_io(blob_exists, blob_id)
+            legacy_exists = legacy not in consumed and await run_io(legacy.exists)
+            if not duplicate and not legacy_exists:
+                # Synthesized into the store on the next request for it.
+                stats["missing"] += 1
+                continue
+            stats["duplicates" if duplicate else "moved"] += 1
+            stored.add(blob_id)
+            consumed.add(legacy)
+            if duplicate and legacy_exists:
+                stats["bytes_freed"] += (await run_io(legacy.stat)).st_size
+            changed = True
+            if dry_run:
+                continue
+            if not duplicate:
+                await run_io(_move_file, legacy, blob_path(blob_id))
+            elif legacy_exists:
+                await run_io(legacy.unlink)
+            output.pop("audio_file")
+            output.update(audio_blob=blob_id, audio_url=blob_url(blob_id), status=READY)
+        if changed:
+            stats["entries"] += 1
+            if not dry_run:
+                await backend.set(NAMESPACE, key, cached)
+    return stats
@@ -0,0 +1,166 @@
+import cProfile
+import hmac
+import io
+import json
+import pstats
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from travel_ai.config import PROFILE_ADMIN_TOKEN, PROFILE_DIR, PROFILE_MAX_FILES, PROFILE_SAMPLE_RATE
+from travel_ai.services.storage import run_io
+from travel_ai.services.tracing import current_trace_id
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("profiling")
+
+DEFAULT_PROFILE_DIR = Path(__file__).resolve().parent.parent / "logs" / "profiles"
+
+_PROFILE_ID = re.compile(r"^[0-9]{13}-[0-9a-f]{8}$")
+
+
+def profile_dir() -> Path:
+    return Path(PROFILE_DIR) if PROFILE_DIR else DEFAULT_PROFILE_DIR
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """
+    True if token matches PROFILE_ADMIN_TOKEN. Always False while no admin
+    token is configured.
+    """
+    if not PROFILE_ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), PROFILE_ADMIN_TOKEN.encode("utf-8"))
+
+
+# ----------------------------------------------------------
+# On-disk ring
+# ----------------------------------------------------------
+def _write_profile(directory: Path, profile_id: str, profiler: cProfile.Profile, meta: Dict[str, Any]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(directory / f"{profile_id}.prof"))
+    with open(directory / f"{profile_id}.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    _prune(directory, PROFILE_MAX_FILES)
+
+
+def _prune(directory: Path, keep: int) -> None:
+    # Profile IDs start with a millisecond timestamp, so name order is age order.
+    profiles = sorted(directory.glob("*.prof"))
+    for path in profiles[: max(len(profiles) - keep, 0)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+
+
+def _read_meta(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _list_profiles(directory: Path) -> List[Dict[str, Any]]:
+    profiles = []
+    for path in sorted(directory.glob("*.prof"), reverse=True):
+        meta = _read_meta(path.with_suffix(".json")) or {"profile_id": path.stem}
+        profiles.append({**meta, "size_bytes": path.stat().st_size})
+    return profiles
+
+
+async def list_profiles() -> List[Dict[str, Any]]:
+    """
+    Saved profiles, newest first.
+    """
+    return await run_io(_list_profiles, profile_dir())
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = profile_dir() / f"{profile_id}.prof"
+    return path if path.exists() else None
+
+
+def _render_stats(path: Path, sort: str, limit: int) -> str:
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+async def render_profile(path: Path, sort: str = "cumulative", limit: int = 50) -> str:
+    """
+    The pstats report for a saved profile, for reading without downloading.
+    """
+    return await run_io(_render_stats, path, sort, limit)
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+class ProfilingMiddleware:
+    """
+    Runs cProfile around a request when an admin sends X-Profile: 1 with a
+    valid X-Admin-Token, or for a PROFILE_SAMPLE_RATE fraction of requests.
+    The profile is saved to the on-disk ring and its ID returned in an
+    X-Profile-Id response header.
+
+    cProfile sees everything on the event loop thread, so work from other
+    requests running at the same time shows up too, while run_io threads do
+    not. Only one request is profiled at a time.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        self._active = False
+
+    def _wanted(self, scope: Dict[str, Any]) -> bool:
+        if scope["type"] != "http" or self._active or scope["path"].startswith("/admin/"):
+            return False
+        headers = dict(scope.get("headers") or [])
+        if headers.get(b"x-profile") == b"1":
+            return is_admin(headers.get(b"x-admin-token", b"").decode("latin-1"))
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+        status = {"code": None}
+
+        async def send_with_profile_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode("ascii"))
+                ]
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            self._active = False
+            meta = {
+                "profile_id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status["code"],
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "trace_id": current_trace_id(),
+                "created_at": time.time(),
+            }
+            try:
+                await run_io(_write_profile, profile_dir(), profile_id, profiler, meta)
+            except OSError as exc:
+                logger.warning(f"Saving profile {profile_id} failed: {exc}")
@@ -0,0 +1,96 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from travel_ai.config import STAGE_CACHE_TTL
+from travel_ai.services.cache_backend import get_cache_backend, single_flight
+from travel_ai.services.metrics import record_cache_lookup
+from travel_ai.services.tracing import span
+
+
+NAMESPACE = "stage.output"
+
+
+def _stage_key(stage: str, city: str, interests: List[str], versions: Dict[str, Any]) -> str:
+    """
+    Stage results depend on the city, the interests and the dataset/model/prompt
+    versions that produced them, so all of these are folded into the key.
+    """
+    payload = json.dumps(
+        {
+            "stage": stage,
+            "city": " ".join(city.strip().lower().split()),
+            "interests": sorted(str(i).strip().lower() for i in interests if str(i).strip()),
+            "versions": versions,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _stage_namespace(stage: str) -> str:
+    return f"{NAMESPACE}/{stage}"
+
+
+async def get_cached_stage(
+    stage: str, city: str, interests: List[str], versions: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    cached = await get_cache_backend().get(_stage_namespace(stage), _stage_key(stage, city, interests, versions))
+    if cached is None:
+        return None
+
+    created_at = datetime.fromisoformat(str(cached.get("created_at", "")).rstrip("Z") or datetime.min.isoformat())
+    if datetime.utcnow() - created_at > timedelta(seconds=STAGE_CACHE_TTL):
+        return None
+    return cached.get("result")
+
+
+async def save_cached_stage(
+    stage: str, city: str, interests: List[str], versions: Dict[str, Any], result: Dict[str, Any]
+) -> None:
+    key = _stage_key(stage, city, interests, versions)
+    payload = {
+        "cache_key": key,
+        "stage": stage,
+        "city": city,
+        "interests": interests,
+        "versions": versions,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "result": result,
+    }
+    await get_cache_backend().set(_stage_namespace(stage), key, payload, ttl=STAGE_CACHE_TTL)
+
+
+async def get_or_build_stage(
+    stage: str,
+    city: str,
+    interests: List[str],
+    versions: Dict[str, Any],
+    build: Callable[[], Awaitable[Dict[str, Any]]],
+    cacheable: Callable[[Dict[str, Any]], bool],
+) -> Dict[str, Any]:
+    """
+    Returns the cached stage result, or builds it once across concurrent
+    requests and workers and caches it if cacheable(result) holds.
+    """
+    with span("cache.lookup", cache=f"stage.{stage}") as lookup_span:
+        cached = await get_cached_stage(stage, city, interests, versions)
+        lookup_span.set("result", "hit" if cached is not None else "miss")
+    record_cache_lookup(f"stage.{stage}", "fresh" if cached is not None else None)
+    if cached is not None:
+        return cached
+
+    async def build_and_save() -> Dict[str, Any]:
+        result = await build()
+        if cacheable(result):
+            await save_cached_stage(stage, city, interests, versions, result)
+        return result
+
+    return await single_flight(
+        _stage_namespace(stage),
+        _stage_key(stage, city, interests, versions),
+        build_and_save,
+        lambda: get_cached_stage(stage, city, interests, versions),
+    )
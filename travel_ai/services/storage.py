@@ -0,0 +1,206 @@
+import asyncio
+import gzip
+import json
+import os
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from travel_ai.config import CACHE_ENTRY_CODEC, STORAGE_IO_WORKERS
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used when zstandard is not installed
+    zstandard = None
+
+T = TypeVar("T")
+
+# Cache and dataset I/O gets its own pool so slow disks cannot starve the
+# default executor.
+_executor = ThreadPoolExecutor(max_workers=STORAGE_IO_WORKERS, thread_name_prefix="storage-io")
+
+# Cache entry file layout (format version 1):
+#   b"TAIC" | version: u8 | header length: u32 big-endian | header JSON | body
+# The header is minified JSON holding the key, codec and the document's
+# timestamps; the body is the minified JSON document compressed with the codec.
+# Entries written before this format are plain indented JSON files with the
+# legacy suffix and are still read.
+ENTRY_MAGIC = b"TAIC"
+ENTRY_FORMAT_VERSION = 1
+ENTRY_SUFFIX = ".entry"
+LEGACY_ENTRY_SUFFIX = ".json"
+_PREAMBLE = struct.Struct(">BI")
+
+
+def _resolve_codec(codec: str) -> str:
+    if codec == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if codec == "zstd" and zstandard is None:
+        return "gzip"
+    return codec
+
+
+def _compress(codec: str, raw: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    if codec == "gzip":
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    return raw
+
+
+def _decompress(codec: str, blob: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Cache entry is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if codec == "gzip":
+        return gzip.decompress(blob)
+    return blob
+
+
+def write_bytes_sync(path: Path, data: bytes) -> None:
+    """
+    Writes via a temp file in the same directory followed by a rename, so
+    readers never observe a partially written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def read_json_sync(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Returns the parsed JSON document at path, or None if the file does not exist.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_json_sync(path: Path, data: Dict[str, Any]) -> None:
+    write_bytes_sync(path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def encode_entry(key: str, data: Dict[str, Any], codec: str = CACHE_ENTRY_CODEC) -> bytes:
+    codec = _resolve_codec(codec)
+    header = {
+        "key": key,
+        "format": ENTRY_FORMAT_VERSION,
+        "codec": codec,
+        **{name: value for name, value in data.items() if name.endswith("_at") and isinstance(value, str)},
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return (
+        ENTRY_MAGIC
+        + _PREAMBLE.pack(ENTRY_FORMAT_VERSION, len(header_bytes))
+        + header_bytes
+        + _compress(codec, body)
+    )
+
+
+def decode_entry_header(blob: bytes) -> Tuple[Dict[str, Any], int]:
+    """
+    Returns the entry header and the offset of the body. Legacy plain-JSON
+    entries report format 0 and a body offset of 0.
+    """
+    if not blob.startswith(ENTRY_MAGIC):
+        return {"format": 0, "codec": "none"}, 0
+    version, header_len = _PREAMBLE.unpack_from(blob, len(ENTRY_MAGIC))
+    if version > ENTRY_FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache entry format version {version}")
+    start = len(ENTRY_MAGIC) + _PREAMBLE.size
+    header = json.loads(blob[start:start + header_len])
+    return header, start + header_len
+
+
+def decode_entry(blob: bytes) -> Dict[str, Any]:
+    header, offset = decode_entry_header(blob)
+    return json.loads(_decompress(header["codec"], blob[offset:]))
+
+
+def _entry_files(base: Path) -> Tuple[Path, Path]:
+    return base.with_name(base.name + ENTRY_SUFFIX), base.with_name(base.name + LEGACY_ENTRY_SUFFIX)
+
+
+def read_entry_sync(base: Path) -> Optional[Dict[str, Any]]:
+    """
+    Reads the cache entry stored at base (a path without suffix), preferring
+    the compact format and falling back to a legacy JSON file.
+    """
+    for path in _entry_files(base):
+        try:
+            blob = path.read_bytes()
+        except FileNotFoundError:
+            continue
+        return decode_entry(blob)
+    return None
+
+
+def write_entry_sync(base: Path, key: str, data: Dict[str, Any]) -> None:
+    entry_path, legacy_path = _entry_files(base)
+    write_bytes_sync(entry_path, encode_entry(key, data))
+    legacy_path.unlink(missing_ok=True)
+
+
+def delete_entry_sync(base: Path) -> None:
+    for path in _entry_files(base):
+        path.unlink(missing_ok=True)
+
+
+def entry_bases(directory: Path) -> List[Path]:
+    """
+    Lists the entries in a cache directory as suffix-less base paths,
+    covering both compact and legacy files.
+    """
+    if not directory.exists():
+        return []
+    bases = {
+        path.with_name(path.name[: -len(path.suffix)])
+        for path in directory.iterdir()
+        if path.suffix in (ENTRY_SUFFIX, LEGACY_ENTRY_SUFFIX) and not path.name.startswith(".")
+    }
+    return sorted(bases)
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking file-system call on the storage thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+async def read_json(path: Path) -> Optional[Dict[str, Any]]:
+    return await run_io(read_json_sync, path)
+
+
+async def write_bytes(path: Path, data: bytes) -> None:
+    await run_io(write_bytes_sync, path, data)
+
+
+async def write_json(path: Path, data: Dict[str, Any]) -> None:
+    await run_io(write_json_sync, path, data)
+
+
+async def read_entry(base: Path) -> Optional[Dict[str, Any]]:
+    return await run_io(read_entry_sync, base)
+
+
+async def write_entry(base: Path, key: str, data: Dict[str, Any]) -> None:
+    await run_io(write_entry_sync, base, key, data)
+
+
+async def path_exists(path: Path) -> bool:
+    return await run_io(path.exists)
@@ -0,0 +1,222 @@
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from travel_ai.config import LLM_PRICE_PER_MTOK_IN, LLM_PRICE_PER_MTOK_OUT, TOKEN_LEDGER, TOKEN_LEDGER_DIR
+from travel_ai.services.storage import run_io
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("token_accounting")
+
+DEFAULT_LEDGER_DIR = Path(__file__).resolve().parent.parent / "logs" / "token_ledger"
+
+# Llama 3 averages about four characters per token on English prompts. Indic
+# scripts split much finer, so those characters are counted one per token.
+CHARS_PER_TOKEN = 4
+NON_ASCII_CHARS_PER_TOKEN = 1
+
+_current_usage: ContextVar[Optional["TokenUsage"]] = ContextVar("travel_ai_token_usage", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for text the provider reported no usage for.
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_chars = len(text) - non_ascii
+    return max(1, round(ascii_chars / CHARS_PER_TOKEN + non_ascii / NON_ASCII_CHARS_PER_TOKEN))
+
+
+def call_cost(prompt_tokens: int, completion_tokens: int, reported: Optional[float]) -> Optional[float]:
+    """
+    The provider's reported cost in USD, else one priced from
+    LLM_PRICE_PER_MTOK_IN/OUT, else None when no prices are configured.
+    """
+    if reported is not None:
+        return float(reported)
+    if not LLM_PRICE_PER_MTOK_IN and not LLM_PRICE_PER_MTOK_OUT:
+        return None
+    return (prompt_tokens * LLM_PRICE_PER_MTOK_IN + completion_tokens * LLM_PRICE_PER_MTOK_OUT) / 1_000_000
+
+
+class TokenUsage:
+    """
+    Token totals per agent for one unit of work (a request, job or pipeline
+    run). Scopes nest: a finished scope adds its totals to the enclosing one.
+    """
+
+    def __init__(self):
+        self.agents: Dict[str, Dict[str, Any]] = {}
+
+    def add(
+        self,
+        agent: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        system_prompt_tokens: int,
+        estimated_calls: int,
+        cost_usd: Optional[float],
+        calls: int = 1,
+        cached_prompt_tokens: int = 0,
+    ) -> None:
+        totals = self.agents.setdefault(
+            agent,
+            {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "cached_prompt_tokens": 0,
+                "completion_tokens": 0,
+                "system_prompt_tokens": 0,
+                "estimated_calls": 0,
+                "cost_usd": None,
+            },
+        )
+        totals["calls"] += calls
+        totals["prompt_tokens"] += prompt_tokens
+        totals["cached_prompt_tokens"] += cached_prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+        totals["system_prompt_tokens"] += system_prompt_tokens
+        totals["estimated_calls"] += estimated_calls
+        if cost_usd is not None:
+            totals["cost_usd"] = (totals["cost_usd"] or 0.0) + cost_usd
+
+    def merge_into(self, other: "TokenUsage") -> None:
+        for agent, totals in self.agents.items():
+            other.add(
+                agent,
+                totals["prompt_tokens"],
+                totals["completion_tokens"],
+                totals["system_prompt_tokens"],
+                totals["estimated_calls"],
+                totals["cost_usd"],
+                calls=totals["calls"],
+                cached_prompt_tokens=totals["cached_prompt_tokens"],
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        The metadata.token_usage block: totals plus a breakdown per agent.
+        cost_usd is None when no call had a known cost.
+        """
+        agents = {
+            agent: {**totals, "cost_usd": _round_cost(totals["cost_usd"])} for agent, totals in self.agents.items()
+        }
+        costs = [t["cost_usd"] for t in self.agents.values() if t["cost_usd"] is not None]
+        return {
+            "calls": sum(t["calls"] for t in self.agents.values()),
+            "prompt_tokens": sum(t["prompt_tokens"] for t in self.agents.values()),
+            "cached_prompt_tokens": sum(t["cached_prompt_tokens"] for t in self.agents.values()),
+            "completion_tokens": sum(t["completion_tokens"] for t in self.agents.values()),
+            "total_tokens": sum(t["prompt_tokens"] + t["completion_tokens"] for t in self.agents.values()),
+            "estimated_calls": sum(t["estimated_calls"] for t in self.agents.values()),
+            "cost_usd": _round_cost(sum(costs)) if costs else None,
+            "by_agent": agents,
+        }
+
+
+def _round_cost(cost: Optional[float]) -> Optional[float]:
+    return round(cost, 6) if cost is not None else None
+
+
+@contextmanager
+def usage_scope() -> Iterator[TokenUsage]:
+    """
+    Collects the tokens of every LLM call made inside the block, including
+    calls in tasks it creates.
+    """
+    parent = _current_usage.get()
+    usage = TokenUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+        if parent is not None:
+            usage.merge_into(parent)
+
+
+def current_usage() -> Optional[TokenUsage]:
+    return _current_usage.get()
+
+
+def usage_metadata() -> Dict[str, Any]:
+    usage = _current_usage.get()
+    return {"token_usage": usage.summary()} if usage is not None else {}
+
+
+# ----------------------------------------------------------
+# Daily ledger
+# ----------------------------------------------------------
+def ledger_dir() -> Path:
+    return Path(TOKEN_LEDGER_DIR) if TOKEN_LEDGER_DIR else DEFAULT_LEDGER_DIR
+
+
+def ledger_path(day: str) -> Path:
+    return ledger_dir() / f"{day}.jsonl"
+
+
+def ledger_day() -> str:
+    """
+    The current UTC day, which names the ledger file calls are appended to.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _append_line(path: Path, line: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+async def record_call(entry: Dict[str, Any]) -> None:
+    """
+    Appends one LLM call to the ledger for the current UTC day.
+    """
+    if not TOKEN_LEDGER:
+        return
+    line = json.dumps({"ts": round(time.time(), 3), **entry}, ensure_ascii=False) + "\n"
+    path = ledger_path(ledger_day())
+    try:
+        await run_io(_append_line, path, line)
+    except OSError as exc:
+        logger.warning(f"Could not write token ledger {path}: {exc}")
+
+
+def read_ledger(day: str) -> List[Dict[str, Any]]:
+    path = ledger_path(day)
+    if not path.exists():
+        return []
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+    return entries
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+class TokenUsageMiddleware:
+    """
+    Opens a usage scope around every HTTP request, streamed bodies included,
+    so responses built inside it can report their token totals.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with usage_scope():
+            await self.app(scope, receive, send)
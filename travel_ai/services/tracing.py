@@ -0,0 +1,297 @@
+import asyncio
+import json
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import httpx
+
+from travel_ai.config import TRACE_EXPORTER, TRACE_FILE, TRACE_OTLP_ENDPOINT, TRACE_SERVICE_NAME
+from travel_ai.services.storage import run_io
+from travel_ai.utils.logger import get_logger
+
+logger = get_logger("tracing")
+
+DEFAULT_TRACE_FILE = Path(__file__).resolve().parent.parent / "logs" / "traces.jsonl"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("travel_ai_current_span", default=None)
+_export_tasks: Set["asyncio.Task[None]"] = set()
+
+
+class Trace:
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.spans: List["Span"] = []
+
+
+class Span:
+    """
+    One timed operation. Spans opened while another span is current become
+    its children, including spans opened in tasks created inside it.
+    """
+
+    def __init__(self, trace: Trace, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent = parent
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self._start_perf = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.children: List["Span"] = []
+        if parent is not None:
+            parent.children.append(self)
+        trace.spans.append(self)
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+
+    @property
+    def end_ns(self) -> int:
+        return self.start_ns + int((self.duration_ms or 0) * 1e6)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_unix_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def tree(self) -> Dict[str, Any]:
+        """
+        The span and its descendants with durations; spans still running
+        report the time elapsed so far.
+        """
+        duration = self.duration_ms
+        if duration is None:
+            duration = (time.perf_counter() - self._start_perf) * 1000
+        node: Dict[str, Any] = {"name": self.name, "duration_ms": round(duration, 2)}
+        if self.attributes:
+            node["attributes"] = self.attributes
+        if self.status != "ok":
+            node["status"] = self.status
+        if self.duration_ms is None:
+            node["in_progress"] = True
+        if self.children:
+            node["children"] = [child.tree() for child in self.children]
+        return node
+
+
+@contextmanager
+def _open_span(trace: Trace, parent: Optional[Span], name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+    current = Span(trace, name, parent, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except asyncio.CancelledError:
+        current.status = "cancelled"
+        raise
+    except BaseException as exc:
+        current.status = "error"
+        current.error = str(exc)[:500]
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
+        if parent is None:
+            export_trace(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Opens a span under the current one, or starts a new trace if there is
+    none. Traces are exported when their root span ends.
+    """
+    parent = _current_span.get()
+    with _open_span(parent.trace if parent is not None else Trace(), parent, name, attributes) as current:
+        yield current
+
+
+@contextmanager
+def root_span(
+    name: str,
+    trace_id: Optional[str] = None,
+    remote_parent_id: Optional[str] = None,
+    **attributes: Any,
+) -> Iterator[Span]:
+    """
+    Starts a new trace, continuing trace_id when the caller propagated one.
+    """
+    token = _current_span.set(None)
+    try:
+        with _open_span(Trace(trace_id), None, name, attributes) as current:
+            current.parent_id = remote_parent_id
+            yield current
+    finally:
+        _current_span.reset(token)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace.trace_id if current is not None else None
+
+
+def current_trace_tree() -> Optional[Dict[str, Any]]:
+    current = _current_span.get()
+    if current is None:
+        return None
+    root = current
+    while root.parent is not None:
+        root = root.parent
+    return {"trace_id": current.trace.trace_id, **root.tree()}
+
+
+def parse_traceparent(header: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns (trace_id, parent span_id) from a W3C traceparent header, or
+    (None, None) if it is missing or malformed.
+    """
+    parts = (header or "").strip().lower().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or parts[1] == "0" * 32:
+        return None, None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None, None
+    return parts[1], parts[2]
+
+
+# ----------------------------------------------------------
+# Export
+# ----------------------------------------------------------
+def export_trace(trace: Trace) -> None:
+    if TRACE_EXPORTER == "none" or not trace.spans:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    exporter = _export_file if TRACE_EXPORTER == "file" else _export_otlp
+    task = loop.create_task(exporter([s for s in trace.spans if s.duration_ms is not None]))
+    _export_tasks.add(task)
+    task.add_done_callback(_export_tasks.discard)
+
+
+def _append_lines(path: Path, lines: List[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(lines))
+
+
+async def _export_file(spans: List[Span]) -> None:
+    path = Path(TRACE_FILE) if TRACE_FILE else DEFAULT_TRACE_FILE
+    lines = [json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n" for s in spans]
+    try:
+        await run_io(_append_lines, path, lines)
+    except OSError as exc:
+        logger.warning(f"Trace export to {path} failed: {exc}")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(s: Span) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "traceId": s.trace.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": 1,
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+        "status": {"code": 2, "message": s.error or s.status} if s.status != "ok" else {"code": 1},
+    }
+    if s.parent_id:
+        payload["parentSpanId"] = s.parent_id
+    return payload
+
+
+async def _export_otlp(spans: List[Span]) -> None:
+    """
+    Sends spans to an OpenTelemetry collector using OTLP/HTTP with JSON
+    encoding.
+    """
+    body = {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}},
+                        {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": "travel_ai"}, "spans": [_otlp_span(s) for s in spans]}],
+            }
+        ]
+    }
+    try:
+        async with httpx.AsyncClient(timeout=5) as client:
+            response = await client.post(TRACE_OTLP_ENDPOINT, json=body)
+        if response.status_code >= 400:
+            logger.warning(f"OTLP trace export failed: {response.status_code}")
+    except httpx.HTTPError as exc:
+        logger.warning(f"OTLP trace export failed: {exc}")
+
+
+# ----------------------------------------------------------
+# ASGI middleware
+# ----------------------------------------------------------
+class TracingMiddleware:
+    """
+    Wraps every HTTP request, streamed bodies included, in a root span.
+    Continues the caller's trace from a W3C traceparent header and returns
+    the trace ID in an X-Trace-Id response header.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        trace_id, parent_id = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        name = f"{scope['method']} {scope['path']}"
+        with root_span(name, trace_id, parent_id, **{"http.method": scope["method"], "http.target": scope["path"]}) as root:
+            async def send_with_trace_id(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    root.set("http.status_code", message["status"])
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-trace-id", root.trace.trace_id.encode("ascii"))
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace_id)
@@ -0,0 +1,276 @@
+import asyncio
+import io
+import re
+import shutil
+import subprocess
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+from gtts import gTTS
+
+from travel_ai.config import (
+    TTS_ENGINE,
+    TTS_ENGINE_BY_LANGUAGE,
+    TTS_ESPEAK_BINARY,
+    TTS_STUB_CHARS_PER_SECOND,
+    TTS_WORKERS,
+)
+
+# Blocking engines run on their own threads so slow synthesis never holds up
+# cache and dataset I/O, and at most TTS_WORKERS files are synthesized at once.
+_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+
+# Narration speed the stub engine sizes its audio by, about that of gTTS.
+STUB_CHARS_PER_AUDIO_SECOND = 15
+STUB_SAMPLE_RATE = 8000
+
+# Sentences shorter than this (abbreviations, "Namaste!") are spoken together
+# with the next one.
+MIN_CHUNK_CHARS = 40
+
+MEDIA_TYPES = {"mp3": "audio/mpeg", "wav": "audio/wav"}
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Text split after sentence-ending punctuation (including the Devanagari
+    danda), the unit audio is synthesized and cached in.
+    """
+    chunks: List[str] = []
+    pending = ""
+    for sentence in re.split(r"(?<=[.!?\u0964\u0965])\s+", text.strip()):
+        pending = f"{pending} {sentence}".strip()
+        if len(pending) >= MIN_CHUNK_CHARS:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        if chunks:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
+def _join_wav(parts: Sequence[bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        for index, part in enumerate(parts):
+            with wave.open(io.BytesIO(part), "rb") as chunk:
+                if index == 0:
+                    out.setparams(chunk.getparams())
+                out.writeframes(chunk.readframes(chunk.getnframes()))
+    return buffer.getvalue()
+
+
+@dataclass
+class TTSItem:
+    text: str
+    language: str
+    tld: str = "com"
+
+
+class TTSEngine:
+    """
+    Turns text into audio bytes. Subclasses implement synthesize(); blocking
+    ones derive from ThreadedTTSEngine instead. Cancelling synthesize()
+    writes nothing and leaves no work running beyond the current chunk.
+    """
+
+    name = ""
+    audio_format = "mp3"
+    # Nominal bitrate of the audio produced, for sizing storage and bandwidth.
+    bitrate_kbps = 0
+
+    async def synthesize(self, item: TTSItem) -> bytes:
+        raise NotImplementedError
+
+    @property
+    def streamable(self) -> bool:
+        """
+        Whether audio can be played while it is still arriving: MP3 is a
+        sequence of self-contained frames, WAV needs its header's length.
+        """
+        return self.audio_format == "mp3"
+
+    def join_audio(self, parts: Sequence[bytes]) -> bytes:
+        """
+        One file from audio synthesized piece by piece. MP3 pieces simply
+        concatenate (gTTS joins its own requests that way); WAV pieces are
+        rewritten under a single header.
+        """
+        return _join_wav(parts) if self.audio_format == "wav" else b"".join(parts)
+
+    async def synthesize_batch(self, items: Sequence[TTSItem]) -> List[bytes]:
+        """
+        Audio for several texts, in order. The default synthesizes them
+        concurrently, bounded by the engine's pool; engines that can
+        amortize work across texts override it.
+        """
+        return list(await asyncio.gather(*(self.synthesize(item) for item in items)))
+
+
+class ThreadedTTSEngine(TTSEngine):
+    """
+    An engine whose synthesis blocks, run on the TTS thread pool. A thread
+    cannot be interrupted, so cancellation is signalled to it and it gives
+    up at the next chunk boundary.
+    """
+
+    def synthesize_sync(self, item: TTSItem, cancelled: threading.Event) -> Optional[bytes]:
+        """
+        The audio, or None once `cancelled` is set.
+        """
+        raise NotImplementedError
+
+    async def synthesize(self, item: TTSItem) -> bytes:
+        cancelled = threading.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            audio = await loop.run_in_executor(_executor, partial(self.synthesize_sync, item, cancelled))
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        if audio is None:
+            raise asyncio.CancelledError()
+        return audio
+
+
+class GTTSEngine(ThreadedTTSEngine):
+    """
+    Google Translate's speech endpoint through gTTS; needs the network.
+    """
+
+    name = "gtts"
+    audio_format = "mp3"
+    bitrate_kbps = 32
+
+    def synthesize_sync(self, item: TTSItem, cancelled: threading.Event) -> Optional[bytes]:
+        tts = gTTS(text=item.text, lang=item.language, tld=item.tld)
+        audio = bytearray()
+        for part in tts.stream():
+            if cancelled.is_set():
+                return None
+            audio.extend(part)
+        return bytes(audio)
+
+
+class EspeakEngine(ThreadedTTSEngine):
+    """
+    A locally installed espeak-ng; works offline. Produces 22 kHz 16-bit
+    mono WAV.
+    """
+
+    name = "espeak"
+    audio_format = "wav"
+    bitrate_kbps = 353
+
+    def __init__(self, binary: str = TTS_ESPEAK_BINARY):
+        self.binary = binary
+
+    def synthesize_sync(self, item: TTSItem, cancelled: threading.Event) -> Optional[bytes]:
+        if shutil.which(self.binary) is None:
+            raise RuntimeError(f"TTS engine espeak needs {self.binary!r} on the PATH")
+        proc = subprocess.Popen(
+            [self.binary, "-v", item.language, "--stdin", "--stdout"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        text: Optional[bytes] = item.text.encode("utf-8")
+        while True:
+            try:
+                audio, stderr = proc.communicate(text, timeout=0.2)
+                break
+            except subprocess.TimeoutExpired:
+                text = None  # already sent; retrying must not send it again
+                if cancelled.is_set():
+                    proc.kill()
+                    proc.communicate()
+                    return None
+        if proc.returncode != 0:
+            raise RuntimeError(f"{self.binary} exited with {proc.returncode}: {stderr.decode(errors='replace')}")
+        return audio
+
+
+class StubEngine(ThreadedTTSEngine):
+    """
+    Silent 8 kHz 8-bit mono WAV, as long as a spoken narration of the text
+    would be. Output depends only on the text's length, so tests and
+    benchmarks run offline and reproducibly. TTS_STUB_CHARS_PER_SECOND > 0
+    makes synthesis take time like a real engine would.
+    """
+
+    name = "stub"
+    audio_format = "wav"
+    bitrate_kbps = 64
+
+    def __init__(self, chars_per_second: float = TTS_STUB_CHARS_PER_SECOND):
+        self.chars_per_second = chars_per_second
+
+    def synthesize_sync(self, item: TTSItem, cancelled: threading.Event) -> Optional[bytes]:
+        if self.chars_per_second > 0 and cancelled.wait(len(item.text) / self.chars_per_second):
+            return None
+        frames = round(len(item.text) / STUB_CHARS_PER_AUDIO_SECOND * STUB_SAMPLE_RATE)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(1)
+            out.setframerate(STUB_SAMPLE_RATE)
+            out.writeframes(b"\x80" * frames)  # unsigned 8-bit silence
+        return buffer.getvalue()
+
+
+ENGINES = {engine.name: engine for engine in (GTTSEngine, EspeakEngine, StubEngine)}
+
+
+def _parse_engine_map(spec: str) -> Dict[str, str]:
+    """
+    "hi=espeak,ta=stub" -> {"hi": "espeak", "ta": "stub"}
+    """
+    mapping = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        language, _, name = part.partition("=")
+        mapping[language.strip()] = name.strip()
+    return mapping
+
+
+_default_engine = TTS_ENGINE
+_engine_by_language = _parse_engine_map(TTS_ENGINE_BY_LANGUAGE)
+for _name in {_default_engine, *_engine_by_language.values()}:
+    if _name not in ENGINES:
+        raise ValueError(f"Unknown TTS engine {_name!r}; expected one of {', '.join(ENGINES)}")
+
+_instances: Dict[str, TTSEngine] = {}
+
+
+def get_engine(name: str) -> TTSEngine:
+    if name not in ENGINES:
+        raise ValueError(f"Unknown TTS engine {name!r}; expected one of {', '.join(ENGINES)}")
+    if name not in _instances:
+        _instances[name] = ENGINES[name]()
+    return _instances[name]
+
+
+def engine_for(language: str) -> TTSEngine:
+    """
+    The engine configured for a language code: its TTS_ENGINE_BY_LANGUAGE
+    entry, else TTS_ENGINE.
+    """
+    return get_engine(_engine_by_language.get(language, _default_engine))
+
+
+def set_engine(name: str, language: Optional[str] = None) -> None:
+    """
+    Switches the engine for one language, or the default one, at runtime
+    (benchmarks and scripts do).
+    """
+    global _default_engine
+    get_engine(name)
+    if language is None:
+        _default_engine = name
+    else:
+        _engine_by_language[language] = name
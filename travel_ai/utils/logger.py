@@ -1,13 +1,28 @@
 import logging
 
+
+class _TraceContextFilter(logging.Filter):
+    """
+    Adds the current request's trace ID to log records so log lines can be
+    matched to exported traces.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        from travel_ai.services.tracing import current_trace_id
+
+        record.trace_id = current_trace_id() or "-"
+        return True
+
+
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
         logger.setLevel(logging.INFO)
         handler = logging.StreamHandler()
         formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            "%(asctime)s - %(name)s - %(levelname)s - [%(trace_id)s] %(message)s"
         )
         handler.setFormatter(formatter)
+        handler.addFilter(_TraceContextFilter())
         logger.addHandler(handler)
-    return logger
\ No newline at end of file
+    return logger